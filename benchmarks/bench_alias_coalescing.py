@@ -0,0 +1,69 @@
+"""Benchmark of alias coalescing in dataframe_preprocessor: previous row-wise apply against column-wise engine.
+
+Run from the root of the project:
+    python benchmarks/bench_alias_coalescing.py --rows 200000 --mnemonics 30
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from JupyterToolsPyScientist.petrophysical_layout import coalesce_aliases
+
+
+def coalesce_aliases_row_wise(df, aliases):
+    """Row-wise implementation used by dataframe_preprocessor before the column-wise engine."""
+    def gather_data_for_several_aliases(row, aliases_input):
+        for alias in aliases_input:
+            if not pd.isna(row[alias]):
+                return row[alias]
+
+    return df.apply(gather_data_for_several_aliases, axis=1, args=(aliases, ))
+
+
+def make_synthetic_df(rows, mnemonics, aliases_per_mnemonic=3, null_fraction=0.3, seed=0):
+    """Create DataFrame with several aliases for each mnemonic and random gaps in every alias."""
+    rng = np.random.default_rng(seed)
+    data = {'Well': np.full(rows, 'synthetic')}
+    aliases_dict = {}
+    for mnemonic_id in range(mnemonics):
+        aliases = [f'M{mnemonic_id}_A{alias_id}' for alias_id in range(aliases_per_mnemonic)]
+        for alias in aliases:
+            values = rng.normal(size=rows)
+            values[rng.random(rows) < null_fraction] = np.nan
+            data[alias] = values
+        aliases_dict[f'M{mnemonic_id}'] = aliases
+    return pd.DataFrame(data), aliases_dict
+
+
+def run(rows, mnemonics):
+    df, aliases_dict = make_synthetic_df(rows, mnemonics)
+
+    start = time.perf_counter()
+    row_wise = {mnemonic: coalesce_aliases_row_wise(df, aliases) for mnemonic, aliases in aliases_dict.items()}
+    row_wise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    column_wise = {mnemonic: coalesce_aliases(df, aliases) for mnemonic, aliases in aliases_dict.items()}
+    column_wise_time = time.perf_counter() - start
+
+    for mnemonic in aliases_dict:
+        pd.testing.assert_series_equal(row_wise[mnemonic], column_wise[mnemonic])
+
+    print(f'rows={rows} mnemonics={mnemonics}')
+    print(f'row-wise:    {row_wise_time:.3f} s')
+    print(f'column-wise: {column_wise_time:.3f} s')
+    print(f'speedup:     {row_wise_time / column_wise_time:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--mnemonics', type=int, default=10)
+    arguments = parser.parse_args()
+    run(arguments.rows, arguments.mnemonics)
@@ -0,0 +1,171 @@
+"""Benchmark suite of ingestion, preprocessing, processing, layout and ML paths on synthetic las files.
+
+Time and peak memory of each stage are stored in json, so runs can be compared:
+    python benchmarks/bench_suite.py --samples 100000 --curves 30 --output results.json
+    python benchmarks/bench_suite.py --samples 100000 --curves 30 --compare results.json
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+import numpy as np
+import pandas as pd
+import lasio
+import sklearn
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from JupyterToolsPyScientist.petrophysical_layout import (PetrophysicalLayout, create_single_well_df,
+                                                          dataframe_preprocessor, make_processing_well_logging)
+from JupyterToolsPyScientist.jupyter_tools import random_forest_model_generation, graphical_comparison_of_model
+from synthetic_las import KNOWN_CURVES, write_synthetic_las
+
+FEATURES = ['GR', 'Density', 'ResistivityDeep']
+TARGET = 'Sonic'
+# Synthetic well needs at least curves up to deep resistivity (GR, RHOB, NPHI, DT, RDEP) for ML stages.
+MIN_CURVES = [mnemonic for mnemonic, _, _ in KNOWN_CURVES].index('RDEP') + 1
+
+
+def raw_las_df(las_file_path):
+    """DataFrame of las file before standardization, the same as in create_single_well_df."""
+    las = lasio.read(las_file_path)
+    las_df = las.df()
+    las_df['Well'] = las.well['WELL'].value
+    las_df[las_df.index.name] = las_df.index
+    las_df.reset_index(drop=True, inplace=True)
+    return las_df
+
+
+def make_stages(las_file_path, ml_samples):
+    """Get dictionary with name of stage and function without arguments which runs it."""
+    raw_df = raw_las_df(las_file_path)
+    df = create_single_well_df(las_file_path)
+    ml_df = df[FEATURES + [TARGET]].dropna()
+    ml_df = ml_df.sample(min(ml_samples, len(ml_df)), random_state=0)
+    split = int(len(ml_df) * 0.8)
+    X_train, X_test = ml_df[FEATURES][:split], ml_df[FEATURES][split:]
+    y_train, y_test = ml_df[TARGET][:split], ml_df[TARGET][split:]
+    model = random_forest_model_generation({'n_estimators': 20, 'max_depth': 10, 'random_state': 0, 'n_jobs': -1},
+                                           X_train, y_train, X_test, y_test)
+    comparison_input = {'model': model, 'model_name': 'Sonic', 'param_name': 'Sonic', 'param_units': 'us/ft',
+                        'limits': (40, 140), 'X_train': X_train, 'X_test': X_test, 'y_train': y_train,
+                        'y_test': y_test}
+
+    def layout():
+        PetrophysicalLayout(df, mode='headless', level_of_detail=True).close()
+
+    def comparison(**kwargs):
+        graphical_comparison_of_model(**comparison_input, **kwargs)
+        # Most of time of scatter plots is spent in drawing, so figure is drawn as in notebook.
+        plt.gcf().canvas.draw()
+        plt.close('all')
+
+    return {
+        'create_single_well_df': lambda: create_single_well_df(las_file_path),
+        'dataframe_preprocessor': lambda: dataframe_preprocessor(raw_df),
+        'make_processing_well_logging': lambda: make_processing_well_logging(
+            df.copy(), curves=['Porosity_density_calc', 'Porosity_resistivity_calc', 'Vsh', 'Sw', 'Net_pay']),
+        'PetrophysicalLayout': layout,
+        'random_forest_model_generation': lambda: random_forest_model_generation(
+            {'n_estimators': 20, 'max_depth': 10, 'random_state': 0, 'n_jobs': -1},
+            X_train, y_train, X_test, y_test),
+        'graphical_comparison_of_model': comparison,
+        'graphical_comparison_of_model_diagnostics': lambda: comparison(mode='diagnostics', scatter_samples=2000),
+    }
+
+
+def measure(function, repeats):
+    """Run function several times and measure wall time, peak of traced memory is measured by separate run,
+    so tracing doesn't affect time."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'min_time': min(times), 'median_time': statistics.median(times), 'peak_memory_mb': peak / 1024 ** 2}
+
+
+def run(samples, curves, null_fraction, repeats, ml_samples, stages=None):
+    if curves < MIN_CURVES:
+        raise ValueError(f'Number of curves has to be at least {MIN_CURVES}, got {curves}')
+    folder = tempfile.mkdtemp()
+    las_file_path = write_synthetic_las(os.path.join(folder, 'synthetic.las'), samples, curves, null_fraction)
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        stage_functions = make_stages(las_file_path, ml_samples)
+    for name, function in stage_functions.items():
+        if stages and name not in stages:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = measure(function, repeats)
+        print(f'{name:45s} {results[name]["median_time"]:9.3f} s {results[name]["peak_memory_mb"]:9.1f} MB')
+    os.remove(las_file_path)
+    os.rmdir(folder)
+    return {'meta': {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                     'python': platform.python_version(), 'platform': platform.platform(),
+                     'numpy': np.__version__, 'pandas': pd.__version__, 'matplotlib': matplotlib.__version__,
+                     'sklearn': sklearn.__version__, 'lasio': lasio.__version__},
+            'config': {'samples': samples, 'curves': curves, 'null_fraction': null_fraction, 'repeats': repeats,
+                       'ml_samples': ml_samples},
+            'results': results}
+
+
+def compare(current, baseline, threshold):
+    """Print ratio of median time and peak memory of current run to baseline run, stages slower than threshold
+    are marked. Returns number of regressions."""
+    if current['config'] != baseline['config']:
+        print(f'Configurations differ: {current["config"]} against {baseline["config"]}')
+    regressions = 0
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        time_ratio = result['median_time'] / max(baseline['results'][name]['median_time'], 1e-9)
+        memory_ratio = result['peak_memory_mb'] / max(baseline['results'][name]['peak_memory_mb'], 1e-9)
+        regression = time_ratio > threshold or memory_ratio > threshold
+        regressions += regression
+        print(f'{name:45s} time x{time_ratio:5.2f} memory x{memory_ratio:5.2f}{"  REGRESSION" if regression else ""}')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=20000, help='Number of depth samples of synthetic well.')
+    parser.add_argument('--curves', type=int, default=20,
+                        help=f'Number of curves of synthetic well, at least {MIN_CURVES}.')
+    parser.add_argument('--null-fraction', type=float, default=0.1, help='Part of NULL samples of each curve.')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--ml-samples', type=int, default=50000, help='Maximum number of samples for ML stages.')
+    parser.add_argument('--stages', nargs='*', help='Names of stages to run, by the default all stages.')
+    parser.add_argument('--output', help='Path of json file to store results.')
+    parser.add_argument('--compare', help='Path of json file with results of previous run.')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Ratio to previous run marked as regression.')
+    arguments = parser.parse_args()
+    if arguments.curves < MIN_CURVES:
+        parser.error(f'--curves has to be at least {MIN_CURVES}, so the well has features and target of ML stages')
+
+    run_results = run(arguments.samples, arguments.curves, arguments.null_fraction, arguments.repeats,
+                      arguments.ml_samples, arguments.stages)
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as output_file:
+            json.dump(run_results, output_file, indent=2)
+    if arguments.compare:
+        with open(arguments.compare, 'r', encoding='utf-8') as baseline_file:
+            sys.exit(1 if compare(run_results, json.load(baseline_file), arguments.threshold) else 0)
@@ -0,0 +1,89 @@
+"""Generator of synthetic las files for benchmarks.
+
+Run from the root of the project to create a file:
+    python benchmarks/synthetic_las.py synthetic.las --samples 100000 --curves 30 --null-fraction 0.1
+"""
+import argparse
+
+import numpy as np
+
+NULL_VALUE = -999.25
+
+# Mnemonics known to assignment_base aliases with unit and generator of values. Deep and shallow resistivity
+# have two aliases each, so alias coalescing is exercised.
+KNOWN_CURVES = [
+    ('GR', 'GAPI', lambda rng, n: np.clip(rng.normal(75, 25, n), 0, 250)),
+    ('RHOB', 'G/CC', lambda rng, n: rng.normal(2.45, 0.12, n)),
+    ('NPHI', 'V/V', lambda rng, n: np.clip(rng.normal(0.2, 0.07, n), 0, 0.6)),
+    ('DT', 'US/F', lambda rng, n: rng.normal(85, 12, n)),
+    ('RDEP', 'OHMM', lambda rng, n: 10 ** rng.normal(1, 0.5, n)),
+    ('RT', 'OHMM', lambda rng, n: 10 ** rng.normal(1, 0.5, n)),
+    ('RMED', 'OHMM', lambda rng, n: 10 ** rng.normal(0.9, 0.5, n)),
+    ('RT10', 'OHMM', lambda rng, n: 10 ** rng.normal(0.9, 0.5, n)),
+    ('CALI', 'IN', lambda rng, n: rng.normal(8.7, 0.4, n)),
+    ('BS', 'IN', lambda rng, n: np.full(n, 8.5)),
+    ('PEF', 'B/E', lambda rng, n: rng.normal(3, 0.8, n)),
+    ('RXO', 'OHMM', lambda rng, n: 10 ** rng.normal(0.7, 0.4, n)),
+]
+
+
+def synthetic_curves(n_samples, n_curves, null_fraction=0.1, seed=0):
+    """Generate values of curves, the first curves are known mnemonics and the rest are unmapped curves
+    'CURV<i>'. Gaps are random runs of NULL samples covering about null_fraction of each curve.
+    :returns: List of (mnemonic, unit, values).
+    """
+    rng = np.random.default_rng(seed)
+    curves = []
+    for curve_id in range(n_curves):
+        if curve_id < len(KNOWN_CURVES):
+            mnemonic, unit, generator = KNOWN_CURVES[curve_id]
+            values = generator(rng, n_samples)
+        else:
+            mnemonic, unit = f'CURV{curve_id}', 'UNIT'
+            values = rng.normal(size=n_samples)
+        if null_fraction > 0:
+            # Gaps are runs of about 50 samples, as in real logs.
+            starts = rng.random(n_samples) < null_fraction / 50
+            gaps = np.convolve(starts, np.ones(50), mode='full')[:n_samples] > 0
+            values = np.where(gaps, NULL_VALUE, values)
+        curves.append((mnemonic, unit, values))
+    return curves
+
+
+def write_synthetic_las(path, n_samples=10000, n_curves=12, null_fraction=0.1, start_depth=1000.0, step=0.1,
+                        seed=0, well_name='Synthetic well'):
+    """Write las 2.0 file with depth curve 'DEPT' and n_curves synthetic curves.
+    :returns: Path of written file.
+    """
+    depth = start_depth + step * np.arange(n_samples)
+    curves = synthetic_curves(n_samples, n_curves, null_fraction, seed)
+    header = ['~Version Information',
+              ' VERS.                 2.0: CWLS LOG ASCII STANDARD - VERSION 2.0',
+              ' WRAP.                  NO: One line per depth step',
+              '~Well Information',
+              f' STRT.M          {depth[0]:.4f}: START DEPTH',
+              f' STOP.M          {depth[-1]:.4f}: STOP DEPTH',
+              f' STEP.M          {step:.4f}: STEP',
+              f' NULL.           {NULL_VALUE}: NULL VALUE',
+              f' WELL.           {well_name}: WELL',
+              '~Curve Information',
+              ' DEPT.M                 : Depth']
+    header += [f' {mnemonic}.{unit}                 : Synthetic curve' for mnemonic, unit, _ in curves]
+    header.append('~ASCII')
+    data = np.column_stack([depth] + [values for _, _, values in curves])
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(header) + '\n')
+        np.savetxt(file, data, fmt='%.4f')
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path')
+    parser.add_argument('--samples', type=int, default=10000)
+    parser.add_argument('--curves', type=int, default=12)
+    parser.add_argument('--null-fraction', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+    write_synthetic_las(arguments.path, arguments.samples, arguments.curves, arguments.null_fraction,
+                        seed=arguments.seed)
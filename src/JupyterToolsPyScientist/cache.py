@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import uuid
+from typing import Union
+import pandas as pd
+
+from .well_statistics import serialisable_attrs
+
+# Increase when format of standardised DataFrame is changed, so old entries are not reused.
+CACHE_VERSION = 1
+
+_EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather', 'pickle': '.pkl'}
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Get sha256 of file content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def aliases_hash(mnemonic_dict: dict) -> str:
+    """Get sha256 of aliases correspondence, the order of aliases is important for standardization."""
+    return hashlib.sha256(json.dumps(mnemonic_dict, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class WellCache:
+    """On-disk cache of standardised well DataFrames. Entries are keyed by hash of las file content and hash of
+    aliases they were standardised with. When total size of cache exceeds max_size_bytes the least recently used
+    entries are removed.
+    :param cache_dir: Directory where cached files are stored.
+    :param max_size_bytes: (optional) Limit of cache size in bytes, None means no limit.
+    :param file_format: (optional) 'parquet' (default), 'feather' or 'pickle'. Parquet and feather need pyarrow.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: Union[int, None] = 2 * 1024 ** 3, file_format: str = 'parquet'):
+        if file_format not in _EXTENSIONS:
+            raise ValueError(f'file_format has to be one of {list(_EXTENSIONS)}, got {file_format!r}')
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.file_format = file_format
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, las_file_path: str, mnemonic_dict: dict) -> str:
+        """Get key of entry for las file standardised with given aliases."""
+        return f'{file_hash(las_file_path)[:32]}_{aliases_hash(mnemonic_dict)[:16]}_v{CACHE_VERSION}'
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _EXTENSIONS[self.file_format])
+
+    def get(self, key: str) -> Union[pd.DataFrame, None]:
+        """Get DataFrame from cache or None if there is no entry, access time of entry is refreshed.
+        Entry which can't be read (e.g. truncated file) is removed and treated as missing."""
+        path = self.path(key)
+        try:
+            if self.file_format == 'parquet':
+                df = pd.read_parquet(path)
+            elif self.file_format == 'feather':
+                df = pd.read_feather(path)
+            else:
+                df = pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        except ImportError:
+            # Missing pyarrow isn't a problem of the entry.
+            raise
+        except Exception as err:
+            print(f'Cache entry {path} can\'t be read and is removed: {type(err).__name__}: {err}')
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Store DataFrame in cache and evict the least recently used entries if the limit is exceeded."""
+        path = self.path(key)
+        # Write to temporary file first so parallel readers never see partially written entry.
+        temporary_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        # Statistics index is stored in attrs of the file in dictionary form.
+        df = df.copy(deep=False)
+        df.attrs = serialisable_attrs(df)
+        if self.file_format == 'parquet':
+            df.to_parquet(temporary_path)
+        elif self.file_format == 'feather':
+            df.reset_index(drop=True).to_feather(temporary_path)
+        else:
+            df.to_pickle(temporary_path)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def entries(self) -> list:
+        """Get list of (path, size, last access) of cached files."""
+        result = []
+        extension = _EXTENSIONS[self.file_format]
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(extension):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                result.append((path, stat.st_size, stat.st_mtime))
+        return result
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the size of cache fits into max_size_bytes."""
+        if self.max_size_bytes is None:
+            return
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -21,3 +21,109 @@ class Calculator:
             return (a*rw)/(m*row[input_mnem_resist])
         else:
             return np.nan
+
+    @staticmethod
+    def porosity_density_array(density, matrix_density, fluid_density, out=None):
+        """Vectorized method for calculation porosity by density log using bulk density.
+        :param density: Bulk density as NumPy array or pandas Series, NaN values propagate to the result.
+        :param matrix_density: Density of matrix.
+        :param fluid_density: Density of fluid.
+        :param out: (optional) Preallocated float array to write result into.
+        :returns: Array with porosity or Series with the index of density if Series was given and out is None.
+        """
+        values = np.asarray(density, dtype=float)
+        result = np.subtract(matrix_density, values, out=out)
+        np.divide(result, matrix_density - fluid_density, out=result)
+        return Calculator._wrap_like(density, result, out)
+
+    @staticmethod
+    def porosity_resistivity_array(resistivity, a, m, rw, out=None):
+        """Vectorized method for calculation porosity by resistivity log using deep resistivity.
+        :param resistivity: Deep resistivity as NumPy array or pandas Series, NaN values propagate to the result.
+        :param a: Tortuosity factor.
+        :param m: Cementation exponent.
+        :param rw: Formation water resistivity.
+        :param out: (optional) Preallocated float array to write result into.
+        :returns: Array with porosity or Series with the index of resistivity if Series was given and out is None.
+        """
+        values = np.asarray(resistivity, dtype=float)
+        with np.errstate(divide='ignore'):
+            result = np.divide(a * rw, np.multiply(m, values, out=out), out=out)
+        return Calculator._wrap_like(resistivity, result, out)
+
+    @staticmethod
+    def vsh_linear(gr, gr_clean, gr_shale, out=None):
+        """Vectorized method for calculation volume of shale by linear gamma ray index.
+        :param gr: Gamma ray as NumPy array or pandas Series, NaN values propagate to the result.
+        :param gr_clean: Gamma ray value of clean formation.
+        :param gr_shale: Gamma ray value of shale.
+        :param out: (optional) Preallocated float array to write result into.
+        :returns: Volume of shale clipped to range [0, 1].
+        """
+        values = np.asarray(gr, dtype=float)
+        result = np.subtract(values, gr_clean, out=out)
+        np.divide(result, gr_shale - gr_clean, out=result)
+        np.clip(result, 0, 1, out=result)
+        return Calculator._wrap_like(gr, result, out)
+
+    @staticmethod
+    def porosity_effective(porosity, vsh, out=None):
+        """Vectorized method for calculation effective porosity from total porosity and volume of shale.
+        :param porosity: Total porosity as NumPy array or pandas Series.
+        :param vsh: Volume of shale as NumPy array or pandas Series.
+        :param out: (optional) Preallocated float array to write result into.
+        :returns: Effective porosity which is not less than zero.
+        """
+        result = np.subtract(1, np.asarray(vsh, dtype=float), out=out)
+        np.multiply(result, np.asarray(porosity, dtype=float), out=result)
+        np.maximum(result, 0, out=result)
+        return Calculator._wrap_like(porosity, result, out)
+
+    @staticmethod
+    def water_saturation_archie(resistivity, porosity, a, m, n, rw, out=None):
+        """Vectorized method for calculation water saturation by Archie equation.
+        :param resistivity: Deep resistivity as NumPy array or pandas Series.
+        :param porosity: Porosity as NumPy array or pandas Series.
+        :param a: Tortuosity factor.
+        :param m: Cementation exponent.
+        :param n: Saturation exponent.
+        :param rw: Formation water resistivity.
+        :param out: (optional) Preallocated float array to write result into.
+        :returns: Water saturation clipped to range [0, 1].
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.power(np.asarray(porosity, dtype=float), m, out=out)
+            np.multiply(result, np.asarray(resistivity, dtype=float), out=result)
+            np.divide(a * rw, result, out=result)
+            np.power(result, 1 / n, out=result)
+        np.clip(result, 0, 1, out=result)
+        return Calculator._wrap_like(resistivity, result, out)
+
+    @staticmethod
+    def net_pay_flag(vsh, porosity, sw, vsh_cutoff, porosity_cutoff, sw_cutoff, out=None):
+        """Vectorized method for flagging net pay by cutoffs of volume of shale, porosity and water saturation.
+        :param vsh: Volume of shale as NumPy array or pandas Series.
+        :param porosity: Effective porosity as NumPy array or pandas Series.
+        :param sw: Water saturation as NumPy array or pandas Series.
+        :param vsh_cutoff: Maximum volume of shale of net pay.
+        :param porosity_cutoff: Minimum porosity of net pay.
+        :param sw_cutoff: Maximum water saturation of net pay.
+        :param out: (optional) Preallocated float array to write result into.
+        :returns: 1 for net pay, 0 for non-pay and NaN if one of inputs is NaN.
+        """
+        vsh_values = np.asarray(vsh, dtype=float)
+        porosity_values = np.asarray(porosity, dtype=float)
+        sw_values = np.asarray(sw, dtype=float)
+        result = np.empty(vsh_values.shape) if out is None else out
+        result[...] = (vsh_values <= vsh_cutoff) & (porosity_values >= porosity_cutoff) & (sw_values <= sw_cutoff)
+        result[np.isnan(vsh_values) | np.isnan(porosity_values) | np.isnan(sw_values)] = np.nan
+        return Calculator._wrap_like(vsh, result, out)
+
+    @staticmethod
+    def _wrap_like(source, result, out):
+        """Return Series aligned with source when it was given as Series and result wasn't written to out."""
+        # Series is recognised without importing pandas, so calculations on arrays don't need it.
+        if out is None and hasattr(source, 'to_numpy') and hasattr(source, 'index'):
+            import pandas as pd
+            return pd.Series(result, index=source.index)
+        return result
@@ -0,0 +1,179 @@
+"""Command line interface for batch jobs without notebook and display:
+    jupyter-tools ingest path/to/las_folder path/to/store
+    jupyter-tools process path/to/las_folder path/to/output --curves Porosity_density_calc Vsh --param rw=0.05
+    jupyter-tools render path/to/las_folder path/to/images --format png
+"""
+import argparse
+import os
+import sys
+from typing import List, Union
+
+# Only standard library is imported here, modules of package (with pandas, lasio, matplotlib) are imported by
+# the command which is run, so "--help" and short jobs start fast.
+
+
+def _parameter(item: str) -> tuple:
+    """Convert "name=value" argument to tuple of name and float value, errors are reported by argparse."""
+    name, separator, value = item.partition('=')
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError(f'parameter has to be given as name=value, got {item!r}')
+    try:
+        return name.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'value of parameter {name.strip()!r} has to be a number, got {value!r}')
+
+
+def _output_names(paths: List[str]) -> List[str]:
+    """Names of output files by names of las files, files with the same name from different folders get
+    numbered suffix."""
+    from .utils import unique_names
+    return unique_names(os.path.splitext(os.path.basename(path))[0] for path in paths)
+
+
+def _print_errors(errors: dict) -> int:
+    for path, error in errors.items():
+        print(f'{path}: {error}', file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _ingest(arguments) -> int:
+    from .multi_well import collect_las_files, iter_multiple_wells, _well_key, _print_progress
+    from .well_store import WellStore
+    from .cache import WellCache
+
+    cache = WellCache(arguments.cache) if arguments.cache else None
+    store = WellStore(arguments.store)
+    paths = collect_las_files(arguments.source)
+    added = set()
+    errors = {}
+    # Each well is written to the store as soon as it is loaded and dropped, so memory doesn't grow with field.
+    for las_file_path, df, error in iter_multiple_wells(paths, arguments.assignment, arguments.workers, cache):
+        if error is None:
+            try:
+                added.add(store.add_well(df, _well_key(las_file_path, df, added)))
+            except Exception as err:
+                error = f'{type(err).__name__}: {err}'
+        if error is not None:
+            errors[las_file_path] = error
+        df = None
+        if not arguments.quiet:
+            _print_progress(len(added) + len(errors), len(paths), len(errors))
+    print(f'Added {len(added)} wells to {arguments.store}, failed {len(errors)}')
+    return _print_errors(errors)
+
+
+def _process(arguments) -> int:
+    from .multi_well import collect_las_files
+    from .petrophysical_layout import create_single_well_df, make_processing_well_logging
+    from .cache import WellCache
+    from .processing import DEFAULT_DEFINITIONS, DEFAULT_PARAMETERS
+
+    # Names are checked before reading of wells, so typo isn't reported for each well.
+    curves = [definition.name for definition in DEFAULT_DEFINITIONS]
+    unknown = [curve for curve in arguments.curves or [] if curve not in curves]
+    if unknown:
+        arguments.parser.error(f'unknown curves {unknown}, available are {curves}')
+    unknown = [name for name, _ in arguments.param if name not in DEFAULT_PARAMETERS]
+    if unknown:
+        arguments.parser.error(f'unknown parameters {unknown}, available are {list(DEFAULT_PARAMETERS)}')
+    if arguments.format == 'parquet':
+        import pyarrow  # noqa: F401  Fail before reading of wells if parquet can't be written.
+    parameters = dict(arguments.param)
+    cache = WellCache(arguments.cache) if arguments.cache else None
+    os.makedirs(arguments.output_dir, exist_ok=True)
+    paths = collect_las_files(arguments.source)
+    errors = {}
+    for number, (las_file_path, name) in enumerate(zip(paths, _output_names(paths)), start=1):
+        try:
+            df = create_single_well_df(las_file_path, arguments.assignment, cache)
+            make_processing_well_logging(df, arguments.curves, **parameters)
+            output_path = os.path.join(arguments.output_dir, f'{name}.{arguments.format}')
+            if arguments.format == 'parquet':
+                df.to_parquet(output_path, index=False)
+            else:
+                df.to_csv(output_path, index=False)
+        except Exception as err:
+            errors[las_file_path] = f'{type(err).__name__}: {err}'
+        if not arguments.quiet:
+            sys.stdout.write(f'\rProcessed {number}/{len(paths)} wells, failed {len(errors)}')
+            if number == len(paths):
+                sys.stdout.write('\n')
+            sys.stdout.flush()
+    return _print_errors(errors)
+
+
+def _render(arguments) -> int:
+    # Layouts are rendered by Agg canvas, backend is set for the case pyplot is imported by other code.
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    from .multi_well import collect_las_files
+    from .rendering import render_layouts, render_layouts_to_pdf
+
+    paths = collect_las_files(arguments.source)
+    wells = dict(zip(_output_names(paths), paths))
+    depth_range = tuple(arguments.depth_range) if arguments.depth_range else None
+    if arguments.pdf:
+        errors = render_layouts_to_pdf(wells, arguments.pdf, arguments.assignment, depth_range=depth_range)
+        print(f'Rendered {len(wells) - len(errors)} wells to {arguments.pdf}, failed {len(errors)}')
+        return _print_errors(errors)
+    _, errors = render_layouts(wells, arguments.output_dir, arguments.assignment, file_format=arguments.format,
+                               depth_range=depth_range, max_workers=arguments.workers,
+                               show_progress=not arguments.quiet)
+    return _print_errors(errors)
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='jupyter-tools', description='Batch processing of well logging las files.')
+    parser.add_argument('--profile', metavar='TRACE_JSON',
+                        help='Record stages of the command and write Chrome trace to json file.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, help_text):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument('source', help='Directory with las files, glob pattern or path to las file.')
+        command.add_argument('--assignment', help='Path to assignment Excel file, by the default the built-in one.')
+        command.add_argument('--quiet', action='store_true', help='Do not print progress.')
+        return command
+
+    ingest = add_command('ingest', 'Standardise las files and add them to well store.')
+    ingest.add_argument('store', help='Folder of well store, it is created if does not exist.')
+    ingest.add_argument('--workers', type=int, help='Number of worker processes, by the default number of CPUs.')
+    ingest.add_argument('--cache', help='Folder of cache of standardised wells.')
+    ingest.set_defaults(handler=_ingest)
+
+    process = add_command('process', 'Calculate derived curves of las files and write them to columnar files.')
+    process.add_argument('output_dir', help='Folder for output files, it is created if does not exist.')
+    process.add_argument('--curves', nargs='+', help='Derived curves to calculate, by the default porosity.')
+    process.add_argument('--param', nargs='+', type=_parameter, default=[], metavar='NAME=VALUE',
+                         help='Constants of processing, e.g. rw=0.05 a=1 m=2 n=2.')
+    process.add_argument('--format', choices=['parquet', 'csv'], default='parquet')
+    process.add_argument('--cache', help='Folder of cache of standardised wells.')
+    process.set_defaults(handler=_process, parser=process)
+
+    render = add_command('render', 'Render layouts of las files to image files or multi-page pdf.')
+    target = render.add_mutually_exclusive_group(required=True)
+    target.add_argument('output_dir', nargs='?', help='Folder for images, it is created if does not exist.')
+    target.add_argument('--pdf', help='Path to multi-page pdf, one page for each well, instead of separate images.')
+    render.add_argument('--format', choices=['png', 'svg', 'pdf'], default='png', help='Format of separate images.')
+    render.add_argument('--depth-range', nargs=2, type=float, metavar=('TOP', 'BOTTOM'))
+    render.add_argument('--workers', type=int, help='Number of worker processes, by the default number of CPUs.')
+    render.set_defaults(handler=_render)
+    return parser
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    """Entry point of "jupyter-tools" command.
+    :param argv: (optional) Arguments, by the default sys.argv.
+    :returns: Exit code, 1 if any well failed.
+    """
+    arguments = make_parser().parse_args(argv)
+    if arguments.profile is None:
+        return arguments.handler(arguments)
+    from .instrumentation import profile
+    with profile() as profiler:
+        code = arguments.handler(arguments)
+    profiler.to_chrome_trace(arguments.profile)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Union
+import numpy as np
+import pandas as pd
+
+from .utils import load_tracks_description
+from .petrophysical_layout import PetrophysicalTrack
+
+if TYPE_CHECKING:
+    import matplotlib.backend_bases
+
+# matplotlib is imported on first use, headless panels don't import pyplot.
+
+
+class CorrelationPanel:
+    """Panel with several wells side by side for well-to-well correlation. Tracks description is parsed and scales
+    of curves are computed once for all wells. Only visible wells are drawn: scrolling or adding of well creates
+    axes just for wells which become visible for the first time, already drawn wells are only moved or hidden.
+    :param wells: Dictionary with well name and DataFrame of well.
+    :param assignment_file_path: (optional) Path to assignment file with tracks description.
+    :param markers: (optional) Dictionary with well name and depth of marker to flatten wells on, depth of
+    each well is shown relative to its marker.
+    :param depth_column: (optional) Column with depth to plot, e.g. 'TVD'. By the default 'Depth'.
+    :param depth_range: (optional) Depth range (min, max) of panel (relative to markers if they are given).
+    :param visible_wells: (optional) Number of wells shown at once.
+    :param tracks: (optional) Indexes of tracks from tracks description to show for each well.
+    :param mode: (optional) 'passive' to show figure in jupyter or 'headless' to create figure without display.
+    :param figsize: (optional) Size of figure in inches.
+    :param level_of_detail: (optional) Decimate curves to pixel height of axes.
+    :param tracks_description: (optional) Already parsed tracks description.
+    """
+
+    left, right, bottom, top = 0.04, 0.99, 0.04, 0.72
+
+    def __init__(self,
+                 wells: Dict[str, pd.DataFrame],
+                 assignment_file_path: Union[str, None] = None,
+                 markers: Union[Dict[str, float], None] = None,
+                 depth_column: str = 'Depth',
+                 depth_range: Union[tuple, None] = None,
+                 visible_wells: int = 5,
+                 tracks: Union[List[int], None] = None,
+                 mode: str = 'passive',
+                 figsize: Union[tuple, None] = None,
+                 level_of_detail: bool = True,
+                 tracks_description: Union[list, None] = None):
+        if tracks_description is None:
+            tracks_description = load_tracks_description(assignment_file_path)
+        if tracks is not None:
+            tracks_description = [tracks_description[track_id] for track_id in tracks]
+        self.tracks_description = tracks_description
+        self.markers = markers
+        self.depth_column = depth_column
+        self.visible_wells = visible_wells
+        self.level_of_detail = level_of_detail
+        self.mode = mode
+        self.first_visible = 0
+
+        self.wells: Dict[str, pd.DataFrame] = {}
+        for name, df in wells.items():
+            self.wells[name] = self.flatten(name, df)
+        self.scales = self.compute_scales()
+
+        if depth_range is None:
+            depth_min = min((df['Depth'].min() for df in self.wells.values()), default=0)
+            depth_max = max((df['Depth'].max() for df in self.wells.values()), default=1)
+            depth_range = (depth_min - 15, depth_max + 15)
+        self.depth_range = depth_range
+        self.rendered_limits = tuple(sorted(depth_range))
+
+        # Drawn wells: name -> list of PetrophysicalTrack, and their titles.
+        self.columns: Dict[str, List[PetrophysicalTrack]] = {}
+        self.titles = {}
+        self.depth_axis = None
+
+        if mode == 'headless':
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.fig = Figure(figsize=figsize)
+            FigureCanvasAgg(self.fig)
+        else:
+            from matplotlib import pyplot as plt
+            self.fig = plt.figure(figsize=figsize)
+        # noinspection PyTypeChecker
+        self.fig.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.render()
+        if mode == 'passive':
+            self.fig.show()
+
+    def flatten(self, name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Get DataFrame of well where 'Depth' is replaced by depth_column shifted by marker of the well."""
+        shift = 0.0
+        if self.markers is not None:
+            if name in self.markers:
+                shift = self.markers[name]
+            else:
+                print(f'There is no marker for well <<{name}>>, it is shown without flattening.')
+        flattened = df.copy(deep=False)
+        flattened['Depth'] = df[self.depth_column].to_numpy(dtype=float) - shift
+        return flattened
+
+    def compute_scales(self) -> Dict[str, tuple]:
+        """Compute ranges of curves with automatic range detection by data of all wells at once."""
+        scales = {}
+        for track in self.tracks_description:
+            for curve, description in track['curves'].items():
+                if description['range_detection'] != 'auto' or curve in scales:
+                    continue
+                values = [df[curve].to_numpy(dtype=float) for df in self.wells.values() if curve in df.columns]
+                if values:
+                    limits = PetrophysicalTrack.auto_range(pd.Series(np.concatenate(values)))
+                    if limits is not None:
+                        scales[curve] = limits
+        return scales
+
+    def well_rect(self, slot: int, track_id: int) -> list:
+        """Get position [left, bottom, width, height] of track of well in given visible slot."""
+        well_width = (self.right - self.left) / self.visible_wells
+        track_width = well_width * 0.92 / len(self.tracks_description)
+        return [self.left + slot * well_width + track_id * track_width, self.bottom,
+                track_width * 0.96, self.top - self.bottom]
+
+    def draw_well(self, name: str, slot: int) -> None:
+        """Create axes and tracks of well for current depth window."""
+        # New tracks set limits of shared depth axis, limits zoomed by user are restored after them.
+        limits = self.depth_axis.get_ylim() if self.depth_axis is not None else None
+        tracks = []
+        for track_id, track in enumerate(self.tracks_description):
+            ax = self.fig.add_axes(self.well_rect(slot, track_id))
+            # All wells share single depth axis.
+            if self.depth_axis is None:
+                self.depth_axis = ax
+                # Limits changed on any track (by toolbar zoom, pan or code) are reported by shared depth axis.
+                ax.callbacks.connect('ylim_changed', self.on_depth_limits_changed)
+            else:
+                ax.sharey(self.depth_axis)
+            tracks.append(PetrophysicalTrack(track, ax, self.wells[name], self.rendered_limits,
+                                             self.level_of_detail, scales=self.scales))
+        if limits is not None:
+            self.depth_axis.set_ylim(limits)
+        self.columns[name] = tracks
+        self.titles[name] = self.fig.text(self.well_rect(slot, 0)[0], 0.97, name, fontsize=14, ha='left')
+
+    def place_well(self, name: str, slot: Union[int, None]) -> None:
+        """Move drawn well to visible slot or hide it if slot is None."""
+        visible = slot is not None
+        for track_id, track in enumerate(self.columns[name]):
+            if visible:
+                track.track_main_ax.set_position(self.well_rect(slot, track_id))
+            for axis in [track.track_main_ax, *track.twins_dict.values()]:
+                axis.set_visible(visible)
+        self.titles[name].set_visible(visible)
+        if visible:
+            self.titles[name].set_x(self.well_rect(slot, 0)[0])
+
+    def render(self) -> None:
+        """Show wells of current visible window, wells which were never visible before are drawn."""
+        names = list(self.wells.keys())
+        visible = names[self.first_visible:self.first_visible + self.visible_wells]
+        for name in names:
+            if name in visible:
+                if name not in self.columns:
+                    self.draw_well(name, visible.index(name))
+                else:
+                    self.place_well(name, visible.index(name))
+            elif name in self.columns:
+                self.place_well(name, None)
+        self.fig.canvas.draw_idle()
+
+    def scroll(self, step: int) -> None:
+        """Move visible window of wells by step."""
+        last = max(len(self.wells) - self.visible_wells, 0)
+        first_visible = int(np.clip(self.first_visible + step, 0, last))
+        if first_visible != self.first_visible:
+            self.first_visible = first_visible
+            self.render()
+
+    def add_well(self, name: str, df: pd.DataFrame) -> None:
+        """Add well to the end of panel, it is drawn only if it gets into visible window."""
+        self.wells[name] = self.flatten(name, df)
+        self.render()
+
+    def on_scroll(self, event: matplotlib.backend_bases.MouseEvent) -> None:
+        self.scroll(-1 if event.button == 'up' else 1)
+
+    def on_mouse_click(self, event: matplotlib.backend_bases.MouseEvent) -> None:
+        """Re-render curves of drawn wells for depth window of clicked axes."""
+        if event.inaxes is not None:
+            self.on_depth_limits_changed(event.inaxes)
+
+    def on_depth_limits_changed(self, axes) -> None:
+        """Re-render curves of drawn wells for new depth window."""
+        limits = tuple(sorted(axes.get_ylim()))
+        if limits == self.rendered_limits:
+            return
+        self.rendered_limits = limits
+        for tracks in self.columns.values():
+            for track in tracks:
+                track.update_window(limits)
+        self.fig.canvas.draw_idle()
+
+    def close(self) -> None:
+        """Release figure of panel."""
+        self.fig.clf()
+        if self.mode != 'headless':
+            from matplotlib import pyplot as plt
+            plt.close(self.fig)
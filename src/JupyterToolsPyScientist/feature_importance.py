@@ -0,0 +1,132 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Union
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+# Model and held-out selection in worker process, they are passed once to each worker by initializer.
+_importance_data = {}
+
+
+def _init_importance_worker(model, X: pd.DataFrame, y: np.ndarray) -> None:
+    if 'n_jobs' in model.get_params():
+        # Each worker uses one core, parallelism is given by number of workers.
+        model.set_params(n_jobs=1)
+    _importance_data['model'] = model
+    _importance_data['X'] = X
+    _importance_data['y'] = y
+
+
+def _permuted_score(task_id: int, columns: List[str], repeat: int, seed: int):
+    """Score model on held-out selection where given columns are shuffled by the same permutation, so relations
+    inside group of columns are kept and only their relation with other features and target is broken."""
+    try:
+        X = _importance_data['X']
+        permutation = np.random.default_rng([seed, task_id, repeat]).permutation(len(X))
+        X_permuted = X.copy()
+        X_permuted[columns] = X[columns].to_numpy()[permutation]
+        with threadpool_limits(limits=1):
+            return task_id, repeat, _importance_data['model'].score(X_permuted, _importance_data['y']), None
+    except Exception as err:
+        return task_id, repeat, np.nan, f'{type(err).__name__}: {err}'
+
+
+def groups_by_prefix(features: Iterable[str], prefixes: Iterable[str]) -> Dict[str, List[str]]:
+    """Make groups of features by common beginning of name, e.g. prefix 'Resistivity' gathers 'ResistivityDeep'
+    and 'ResistivityShallow'. Prefixes without features are skipped."""
+    features = list(features)
+    groups = {}
+    for prefix in prefixes:
+        members = [feature for feature in features if feature.startswith(prefix)]
+        if members:
+            groups[prefix] = members
+    return groups
+
+
+def feature_importance_report(model,
+                              X: pd.DataFrame,
+                              y,
+                              groups: Union[Dict[str, List[str]], None] = None,
+                              n_repeats: int = 5,
+                              max_samples: Union[int, None] = 100000,
+                              max_workers: Union[int, None] = None,
+                              random_state=None,
+                              show_progress: bool = True) -> pd.DataFrame:
+    """Permutation importance of each feature and grouped importance of sets of features on held-out selection.
+    Importance is decrease of model score (R2 for regressors) after shuffling of feature or of all features of
+    group together, the latter is not split between correlated curves such as density and neutron. Selection is
+    subsampled once and score of unchanged selection is computed once for all features, permutations of all
+    features and repeats are scored in parallel processes.
+    :param model: Fitted model with feature_names_in_.
+    :param X: Held-out DataFrame with features.
+    :param y: Target of held-out selection.
+    :param groups: (optional) Dictionary with name of group and list of its features, e.g. from groups_by_prefix.
+    :param n_repeats: (optional) Number of permutations of each feature or group.
+    :param max_samples: (optional) Size of random subsample of selection, None to use all rows.
+    :param max_workers: (optional) Number of worker processes, if 1 is given scores are computed in current process.
+    :param random_state: (optional) Seed of subsample and permutations.
+    :param show_progress: (optional) Print number of scored permutations.
+    :returns: DataFrame with columns 'feature name' and 'importance' as in prepare_df_feature_importance, and
+    'importance_std', 'kind' ('impurity', 'permutation' or 'grouped'), 'n_repeats', 'n_samples'.
+    """
+    features = list(model.feature_names_in_) if hasattr(model, 'feature_names_in_') else list(X.columns)
+    X = X[features]
+    y = np.asarray(y, dtype=float)
+    valid = X.notna().all(axis=1).to_numpy() & ~np.isnan(y)
+    X, y = X[valid], y[valid]
+    rng = np.random.default_rng(random_state)
+    if max_samples is not None and len(X) > max_samples:
+        chosen = np.sort(rng.choice(len(X), max_samples, replace=False))
+        X, y = X.iloc[chosen], y[chosen]
+    X = X.reset_index(drop=True)
+    seed = int(rng.integers(2 ** 32))
+
+    tasks = [('permutation', feature, [feature]) for feature in features]
+    tasks += [('grouped', name, list(columns)) for name, columns in (groups or {}).items()]
+    scores = np.full((len(tasks), n_repeats), np.nan)
+    done = 0
+
+    def register(result):
+        nonlocal done
+        task_id, repeat, score, error = result
+        if error is not None:
+            print(f'\nScoring of permuted {tasks[task_id][1]} failed: {error}')
+        scores[task_id, repeat] = score
+        done += 1
+        if show_progress:
+            sys.stdout.write(f'\rScored {done}/{scores.size} permutations')
+            if done == scores.size:
+                sys.stdout.write('\n')
+            sys.stdout.flush()
+
+    if max_workers == 1:
+        # Model of the caller is used as is, n_jobs is changed only for copies of model in workers.
+        _importance_data.update(model=model, X=X, y=y)
+        try:
+            baseline = model.score(X, y)
+            for task_id, (_, _, columns) in enumerate(tasks):
+                for repeat in range(n_repeats):
+                    register(_permuted_score(task_id, columns, repeat, seed))
+        finally:
+            _importance_data.clear()
+    else:
+        baseline = model.score(X, y)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_importance_worker,
+                                 initargs=(model, X, y)) as executor:
+            futures = [executor.submit(_permuted_score, task_id, columns, repeat, seed)
+                       for task_id, (_, _, columns) in enumerate(tasks) for repeat in range(n_repeats)]
+            for future in as_completed(futures):
+                register(future.result())
+
+    decrease = baseline - scores
+    rows = []
+    if hasattr(model, 'feature_importances_'):
+        rows += [{'feature name': feature, 'importance': importance, 'importance_std': np.nan, 'kind': 'impurity',
+                  'n_repeats': 0, 'n_samples': 0}
+                 for feature, importance in zip(features, model.feature_importances_)]
+    rows += [{'feature name': name, 'importance': np.nanmean(decrease[task_id]),
+              'importance_std': np.nanstd(decrease[task_id]), 'kind': kind, 'n_repeats': n_repeats,
+              'n_samples': len(X)}
+             for task_id, (kind, name, _) in enumerate(tasks)]
+    return pd.DataFrame(rows)
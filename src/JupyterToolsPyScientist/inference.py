@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Iterable, List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from .petrophysical_layout import create_single_well_df, well_df_from_las
+from .multi_well import collect_las_files
+from .cache import WellCache
+from .instrumentation import stage
+from .utils import unique_names
+
+if TYPE_CHECKING:
+    import lasio
+
+_OUTPUT_EXTENSIONS = {'las': '.las', 'parquet': '.parquet', 'csv': '.csv'}
+
+
+def model_features(model) -> List[str]:
+    """Get names of features the model was fitted with."""
+    if not hasattr(model, 'feature_names_in_'):
+        raise ValueError('Model has to be fitted on DataFrame, so names of features are known (feature_names_in_).')
+    return list(model.feature_names_in_)
+
+
+def predict_in_batches(model,
+                       df: pd.DataFrame,
+                       batch_size: int = 100000,
+                       features: Union[List[str], None] = None) -> np.ndarray:
+    """Predict curve for every row of DataFrame by batches of fixed size, so memory doesn't grow with length of well.
+    Rows with missing feature values are not dropped, prediction of them is NaN.
+    :param model: Fitted model with feature_names_in_.
+    :param df: DataFrame of well.
+    :param batch_size: (optional) Number of rows predicted at once.
+    :param features: (optional) Feature columns, by the default model.feature_names_in_.
+    :returns: Array of predictions with length of df.
+    """
+    features = model_features(model) if features is None else list(features)
+    missing = [feature for feature in features if feature not in df.columns]
+    if missing:
+        raise KeyError(f'Features {missing} are absent in DataFrame.')
+    predictions = np.full(len(df), np.nan)
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size][features]
+        valid = batch.notna().all(axis=1).to_numpy()
+        if valid.any():
+            with stage('inference.predict', rows=int(valid.sum())):
+                predictions[start:start + len(batch)][valid] = model.predict(batch[valid])
+    return predictions
+
+
+def _write_prediction(output_path: str, file_format: str, df: pd.DataFrame, las: Union[lasio.LASFile, None],
+                      curve_name: str, unit: str, predictions: np.ndarray) -> None:
+    if file_format == 'las':
+        las.append_curve(curve_name, predictions, unit=unit, descr='Predicted by model')
+        las.write(output_path, version=2.0)
+        return
+    output_df = pd.DataFrame({'Depth': df['Depth'].to_numpy(), curve_name: predictions})
+    if 'Well' in df.columns:
+        output_df['Well'] = df['Well'].to_numpy()
+    if file_format == 'parquet':
+        output_df.to_parquet(output_path, index=False)
+    else:
+        output_df.to_csv(output_path, index=False)
+
+
+def predict_wells(model,
+                  source: Union[str, Iterable[str]],
+                  output_dir: str,
+                  curve_name: str = 'Prediction',
+                  unit: str = '',
+                  assignment_file_path: Union[str, None] = None,
+                  file_format: str = 'las',
+                  batch_size: int = 100000,
+                  cache: Union[WellCache, None] = None,
+                  show_progress: bool = True) -> Tuple[dict, dict, pd.DataFrame]:
+    """Apply trained model to new wells one by one. Each las file is standardised with aliases table the same way
+    as by create_single_well_df, features are taken by model.feature_names_in_ and predicted by batches, rows with
+    missing features get NULL values. For 'las' format predicted curve is added to copy of the original las file,
+    for 'parquet' and 'csv' formats the file contains 'Depth', predicted curve and 'Well'. Output files are named
+    by las files, repeated names get suffix "_2", "_3", ...
+    :param model: Fitted model with feature_names_in_.
+    :param source: Path to directory with las files, glob pattern or list of paths.
+    :param output_dir: Folder for output files, it is created if doesn't exist.
+    :param curve_name: (optional) Mnemonic of predicted curve.
+    :param unit: (optional) Unit of predicted curve.
+    :param assignment_file_path: (optional) Path to assignment file with TAB "aliases".
+    :param file_format: (optional) 'las', 'parquet' (needs pyarrow) or 'csv'.
+    :param batch_size: (optional) Number of rows predicted at once.
+    :param cache: (optional) WellCache of standardised wells, it is used for 'parquet' and 'csv' formats.
+    :param show_progress: (optional) Print number of processed wells and throughput.
+    :returns: Tuple of dictionaries with output paths and errors keyed by las file path, and DataFrame with rows,
+    predicted rows, read and predict time, rows per second and features absent in each well.
+    """
+    if file_format not in _OUTPUT_EXTENSIONS:
+        raise ValueError(f'file_format has to be one of {list(_OUTPUT_EXTENSIONS)}, got {file_format!r}')
+    features = model_features(model)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = collect_las_files(source)
+    # Files with the same name from different folders get numbered suffix instead of overwriting each other.
+    names = unique_names(os.path.splitext(os.path.basename(path))[0] for path in paths)
+    written = {}
+    errors = {}
+    metrics = []
+    total_rows = 0
+    total_time = 0.0
+
+    for number, (las_file_path, name) in enumerate(zip(paths, names), start=1):
+        try:
+            start = time.perf_counter()
+            if file_format == 'las':
+                import lasio
+                las = lasio.read(las_file_path)
+                df = well_df_from_las(las, assignment_file_path)
+            else:
+                las = None
+                df = create_single_well_df(las_file_path, assignment_file_path, cache)
+            read_time = time.perf_counter() - start
+
+            missing = [feature for feature in features if feature not in df.columns]
+            start = time.perf_counter()
+            if missing:
+                if show_progress:
+                    print(f'\nFeatures {missing} are absent in {las_file_path}, predicted curve is empty.')
+                predictions = np.full(len(df), np.nan)
+            else:
+                predictions = predict_in_batches(model, df, batch_size, features)
+            predict_time = time.perf_counter() - start
+
+            output_path = os.path.join(output_dir, name + _OUTPUT_EXTENSIONS[file_format])
+            start = time.perf_counter()
+            _write_prediction(output_path, file_format, df, las, curve_name, unit, predictions)
+            write_time = time.perf_counter() - start
+
+            written[las_file_path] = output_path
+            metrics.append({'las_file_path': las_file_path, 'rows': len(df),
+                            'predicted_rows': int((~np.isnan(predictions)).sum()), 'read_time': read_time,
+                            'predict_time': predict_time, 'write_time': write_time,
+                            'rows_per_second': len(df) / max(read_time + predict_time + write_time, 1e-9),
+                            'missing_features': missing})
+            total_rows += len(df)
+            total_time += read_time + predict_time + write_time
+        except Exception as err:
+            errors[las_file_path] = f'{type(err).__name__}: {err}'
+        if show_progress:
+            sys.stdout.write(f'\rPredicted {number}/{len(paths)} wells, failed {len(errors)}, '
+                             f'{total_rows / max(total_time, 1e-9):.0f} rows/s')
+            if number == len(paths):
+                sys.stdout.write('\n')
+            sys.stdout.flush()
+    return written, errors, pd.DataFrame(metrics)
@@ -0,0 +1,215 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Union
+
+# Recording is switched on for the whole process by environment variable: "1" keeps records in memory for
+# get_profiler(), path to json file also writes Chrome trace at exit.
+PROFILE_ENV_VARIABLE = 'JUPYTER_TOOLS_PROFILE'
+
+
+def _rss_bytes() -> Union[int, None]:
+    """Get resident memory of process, None if it can't be read on this platform."""
+    try:
+        with open('/proc/self/statm', 'r') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class StageRecord:
+    """Record of one stage: name, start and duration in seconds, number of rows and memory change in bytes.
+    Number of rows can be set by the code inside stage."""
+
+    __slots__ = ('name', 'start', 'duration', 'rows', 'memory_delta', 'depth', 'thread_id')
+
+    def __init__(self, name: str, start: float, depth: int, thread_id: int):
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.rows = None
+        self.memory_delta = None
+        self.depth = depth
+        self.thread_id = thread_id
+
+
+class _NullRecord:
+    """Record returned when recording is off, everything set to it is ignored."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_RECORD = _NullRecord()
+
+
+class Profiler:
+    """Collector of stage records.
+    :param memory: (optional) 'rss' to record change of resident memory of process, 'tracemalloc' to record change
+    of memory allocated by Python (more precise, but slows code down) or None to skip memory.
+    """
+
+    def __init__(self, memory: Union[str, None] = 'rss'):
+        if memory not in ('rss', 'tracemalloc', None):
+            raise ValueError(f"memory has to be 'rss', 'tracemalloc' or None, got {memory!r}")
+        self.memory = memory
+        self.records: List[StageRecord] = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+
+    def _memory(self):
+        if self.memory == 'rss':
+            return _rss_bytes()
+        if self.memory == 'tracemalloc' and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return None
+
+    @contextmanager
+    def stage(self, name: str, rows: Union[int, None] = None):
+        depth = getattr(self._local, 'depth', 0)
+        record = StageRecord(name, time.perf_counter() - self.origin, depth, threading.get_ident())
+        record.rows = rows
+        memory_before = self._memory()
+        self._local.depth = depth + 1
+        try:
+            yield record
+        finally:
+            self._local.depth = depth
+            record.duration = time.perf_counter() - self.origin - record.start
+            memory_after = self._memory()
+            if memory_before is not None and memory_after is not None:
+                record.memory_delta = memory_after - memory_before
+            self.records.append(record)
+
+    def clear(self) -> None:
+        self.records = []
+
+    def to_frame(self):
+        """Get DataFrame with one row for each recorded stage in order of their start."""
+        import pandas as pd
+        columns = ['stage', 'start', 'duration', 'rows', 'memory_delta_mb', 'depth', 'thread_id']
+        rows = [(record.name, record.start, record.duration, record.rows,
+                 None if record.memory_delta is None else record.memory_delta / 1024 ** 2, record.depth,
+                 record.thread_id) for record in sorted(self.records, key=lambda record: record.start)]
+        return pd.DataFrame(rows, columns=columns)
+
+    def summary(self):
+        """Get DataFrame with number of calls, total and mean duration, rows and rows per second of each stage,
+        sorted by total duration."""
+        df = self.to_frame()
+        summary = df.groupby('stage').agg(calls=('duration', 'size'), total_time=('duration', 'sum'),
+                                          mean_time=('duration', 'mean'), rows=('rows', 'sum'),
+                                          memory_delta_mb=('memory_delta_mb', 'sum'))
+        summary['rows_per_second'] = summary['rows'] / summary['total_time'].where(summary['total_time'] > 0)
+        return summary.sort_values('total_time', ascending=False)
+
+    def to_chrome_trace(self, path: Union[str, None] = None) -> dict:
+        """Get records in Chrome trace format (chrome://tracing or https://ui.perfetto.dev) and write it to json
+        file if path is given."""
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            arguments = {}
+            if record.rows is not None:
+                arguments['rows'] = record.rows
+            if record.memory_delta is not None:
+                arguments['memory_delta_mb'] = round(record.memory_delta / 1024 ** 2, 3)
+            events.append({'name': record.name, 'cat': record.name.split('.')[0], 'ph': 'X', 'pid': pid,
+                           'tid': record.thread_id, 'ts': record.start * 1e6, 'dur': record.duration * 1e6,
+                           'args': arguments})
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(trace, file)
+        return trace
+
+
+# Profiler which records stages now, None when recording is off.
+_active_profiler: Union[Profiler, None] = None
+
+
+def stage(name: str, rows: Union[int, None] = None):
+    """Context manager to record stage of pipeline in active profiler. When recording is off it returns shared
+    context which does nothing, so instrumented code pays only for one function call.
+    :param name: Name of stage, text before the first dot is used as category, e.g. 'las.parse'.
+    :param rows: (optional) Number of rows processed by stage, it can also be set to yielded record.
+    """
+    if _active_profiler is None:
+        return _NULL_STAGE
+    return _active_profiler.stage(name, rows)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return _NULL_RECORD
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def instrumented(name: str):
+    """Decorator to record each call of function as stage."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active_profiler is None:
+                return function(*args, **kwargs)
+            with _active_profiler.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_profiler() -> Union[Profiler, None]:
+    """Get active profiler, e.g. one switched on by environment variable."""
+    return _active_profiler
+
+
+@contextmanager
+def profile(memory: Union[str, None] = 'rss'):
+    """Context manager to record stages of pipeline inside block, e.g. in notebook:
+        with profile() as profiler:
+            df = create_single_well_df(las_file_path)
+            PetrophysicalLayout(df)
+        profiler.summary()
+    Stages in worker processes (load_multiple_wells, render_layouts) are not recorded.
+    :param memory: (optional) 'rss', 'tracemalloc' or None, see Profiler.
+    """
+    global _active_profiler
+    previous = _active_profiler
+    profiler = Profiler(memory)
+    started_tracing = memory == 'tracemalloc' and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def _enable_from_environment() -> None:
+    global _active_profiler
+    value = os.environ.get(PROFILE_ENV_VARIABLE, '').strip()
+    if value.lower() in ('', '0', 'false', 'no'):
+        return
+    _active_profiler = Profiler()
+    if value.lower().endswith('.json'):
+        atexit.register(_active_profiler.to_chrome_trace, value)
+
+
+_enable_from_environment()
@@ -1,8 +1,15 @@
-from sklearn.ensemble import RandomForestRegressor
-from matplotlib import pyplot as plt
-import seaborn as sns
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import numpy as np
 import pandas as pd
-import matplotlib
+
+from .model_search import load_search_results
+
+if TYPE_CHECKING:
+    import matplotlib.axes
+
+# sklearn, matplotlib and seaborn are imported by functions which use them, so import of module is fast.
 
 
 def add_grid(axes: matplotlib.axes._axes.Axes) -> bool:
@@ -21,6 +28,7 @@ def add_grid(axes: matplotlib.axes._axes.Axes) -> bool:
 
 def random_forest_model_generation(best_rf_params, X_train, y_train, X_test, y_test):
     """Function to create model, train it, print its score and return model"""
+    from sklearn.ensemble import RandomForestRegressor
     model = RandomForestRegressor(**best_rf_params)
     model.fit(X_train, y_train)
     train_score = model.score(X_train, y_train)
@@ -43,7 +51,12 @@ def graphical_comparison_of_model(**kwargs):
     'X_test': X_test,
     'y_train': y_train,
     'y_test': y_test,}
+    For large selections add 'mode': 'diagnostics', then density of points is drawn as raster image and metrics
+    are returned, see model_diagnostics for its optional keys.
     """
+    if kwargs.get('mode') == 'diagnostics':
+        return model_diagnostics(**{key: value for key, value in kwargs.items() if key != 'mode'})
+
     def adjust_axes(ax_to_modify, grids=True):
         """Adjusting axes for comparison porosity plot"""
         ax_to_modify.set_xlim(kwargs['limits'][0], kwargs['limits'][1])
@@ -56,6 +69,7 @@ def graphical_comparison_of_model(**kwargs):
         else:
             pass
 
+    from matplotlib import pyplot as plt
     predictions_train = kwargs['model'].predict(kwargs['X_train'])
     predictions_test = kwargs['model'].predict(kwargs['X_test'])
     fig, ax = plt.subplots(2, 2, figsize=(15, 10))
@@ -75,14 +89,118 @@ def graphical_comparison_of_model(**kwargs):
     ax[1, 1].hist2d(kwargs['y_test'], predictions_test, label='test selection', bins=60)
 
 
+def regression_metrics(y_true, y_pred, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)) -> dict:
+    """Function to compute metrics of regression: number of points, R2, RMSE, MAE, bias and quantiles of residuals
+    (predicted minus real value). Points with NaN are ignored.
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    valid = ~np.isnan(y_true) & ~np.isnan(y_pred)
+    y_true, y_pred = y_true[valid], y_pred[valid]
+    residuals = y_pred - y_true
+    metrics = {'n': len(residuals)}
+    if not len(residuals):
+        return metrics
+    total = np.sum((y_true - y_true.mean()) ** 2)
+    metrics['r2'] = 1 - np.sum(residuals ** 2) / total if total > 0 else np.nan
+    metrics['rmse'] = float(np.sqrt(np.mean(residuals ** 2)))
+    metrics['mae'] = float(np.mean(np.abs(residuals)))
+    metrics['bias'] = float(residuals.mean())
+    for quantile, value in zip(quantiles, np.quantile(residuals, quantiles)):
+        metrics[f'residual_q{round(quantile * 100):02d}'] = float(value)
+    return metrics
+
+
+def density_grid(x, y, limits, bins=200):
+    """Function to count points in square bins of given limits in one pass, points outside limits are skipped.
+    :returns: Array of counts with shape (bins, bins), first index is bin of x.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    scale = bins / (limits[1] - limits[0])
+    column = np.floor((x - limits[0]) * scale)
+    row = np.floor((y - limits[0]) * scale)
+    inside = (column >= 0) & (column < bins) & (row >= 0) & (row < bins)
+    flat = column[inside].astype(np.int64) * bins + row[inside].astype(np.int64)
+    return np.bincount(flat, minlength=bins * bins).reshape(bins, bins)
+
+
+def model_diagnostics(**kwargs):
+    """Diagnostic plots of model for millions of points. Density of points is counted in NumPy once and drawn as
+    raster image, so time of drawing and size of figure don't depend on number of points. Keys are the same as
+    for graphical_comparison_of_model, with optional:
+    'predictions_train', 'predictions_test' - already computed predictions, e.g. by predict_in_batches;
+    'bins' - number of bins of density image along each axis (200 by the default);
+    'scatter_samples' - number of randomly chosen points drawn over density image (0 by the default);
+    'random_state' - seed for choice of scatter points.
+    :returns: DataFrame with metrics of train and test selections (see regression_metrics).
+    """
+    limits = kwargs['limits']
+    bins = kwargs.get('bins', 200)
+    scatter_samples = kwargs.get('scatter_samples', 0)
+    rng = np.random.default_rng(kwargs.get('random_state'))
+
+    from matplotlib import pyplot as plt
+    from matplotlib.colors import LogNorm
+    fig, ax = plt.subplots(2, 2, figsize=(15, 10))
+    metrics = {}
+    for column, selection in enumerate(['train', 'test']):
+        y_true = np.asarray(kwargs[f'y_{selection}'], dtype=float)
+        y_pred = kwargs.get(f'predictions_{selection}')
+        if y_pred is None:
+            y_pred = kwargs['model'].predict(kwargs[f'X_{selection}'])
+        y_pred = np.asarray(y_pred, dtype=float)
+        metrics[selection] = regression_metrics(y_true, y_pred)
+
+        counts = density_grid(y_true, y_pred, limits, bins)
+        image = ax[0, column].imshow(np.ma.masked_equal(counts.T, 0), origin='lower', aspect='auto',
+                                     extent=(limits[0], limits[1], limits[0], limits[1]), norm=LogNorm(),
+                                     interpolation='nearest')
+        fig.colorbar(image, ax=ax[0, column], label='number of points')
+        if scatter_samples:
+            chosen = rng.choice(len(y_true), min(scatter_samples, len(y_true)), replace=False)
+            ax[0, column].scatter(y_true[chosen], y_pred[chosen], s=4, c='black', alpha=0.3, rasterized=True,
+                                  label=f'{len(chosen)} random points')
+        ax[0, column].plot(limits, limits, label='mean line', color='red')
+        ax[0, column].set_xlim(*limits)
+        ax[0, column].set_ylim(*limits)
+        ax[0, column].legend()
+        ax[0, column].set_title(f'Comparison of real and predicted {kwargs["param_name"]} ({selection}, '
+                                f'n={len(y_true)}, R2={metrics[selection].get("r2", np.nan):.3f})')
+        ax[0, column].set_xlabel(f'Real {kwargs["param_name"]}, {kwargs["param_units"]}')
+        ax[0, column].set_ylabel(f'Predicted {kwargs["param_name"]}, {kwargs["param_units"]}')
+
+        residuals = y_pred - y_true
+        residuals = residuals[~np.isnan(residuals)]
+        histogram, edges = np.histogram(residuals, bins=bins)
+        ax[1, column].stairs(histogram, edges, fill=True)
+        ax[1, column].set_title(f'Residuals ({selection}), RMSE={metrics[selection].get("rmse", np.nan):.4f}')
+        ax[1, column].set_xlabel(f'Predicted - real {kwargs["param_name"]}, {kwargs["param_units"]}')
+        add_grid(ax[1, column])
+    return pd.DataFrame(metrics).T
+
+
 def show_grid_search_score(grid):
-    """Show graphically score of grid search and time for calculations"""
+    """Show graphically score of grid search and time for calculations
+    :param grid: Fitted GridSearchCV, table of results from well_group_search or path to its cache folder.
+    For successive halving search the result of the last iteration of each candidate is shown.
+    """
     def convert_params(row):
         return str(row['params'])
 
-    cv_results = pd.DataFrame.from_dict(grid.cv_results_)
+    if isinstance(grid, str):
+        cv_results = load_search_results(grid)
+    elif isinstance(grid, pd.DataFrame):
+        cv_results = grid.copy()
+    else:
+        cv_results = pd.DataFrame.from_dict(grid.cv_results_)
     cv_results['params'] = cv_results.apply(convert_params, axis=1)
+    if 'n_resources' in cv_results.columns:
+        cv_results = cv_results.sort_values('n_resources').groupby('params', sort=False).tail(1)
+        cv_results = cv_results.sort_values('mean_test_score', ascending=False).reset_index(drop=True)
 
+    from matplotlib import pyplot as plt
+    import seaborn as sns
     fig, ax = plt.subplots(2, 1, figsize=(10, 10))
 
     sns.barplot(data=cv_results, x='mean_test_score', y='params', ax=ax[0]).set_title('mean_test_score')
@@ -97,6 +215,7 @@ def prepare_df_feature_importance(model):
 
 
 if __name__ == '__main__':
+    from matplotlib import pyplot as plt
     fig_, ax_ = plt.subplots(1, 1, figsize=(6, 6))
     ax_.scatter([1, 2], [1, 2])
     add_grid(ax_)
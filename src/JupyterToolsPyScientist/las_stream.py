@@ -0,0 +1,104 @@
+from typing import Iterator, Union
+import pandas as pd
+import lasio
+
+from .utils import load_mnemonic_aliases_correspond
+from .petrophysical_layout import map_existing_mnemonics, standardise_by_aliases
+from .instrumentation import stage
+
+
+def _well_name(las: lasio.LASFile) -> str:
+    """Name of well the same way as in create_single_well_df."""
+    if 'UWI' in las.well:
+        return las.well['UWI'].value
+    elif 'WELL' in las.well:
+        return las.well['WELL'].value
+    return 'unknown'
+
+
+def _seek_data_section(file) -> None:
+    """Move file position to the first line after ~A line."""
+    while True:
+        line = file.readline()
+        if line == '':
+            raise ValueError('There is no ~A section in las file.')
+        if line.lstrip().upper().startswith('~A'):
+            return
+
+
+def iter_las_chunks(las_file_path: str,
+                    assignment_file_path: Union[str, None] = None,
+                    chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+    """Read las file by chunks of rows and standardise each chunk with aliases table, only mapped mnemonics
+    are kept. Concatenation of all chunks is the same as DataFrame from create_single_well_df, but peak memory
+    is bounded by size of one chunk.
+    :param las_file_path: Path to las file.
+    :param assignment_file_path: (optional) Path to assignment file with TAB "aliases".
+    :param chunk_size: (optional) Number of rows in each chunk.
+    """
+    # Only header is parsed by lasio, data section is streamed.
+    las = lasio.read(las_file_path, ignore_data=True)
+    if 'WRAP' in las.version and str(las.version['WRAP'].value).strip().upper() == 'YES':
+        raise ValueError('Wrapped las files are not supported by streaming reader.')
+    curves = [curve.mnemonic for curve in las.curves]
+    null_value = las.well['NULL'].value if 'NULL' in las.well else None
+
+    # Columns in the same order as in create_single_well_df: curves, well name and index curve at the end.
+    las_columns = curves[1:] + ['Well', curves[0]]
+    mnem_existing_dict = map_existing_mnemonics(las_columns, load_mnemonic_aliases_correspond(assignment_file_path))
+    used_columns = {alias for aliases in mnem_existing_dict.values() for alias in aliases}
+    used_curves = [curve for curve in curves if curve in used_columns]
+    ordered_columns = [column for column in las_columns if column in used_columns]
+    well_name = _well_name(las)
+
+    with open(las_file_path, 'r', encoding=las.encoding, errors='replace') as file:
+        _seek_data_section(file)
+        reader = pd.read_csv(file, sep=r'\s+', header=None, names=curves, usecols=used_curves,
+                             comment='#', chunksize=chunk_size, float_precision='round_trip')
+        offset = 0
+        for chunk in reader:
+            with stage('las.chunk', rows=len(chunk)):
+                chunk = chunk.astype(float)
+                if null_value is not None:
+                    chunk = chunk.mask(chunk == null_value)
+                if 'Well' in used_columns:
+                    chunk['Well'] = well_name
+                chunk = chunk[ordered_columns]
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+                chunk = standardise_by_aliases(chunk, mnem_existing_dict)
+            yield chunk
+
+
+def convert_las_to_parquet(las_file_path: str,
+                           output_path: str,
+                           assignment_file_path: Union[str, None] = None,
+                           chunk_size: int = 100000) -> int:
+    """Stream las file into parquet file with standardised curves without loading the whole file in memory.
+    Requires pyarrow.
+    :param las_file_path: Path to las file.
+    :param output_path: Path to parquet file to create.
+    :param assignment_file_path: (optional) Path to assignment file with TAB "aliases".
+    :param chunk_size: (optional) Number of rows in each chunk (and row group of parquet file).
+    :returns: Number of written rows.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in iter_las_chunks(las_file_path, assignment_file_path, chunk_size):
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(output_path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pq.write_table(pa.table({}), output_path)
+    return rows
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Tuple, Union
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+# sklearn is imported in functions which fit models, so reading of cached results doesn't load it.
+
+# Increase when evaluation of fold is changed, so old cached results are not reused.
+SEARCH_CACHE_VERSION = 1
+
+# Data of search in worker process, it is passed once to each worker by initializer instead of with every task.
+_search_data = {}
+
+
+def _init_search_worker(X: np.ndarray, y: np.ndarray, groups: np.ndarray, n_splits: int) -> None:
+    from sklearn.model_selection import GroupKFold
+    _search_data['X'] = X
+    _search_data['y'] = y
+    # Folds are deterministic, so each worker splits data itself and tasks carry only number of fold.
+    _search_data['folds'] = list(GroupKFold(n_splits=n_splits).split(X, y, groups))
+
+
+def _evaluate_fold(key: str, params: dict, fold: int, n_resources: int, seed: int, return_train_score: bool = False):
+    """Fit forest with params on n_resources samples of train part of fold and score it on test part (and on train
+    part if return_train_score). Errors are returned instead of being raised so the search isn't aborted."""
+    try:
+        from sklearn.ensemble import RandomForestRegressor
+        X, y = _search_data['X'], _search_data['y']
+        train_index, test_index = _search_data['folds'][fold]
+        if n_resources < len(train_index):
+            rng = np.random.default_rng([seed, fold, n_resources])
+            train_index = np.sort(rng.choice(train_index, n_resources, replace=False))
+        model = RandomForestRegressor(**params)
+        # Each worker uses one core, parallelism is given by number of workers.
+        model.set_params(n_jobs=1)
+        with threadpool_limits(limits=1):
+            start = time.perf_counter()
+            model.fit(X[train_index], y[train_index])
+            fit_time = time.perf_counter() - start
+            start = time.perf_counter()
+            test_score = model.score(X[test_index], y[test_index])
+            score_time = time.perf_counter() - start
+            train_score = model.score(X[train_index], y[train_index]) if return_train_score else np.nan
+        return key, {'fit_time': fit_time, 'score_time': score_time, 'test_score': test_score,
+                     'train_score': train_score, 'n_train_samples': len(train_index)}, None
+    except Exception as err:
+        return key, None, f'{type(err).__name__}: {err}'
+
+
+def _data_fingerprint(X: np.ndarray, y: np.ndarray, groups: np.ndarray, features: List[str]) -> str:
+    checksum = zlib.crc32(np.ascontiguousarray(X).data)
+    checksum = zlib.crc32(np.ascontiguousarray(y).data, checksum)
+    checksum = zlib.crc32(pd.util.hash_array(groups).data, checksum)
+    return f'{X.shape[0]}x{X.shape[1]}:{checksum:08x}:{",".join(features)}'
+
+
+def _task_key(data_fingerprint: str, params: dict, fold: int, n_splits: int, n_resources: int, seed: int,
+              return_train_score: bool) -> str:
+    description = json.dumps({'version': SEARCH_CACHE_VERSION, 'data': data_fingerprint, 'params': params,
+                              'fold': fold, 'n_splits': n_splits, 'n_resources': n_resources, 'seed': seed,
+                              'train_score': return_train_score},
+                             sort_keys=True, default=str)
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()[:32]
+
+
+def _read_record(path: str) -> Union[dict, None]:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_record(path: str, record: dict) -> None:
+    # Write to temporary file first, so interrupted search never leaves partially written result.
+    temporary_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(record, file, default=str)
+    os.replace(temporary_path, path)
+
+
+def summarize_fold_results(records: List[dict]) -> pd.DataFrame:
+    """Aggregate results of folds into table similar to cv_results_ of sklearn searches: one row for each
+    candidate and number of samples, with mean and std of scores and times over folds."""
+    if not records:
+        return pd.DataFrame(columns=['params', 'iter', 'n_resources', 'mean_test_score', 'std_test_score',
+                                     'mean_train_score', 'mean_fit_time', 'mean_score_time', 'n_folds'])
+    folds = pd.DataFrame(records)
+    folds['params_key'] = folds['params'].apply(lambda params: json.dumps(params, sort_keys=True, default=str))
+    grouped = folds.groupby(['params_key', 'n_resources'], sort=False)
+    result = grouped.agg(params=('params', 'first'),
+                         mean_test_score=('test_score', 'mean'),
+                         std_test_score=('test_score', 'std'),
+                         mean_train_score=('train_score', 'mean'),
+                         mean_fit_time=('fit_time', 'mean'),
+                         mean_score_time=('score_time', 'mean'),
+                         n_folds=('fold', 'nunique')).reset_index()
+    result['iter'] = result['n_resources'].rank(method='dense').astype(int) - 1
+    result['rank_test_score'] = result['mean_test_score'].rank(ascending=False, method='min', na_option='bottom')
+    return result.drop(columns='params_key')[['params', 'iter', 'n_resources', 'mean_test_score', 'std_test_score',
+                                              'mean_train_score', 'mean_fit_time', 'mean_score_time', 'n_folds',
+                                              'rank_test_score']]
+
+
+def load_search_results(cache_dir: str) -> pd.DataFrame:
+    """Get table of results of all folds stored in cache of search, e.g. to plot them with show_grid_search_score
+    while search is still running or after it was interrupted."""
+    records = []
+    for name in sorted(os.listdir(cache_dir)):
+        if name.endswith('.json'):
+            record = _read_record(os.path.join(cache_dir, name))
+            if record is not None:
+                records.append(record)
+    return summarize_fold_results(records)
+
+
+def well_group_search(df: pd.DataFrame,
+                      features: List[str],
+                      target: str,
+                      param_grid: Union[dict, List[dict]],
+                      group_column: str = 'Well',
+                      n_splits: int = 5,
+                      factor: int = 3,
+                      min_resources: Union[int, None] = None,
+                      cache_dir: Union[str, None] = None,
+                      max_workers: Union[int, None] = None,
+                      random_state: int = 0,
+                      return_train_score: bool = False,
+                      show_progress: bool = True) -> Tuple[dict, pd.DataFrame]:
+    """Search of random forest parameters with folds grouped by well, so neighbouring samples of one well never
+    get into train and test at once. Candidates are evaluated by successive halving: all candidates are fitted
+    on small subsample of train part of each fold, only the best 1/factor of them go on to the next iteration with
+    factor times more samples, the last iteration uses all samples. Folds of all candidates of iteration are
+    fitted in parallel processes, each result is stored in cache_dir as soon as it is ready, so repeated call
+    after interruption evaluates only missing folds.
+    :param df: DataFrame with features, target and group column, e.g. from sample_field or feature_frame.
+    :param features: Names of feature columns.
+    :param target: Name of target column.
+    :param param_grid: Grid of RandomForestRegressor parameters in format of sklearn GridSearchCV.
+    :param group_column: (optional) Column with well names.
+    :param n_splits: (optional) Number of folds, it can't be larger than number of wells.
+    :param factor: (optional) Part of candidates kept after each iteration and growth of samples.
+    :param min_resources: (optional) Number of train samples of the first iteration, by the default it is chosen
+    so the last iteration uses all samples.
+    :param cache_dir: (optional) Folder to store results of folds, separate folder should be used for each search
+    to show its results from cache.
+    :param max_workers: (optional) Number of worker processes, if 1 is given folds are fitted in current process.
+    :param random_state: (optional) Seed of subsampling.
+    :param return_train_score: (optional) Score models on train part too, it takes as long as scoring on test
+    part, by the default mean_train_score of results is NaN.
+    :param show_progress: (optional) Print number of evaluated folds.
+    :returns: Tuple of best parameters and table of results of all iterations (see summarize_fold_results).
+    """
+    from sklearn.model_selection import GroupKFold, ParameterGrid
+    data = df.dropna(subset=list(features) + [target, group_column])
+    X = data[features].to_numpy(dtype=np.float32)
+    y = data[target].to_numpy(dtype=np.float32)
+    groups = data[group_column].astype(str).to_numpy()
+    fingerprint = _data_fingerprint(X, y, groups, list(features))
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    max_resources = min(len(X) - len(test_index) for _, test_index in GroupKFold(n_splits).split(X, y, groups))
+    # Numpy scalars of grid are converted, so parameters are the same after they are read from cache.
+    candidates = [{name: value.item() if isinstance(value, np.generic) else value for name, value in params.items()}
+                  for params in ParameterGrid(param_grid)]
+    if not candidates:
+        raise ValueError(f'Grid of parameters has no candidates, each parameter needs at least one value: {param_grid}')
+    n_iterations = max(math.ceil(math.log(len(candidates), factor)), 0) + 1
+    if min_resources is not None:
+        # Iterations which would need more samples than available are dropped.
+        n_iterations = min(n_iterations, int(math.log(max(max_resources / min_resources, 1), factor)) + 1)
+
+    records = []
+    local_data_ready = False
+    executor = None
+    try:
+        for iteration in range(n_iterations):
+            if iteration == n_iterations - 1:
+                n_resources = max_resources
+            elif min_resources is not None:
+                n_resources = min_resources * factor ** iteration
+            else:
+                n_resources = max(max_resources // factor ** (n_iterations - 1 - iteration), 1)
+
+            tasks = {}
+            iteration_records = []
+            for params in candidates:
+                for fold in range(n_splits):
+                    key = _task_key(fingerprint, params, fold, n_splits, n_resources, random_state,
+                                    return_train_score)
+                    record = _read_record(os.path.join(cache_dir, key + '.json')) if cache_dir is not None else None
+                    if record is not None:
+                        iteration_records.append(record)
+                    else:
+                        tasks[key] = (params, fold)
+
+            def register(result):
+                key, scores, error = result
+                params, fold = tasks[key]
+                if error is not None:
+                    print(f'\nFitting of {params} on fold {fold} failed: {error}')
+                    scores = {'fit_time': np.nan, 'score_time': np.nan, 'test_score': np.nan,
+                              'train_score': np.nan, 'n_train_samples': 0}
+                record = {'params': params, 'fold': fold, 'n_resources': n_resources, **scores}
+                if cache_dir is not None and error is None:
+                    _write_record(os.path.join(cache_dir, key + '.json'), record)
+                iteration_records.append(record)
+                if show_progress:
+                    sys.stdout.write(f'\rIteration {iteration + 1}/{n_iterations}: {len(candidates)} candidates, '
+                                     f'{n_resources} samples, evaluated {len(iteration_records)}/'
+                                     f'{len(candidates) * n_splits} folds')
+                    sys.stdout.flush()
+
+            if tasks:
+                if max_workers == 1:
+                    if not local_data_ready:
+                        _init_search_worker(X, y, groups, n_splits)
+                        local_data_ready = True
+                    for key, (params, fold) in tasks.items():
+                        register(_evaluate_fold(key, params, fold, n_resources, random_state, return_train_score))
+                else:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_search_worker,
+                                                       initargs=(X, y, groups, n_splits))
+                    futures = [executor.submit(_evaluate_fold, key, params, fold, n_resources, random_state,
+                                               return_train_score)
+                               for key, (params, fold) in tasks.items()]
+                    for future in as_completed(futures):
+                        register(future.result())
+            if show_progress:
+                sys.stdout.write(f'\rIteration {iteration + 1}/{n_iterations}: {len(candidates)} candidates, '
+                                 f'{n_resources} samples, evaluated {len(iteration_records)}/'
+                                 f'{len(candidates) * n_splits} folds\n')
+                sys.stdout.flush()
+            records.extend(iteration_records)
+
+            # The best 1/factor of candidates go to the next iteration.
+            summary = summarize_fold_results(iteration_records)
+            summary = summary.sort_values('mean_test_score', ascending=False, na_position='last')
+            survivors = summary['params'].tolist()[:max(math.ceil(len(candidates) / factor), 1)]
+            if iteration < n_iterations - 1:
+                candidates = survivors
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if local_data_ready:
+            _search_data.clear()
+
+    results = summarize_fold_results(records)
+    return survivors[0], results
@@ -0,0 +1,137 @@
+import glob
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, Tuple, Union
+import pandas as pd
+
+from .petrophysical_layout import create_single_well_df
+from .cache import WellCache
+
+
+def collect_las_files(source: Union[str, Iterable[str]]) -> List[str]:
+    """Get sorted list of las files from directory, glob pattern or iterable with paths.
+    :param source: Path to directory with las files, glob pattern (e.g. "data/**/*.las") or list of paths.
+    """
+    if isinstance(source, str):
+        if os.path.isdir(source):
+            paths = [os.path.join(source, name) for name in os.listdir(source)
+                     if name.lower().endswith('.las')]
+        else:
+            paths = glob.glob(source, recursive=True)
+    else:
+        paths = list(source)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def _load_single_well(las_file_path: str, assignment_file_path: Union[str, None], cache: Union[WellCache, None]):
+    """Worker of process pool, errors are returned instead of being raised so the batch isn't aborted."""
+    try:
+        return las_file_path, create_single_well_df(las_file_path, assignment_file_path, cache), None
+    except Exception as err:
+        return las_file_path, None, f'{type(err).__name__}: {err}'
+
+
+def _well_key(las_file_path: str, df: pd.DataFrame, existing_keys) -> str:
+    """Name of well from UWI/WELL header stored in 'Well' column, file name is added if well name isn't unique.
+    Empty names are treated as unknown, then name of file is used."""
+    name = df['Well'].iloc[0] if 'Well' in df.columns and len(df) > 0 else None
+    name = '' if name is None or pd.isna(name) else str(name).strip()
+    if name in ('', 'unknown'):
+        name = os.path.splitext(os.path.basename(las_file_path))[0]
+    key = name
+    number = 1
+    while key in existing_keys:
+        suffix = os.path.basename(las_file_path) if number == 1 else f'{os.path.basename(las_file_path)}, {number}'
+        key = f'{name} ({suffix})'
+        number += 1
+    return key
+
+
+def _print_progress(done: int, total: int, failed: int) -> None:
+    sys.stdout.write(f'\rLoaded {done}/{total} las files, failed {failed}')
+    if done == total:
+        sys.stdout.write('\n')
+    sys.stdout.flush()
+
+
+def iter_multiple_wells(source: Union[str, Iterable[str]],
+                        assignment_file_path: Union[str, None] = None,
+                        max_workers: Union[int, None] = None,
+                        cache: Union[WellCache, None] = None) -> Iterator[Tuple[str, Union[pd.DataFrame, None],
+                                                                                 Union[str, None]]]:
+    """Load las files in parallel processes and yield them in order of completion. Only a few files per worker
+    are loaded ahead, so memory doesn't grow with number of files when each DataFrame is dropped after use
+    (e.g. after it is written to WellStore).
+    :param source: Path to directory with las files, glob pattern or list of paths.
+    :param assignment_file_path: (optional) Path to assignment Excel file with TAB "aliases".
+    :param max_workers: (optional) Number of worker processes, by the default number of CPUs. If 1 is given
+    files are loaded in current process.
+    :param cache: (optional) WellCache to reuse DataFrames standardised in previous sessions.
+    :returns: Iterator of (path of las file, DataFrame or None, error or None).
+    """
+    paths = collect_las_files(source)
+    if max_workers == 1 or len(paths) <= 1:
+        for path in paths:
+            yield _load_single_well(path, assignment_file_path, cache)
+        return
+
+    remaining = iter(paths)
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_load_single_well, path, assignment_file_path, cache)
+                   for _, path in zip(range(window), remaining)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                path = next(remaining, None)
+                if path is not None:
+                    pending.add(executor.submit(_load_single_well, path, assignment_file_path, cache))
+
+
+def load_multiple_wells(source: Union[str, Iterable[str]],
+                        assignment_file_path: Union[str, None] = None,
+                        output: str = 'dict',
+                        max_workers: Union[int, None] = None,
+                        show_progress: bool = True,
+                        cache: Union[WellCache, None] = None) -> Tuple[Union[dict, pd.DataFrame], dict]:
+    """Load several las files in parallel processes with create_single_well_df.
+    :param source: Path to directory with las files, glob pattern or list of paths.
+    :param assignment_file_path: (optional) Path to assignment Excel file with TAB "aliases".
+    :param output: (optional) 'dict' to get dictionary of DataFrames keyed by well name (UWI/WELL header)
+    or 'concat' to get single field-level DataFrame.
+    :param max_workers: (optional) Number of worker processes, by the default number of CPUs. If 1 is given
+    files are loaded in current process.
+    :param show_progress: (optional) Print number of processed files.
+    :param cache: (optional) WellCache to reuse DataFrames standardised in previous sessions.
+    :returns: Tuple of loaded data and dictionary of errors keyed by path of las file.
+    """
+    if output not in ('dict', 'concat'):
+        raise ValueError(f"output has to be 'dict' or 'concat', got {output!r}")
+
+    paths = collect_las_files(source)
+    results = {}
+    errors = {}
+
+    def register(result):
+        las_file_path, df, error = result
+        if error is not None:
+            errors[las_file_path] = error
+        else:
+            results[las_file_path] = df
+        if show_progress:
+            _print_progress(len(results) + len(errors), len(paths), len(errors))
+
+    for result in iter_multiple_wells(paths, assignment_file_path, max_workers, cache):
+        register(result)
+
+    # Keep order of files independent of order of completion.
+    wells = {}
+    for path in paths:
+        if path in results:
+            wells[_well_key(path, results[path], wells)] = results[path]
+
+    if output == 'concat':
+        return (pd.concat(wells.values(), ignore_index=True) if wells else pd.DataFrame()), errors
+    return wells, errors
@@ -1,14 +1,30 @@
-from typing import Tuple, Optional, Union
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Tuple, Optional, Union
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-import matplotlib.backend_bases
-import matplotlib.text
-import lasio
 
+if TYPE_CHECKING:
+    import matplotlib.backend_bases
+    import matplotlib.text
+    import lasio
+
+# matplotlib and lasio are imported on first use, so reading and processing of wells don't load them.
 
 from .utils import load_tracks_description, load_mnemonic_aliases_correspond
-from .calculator import Calculator
+from .processing import ProcessingGraph
+from .cache import WellCache
+from .well_statistics import attach_statistics, curve_statistics
+from .instrumentation import stage, instrumented
+
+
+# Fills which are used when assignment file doesn't declare "fill_*" columns in tracks description.
+DEFAULT_FILLS = {
+    'Caliper': {'type': 'curve', 'reference': 'Bitsize', 'color': 'red', 'color_below': 'yellow',
+                'cutoff': None, 'alpha': 0.4},
+    'sPI_RU': {'type': 'baseline', 'reference': 0, 'color': 'skyblue', 'color_below': None,
+               'cutoff': None, 'alpha': 0.4},
+}
 
 
 class PetrophysicalLayout:
@@ -20,14 +36,26 @@ class PetrophysicalLayout:
     :param depth_range: (optional) Depth range can be specified in form of tuple (min, max)
      or if "None" is specified then use min and max depth curve in dataset to determine limits of plotting.
     :param mode: (optional) By the default mode is 'passive' in this mode figure can be plotted inside jupyter, another
-    option to set it 'active' so it can be used from command line to plot the figure.
+    option to set it 'active' so it can be used from command line to plot the figure. In 'headless' mode figure is
+    created without pyplot and display (Agg canvas), it can be saved by "save" method and has to be closed by "close".
+    :param level_of_detail: (optional) If True each curve is decimated to about pixel height of its axes keeping
+    minimum and maximum in each bin, so spikes are preserved. Curves are re-rendered after zooming.
+    :param tracks_description: (optional) Already parsed tracks description (see load_tracks_description), if it is
+    given assignment_file_path isn't read. Useful to parse the assignment file once for many layouts.
+    :param figsize: (optional) Size of figure in inches.
+    :param depth_cursor: (optional) If True horizontal cursor with readout of curve values at its depth follows
+    the mouse. Cursor is drawn by blitting over cached background, so the figure isn't re-rendered on moving.
     """
 
     def __init__(self,
                  df: pd.DataFrame,
                  assignment_file_path: Union['str', None] = None,
                  depth_range: Union[tuple, None] = None,
-                 mode: str = 'passive'):
+                 mode: str = 'passive',
+                 level_of_detail: bool = False,
+                 tracks_description: Union[list, None] = None,
+                 figsize: Union[tuple, None] = None,
+                 depth_cursor: bool = False):
 
         # Get screen dimensions
         dpi = 100
@@ -35,19 +63,43 @@ class PetrophysicalLayout:
         self.tracks_dict = {}
         self.df = df
         self.depth_range = depth_range
+        self.level_of_detail = level_of_detail
+        self.mode = mode
 
-        if assignment_file_path is None:
+        if tracks_description is not None:
+            self.tracks_description = tracks_description
+        elif assignment_file_path is None:
             self.tracks_description = load_tracks_description()
         else:
             self.tracks_description = load_tracks_description(assignment_file_path)
 
         if self.check_integrity_of_data():
-            self.fig, self.ax = plt.subplots(1, len(self.tracks_description),
-                                             dpi=dpi)
-            self.prepare_figure()
-
-        # noinspection PyTypeChecker
-        self.fig.canvas.mpl_connect('button_press_event', self.on_mouse_click)
+            if mode == 'headless':
+                # Figure isn't registered in pyplot, so it is released as soon as layout is closed and pyplot
+                # with its interactive backend isn't imported.
+                from matplotlib.figure import Figure
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                self.fig = Figure(figsize=figsize, dpi=dpi)
+                FigureCanvasAgg(self.fig)
+                self.ax = self.fig.subplots(1, len(self.tracks_description))
+            else:
+                from matplotlib import pyplot as plt
+                self.fig, self.ax = plt.subplots(1, len(self.tracks_description),
+                                                 dpi=dpi, figsize=figsize)
+            # All tracks share single depth axis, so zooming or panning one of them moves all others.
+            for axis in np.ravel(self.ax)[1:]:
+                axis.sharey(np.ravel(self.ax)[0])
+            with stage('layout.build', rows=len(self.df)):
+                self.prepare_figure()
+
+        self.rendered_limits = tuple(sorted(self.depth_range))
+        # Depth axis is shared, so limits changed on any track (by toolbar zoom, pan or code) are reported
+        # by the first one.
+        np.ravel(self.ax)[0].callbacks.connect('ylim_changed', self.on_depth_limits_changed)
+        # Every redraw of canvas (window, notebook, update_window) is recorded, saving draws figure on its own
+        # canvas, so it is recorded by "save". Canvas isn't pickled with figure.
+        self.fig.canvas.draw = instrumented('layout.draw')(self.fig.canvas.draw)
+        self.depth_cursor = DepthCursor(self) if depth_cursor and mode != 'headless' else None
 
         if mode == 'active':
             self.marker: Optional[matplotlib.text.Text] = None
@@ -72,10 +124,33 @@ class PetrophysicalLayout:
             self.tracks_dict.update({track_id: PetrophysicalTrack(track,
                                                                   self.ax[track_id],
                                                                   self.df,
-                                                                  self.depth_range)})
+                                                                  self.depth_range,
+                                                                  self.level_of_detail)})
 
         # Specify super title for figure.
-        self.fig.suptitle(f"Layout of {self.df['Well'].unique()[0]}", fontsize=18, ha='left', x=0.0)
+        well_name = self.df['Well'].unique()[0] if 'Well' in self.df.columns else self.df.attrs.get('Well', 'unknown')
+        self.fig.suptitle(f"Layout of {well_name}", fontsize=18, ha='left', x=0.0)
+
+    def save(self, target, **kwargs) -> None:
+        """Save figure of layout.
+        :param target: Path to file (format is defined by extension, e.g. png, svg, pdf) or opened PdfPages
+        to add the layout as a new page of multi-page pdf.
+        :param kwargs: (optional) Arguments of matplotlib savefig.
+        """
+        from matplotlib.backends.backend_pdf import PdfPages
+        # Figure is drawn while it is saved, so time of saving is recorded as drawing.
+        with stage('layout.draw'):
+            if isinstance(target, PdfPages):
+                target.savefig(self.fig, **kwargs)
+            else:
+                self.fig.savefig(target, **kwargs)
+
+    def close(self) -> None:
+        """Release figure of layout."""
+        self.fig.clf()
+        if self.mode != 'headless':
+            from matplotlib import pyplot as plt
+            plt.close(self.fig)
 
     def check_integrity_of_data(self) -> bool:
         """This function checks data integrity before starting the program. It returns True if
@@ -88,34 +163,108 @@ class PetrophysicalLayout:
 
     def on_mouse_click(self, event: matplotlib.backend_bases.MouseEvent) -> None:
         """Method which provides function to reset depth limits if limit on one of the graphs is changed."""
-        axes = event.inaxes
-        if axes is None:
+        if event.inaxes is not None:
+            self.on_depth_limits_changed(event.inaxes)
+
+    def on_depth_limits_changed(self, axes) -> None:
+        """Re-render curves of all tracks for new depth limits of axes."""
+        # Depth axis is shared by all tracks, so only the data need to be updated when limits are changed.
+        limits = tuple(sorted(axes.get_ylim()))
+        if limits == self.rendered_limits:
             return
-        limits = axes.get_ylim()
-        for axis in axes.figure.get_axes():
-            axis.set_ylim(*limits)
+        self.rendered_limits = limits
+        # Plot only data of the new depth window (and with resolution of the new window).
+        for track in self.tracks_dict.values():
+            track.update_window(limits)
         # Update graph
-        axes.figure.canvas.draw()
+        axes.figure.canvas.draw_idle()
+
+
+class DepthCursor:
+    """Horizontal depth cursor through all tracks of PetrophysicalLayout with readout of curve values at the
+    cursor depth. Static part of figure is cached after each full draw and the cursor is blitted over it.
+    :param layout: PetrophysicalLayout to attach the cursor to.
+    """
+
+    def __init__(self, layout: PetrophysicalLayout):
+        self.layout = layout
+        self.canvas = layout.fig.canvas
+        self.background = None
+
+        df = layout.df
+        order = np.argsort(df['Depth'].to_numpy(dtype=float), kind='stable')
+        self.depth = df['Depth'].to_numpy(dtype=float)[order]
+        curves = []
+        for track in layout.tracks_dict.values():
+            curves.extend(curve for curve in track.curves_dict.values() if curve not in curves)
+        self.values = {curve: df[curve].to_numpy(dtype=float)[order] for curve in curves}
+
+        self.lines = [axis.axhline(np.nan, color='grey', linewidth=0.8, animated=True, visible=False)
+                      for axis in np.ravel(layout.ax)]
+        self.readout = layout.fig.text(0.01, 0.005, '', fontsize=10, family='monospace',
+                                       animated=True, visible=False)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.canvas.mpl_connect('motion_notify_event', self.on_move)
+
+    def on_draw(self, event) -> None:
+        """Cache background after full redraw of figure (e.g. after zoom or resizing)."""
+        self.background = self.canvas.copy_from_bbox(self.layout.fig.bbox)
+        self.draw_cursor()
+
+    def read_values(self, depth: float) -> dict:
+        """Get values of curves at the nearest sample to the depth."""
+        if len(self.depth) == 0:
+            return {}
+        position = 0
+        if len(self.depth) > 1:
+            position = np.clip(np.searchsorted(self.depth, depth), 1, len(self.depth) - 1)
+            position -= depth - self.depth[position - 1] < self.depth[position] - depth
+        return {'Depth': self.depth[position], **{curve: values[position] for curve, values in self.values.items()}}
+
+    def on_move(self, event) -> None:
+        if event.inaxes is None or event.ydata is None or self.background is None:
+            return
+        values = self.read_values(event.ydata)
+        for line in self.lines:
+            line.set_ydata([event.ydata, event.ydata])
+            line.set_visible(True)
+        self.readout.set_text('  '.join(f'{curve}={PetrophysicalTrack.custom_round(value)}'
+                                        for curve, value in values.items() if not np.isnan(value)))
+        self.readout.set_visible(True)
+        self.canvas.restore_region(self.background)
+        self.draw_cursor()
+
+    def draw_cursor(self) -> None:
+        for line in self.lines:
+            line.axes.draw_artist(line)
+        self.layout.fig.draw_artist(self.readout)
+        self.canvas.blit(self.layout.fig.bbox)
 
 
 class PetrophysicalTrack:
-    def __init__(self, track_description, track_main_ax, df, depth_range):
+    def __init__(self, track_description, track_main_ax, df, depth_range, level_of_detail=False, scales=None):
+        self.full_df = df
+        self.scales = scales
+        self.track_description = track_description
         self.df = df[(df['Depth'] > depth_range[0]) & (df['Depth'] < depth_range[1])]
         self.track_main_ax = track_main_ax
         self.depth_range = depth_range
+        self.level_of_detail = level_of_detail
         self.twins_dict = {}
         self.logs_dict = {}
+        self.curves_dict = {}
+        self.fills_dict = {}
 
         # Adjust main axes.
         self.track_main_ax.set_xticks([])
         if track_description['type'] == 'main':
             self.track_main_ax.set(ylabel='Depth, m')
             self.track_main_ax.yaxis.label.set_fontsize(18)
-            self.track_main_ax.set(ylim=self.depth_range)
         else:
-            self.track_main_ax.set_yticklabels([])
-            self.track_main_ax.set(ylim=self.depth_range)
-        self.track_main_ax.invert_yaxis()
+            # Tick labels are hidden per axes, formatter of depth axis is shared by all tracks.
+            self.track_main_ax.tick_params(axis='y', labelleft=False)
+        # Depth increases downwards, limits are set explicitly because depth axis is shared between tracks.
+        self.track_main_ax.set(ylim=(max(self.depth_range), min(self.depth_range)))
 
         # Create auxiliary axes and plot curves on them according to given
         # assignment from the PetrophysicalLayout class.
@@ -128,12 +277,14 @@ class PetrophysicalTrack:
                 shift = 1 + twin_id * 0.07
                 self.twins_dict[twin_id].spines.top.set_position(("axes", shift))
 
+                depth, values = self.prepare_curve_data(curve, self.twins_dict[twin_id])
                 graphic_link = self.twins_dict[twin_id].plot(
-                        df[curve],
-                        df['Depth'],
+                        values,
+                        depth,
                         color=track_description['curves'][curve]['color'])
 
                 self.logs_dict.update({twin_id: graphic_link})
+                self.curves_dict.update({twin_id: curve})
 
                 # Perform adjusting of auxiliary axes
                 label = f"{track_description['curves'][curve]['label']}, {track_description['curves'][curve]['unit']}"
@@ -147,17 +298,41 @@ class PetrophysicalTrack:
                                    curve=track_description['curves'][curve],
                                    ax=self.twins_dict[twin_id])
                 # Adjust fill between curves and appearance of curves.
-                self.define_appearance(curve_name=curve,
-                                       graph_inst=self.logs_dict[twin_id],
-                                       ax=self.twins_dict[twin_id])
+                self.fills_dict[twin_id] = self.define_appearance(curve_name=curve,
+                                                                  graph_inst=self.logs_dict[twin_id],
+                                                                  ax=self.twins_dict[twin_id])
 
         # Adding grid to the main axes if at least one curve on track exists
         if self.twins_dict != {}:
-            self.twins_dict[0].grid(which='major', axis='x', alpha=0.8)
-            self.twins_dict[0].grid(which='minor', axis='x', alpha=0.3)
+            first_twin = next(iter(self.twins_dict.values()))
+            first_twin.grid(which='major', axis='x', alpha=0.8)
+            first_twin.grid(which='minor', axis='x', alpha=0.3)
         self.track_main_ax.grid(which='major', axis='y', alpha=0.8)
         self.track_main_ax.grid(which='minor', axis='y', alpha=0.3)
 
+    def prepare_curve_data(self, curve_name, ax):
+        """Get depth and values of curve inside depth window, decimated to pixel height of axes
+        if level of detail mode is on."""
+        depth = self.df['Depth'].to_numpy(dtype=float)
+        values = self.df[curve_name].to_numpy(dtype=float)
+        if self.level_of_detail:
+            n_bins = max(int(ax.get_window_extent().height), 1)
+            depth, values = decimate_min_max(depth, values, n_bins)
+        return depth, values
+
+    def update_window(self, depth_range):
+        """Re-render curves and fills for new depth window."""
+        self.depth_range = depth_range
+        self.df = self.full_df[(self.full_df['Depth'] > depth_range[0]) & (self.full_df['Depth'] < depth_range[1])]
+        for twin_id, curve in self.curves_dict.items():
+            depth, values = self.prepare_curve_data(curve, self.twins_dict[twin_id])
+            self.logs_dict[twin_id][0].set_data(values, depth)
+            for fill in self.fills_dict.get(twin_id, []):
+                fill.remove()
+            self.fills_dict[twin_id] = self.define_appearance(curve_name=curve,
+                                                              graph_inst=self.logs_dict[twin_id],
+                                                              ax=self.twins_dict[twin_id])
+
     def define_scales(self, curve_name, curve, ax):
         """Adjust scale and ranges for particular curves."""
         if curve['scale'] == 'log':
@@ -166,37 +341,94 @@ class PetrophysicalTrack:
             ax.set_xlim(curve['min'], curve['max'])
 
         if curve['range_detection'] == 'auto':
-            max_val = self.df[curve_name].quantile(0.99)
-            min_val = self.df[curve_name].quantile(0.01)
-            if not np.isnan(max_val) and not np.isnan(min_val) and max_val > min_val:
-                range_val = (max_val - min_val)*0.05
-                ax.set_xlim(self.custom_round(min_val-range_val),
-                            self.custom_round(max_val+range_val))
-            else:
-                pass
+            with stage('layout.auto_range'):
+                limits = self.detect_range(curve_name)
+            if limits is not None:
+                ax.set_xlim(*limits)
 
         if curve['reverse']:
             ax.invert_xaxis()
 
-    def define_appearance(self, curve_name, graph_inst, ax):
+    def detect_range(self, curve_name):
+        """Get range of curve with automatic range detection, None if it can't be detected."""
+        # Scales computed in advance (e.g. for several wells) are preferred to the data of current window.
+        if self.scales is not None and curve_name in self.scales:
+            return self.scales[curve_name]
+        if self.window_covers_well():
+            # Quantiles of the whole well are taken from statistics index instead of sorting the curve.
+            statistics = curve_statistics(self.full_df, curve_name)
+            return None if statistics is None else self.range_from_quantiles(statistics['q01'], statistics['q99'])
+        return self.auto_range(self.df[curve_name])
 
-        if (curve_name in ['Caliper']) & ('Bitsize' in self.df.columns):
-            ax.fill_betweenx(self.df['Depth'],
-                             self.df['Bitsize'],
-                             self.df[curve_name],
-                             where=(self.df[curve_name] >= self.df['Bitsize']), color='red', alpha=0.4)
-            ax.fill_betweenx(self.df['Depth'],
-                             self.df['Bitsize'],
-                             self.df[curve_name],
-                             where=(self.df[curve_name] < self.df['Bitsize']), color='yellow', alpha=0.4)
+    def define_appearance(self, curve_name, graph_inst, ax):
+        """Adjust appearance of curve and add fills, list of created fills is returned."""
+        fills = []
+        curve_description = self.track_description['curves'].get(curve_name, {})
+        fill = curve_description['fill'] if 'fill' in curve_description else DEFAULT_FILLS.get(curve_name)
+        if fill is not None:
+            fills.extend(self.add_fill(curve_name, fill, ax))
 
         if curve_name in ['Bitsize']:
             graph_inst[0].set_linestyle('--')
             graph_inst[0].set_linewidth(1)
+        return fills
+
+    def add_fill(self, curve_name, fill, ax):
+        """Add shading of curve declared in tracks description.
+        Type 'curve' - fill between curve and reference curve, 'color' where curve is not less than the reference
+        and 'color_below' where it is less. Type 'baseline' - fill between curve and constant reference value.
+        Type 'cutoff' - fill between curve and reference value, 'color' where curve is not less than cutoff and
+        'color_below' where it is less (nothing if 'color_below' is not given).
+        :returns: List of created PolyCollection.
+        """
+        depth = self.df['Depth'].to_numpy(dtype=float)
+        values = self.df[curve_name].to_numpy(dtype=float)
+        if fill['type'] == 'curve':
+            if fill['reference'] not in self.df.columns:
+                return []
+            reference = self.df[fill['reference']].to_numpy(dtype=float)
+            split_by = reference
+        else:
+            reference = np.full(len(values), 0.0 if fill['reference'] is None else float(fill['reference']))
+            split_by = reference if fill['type'] == 'baseline' else np.full(len(values), float(fill['cutoff']))
+
+        alpha = 0.4 if fill['alpha'] is None else fill['alpha']
+        above = values >= split_by
+        if fill['color_below'] is None and fill['type'] == 'cutoff':
+            masks = [(above, fill['color'])]
+        elif fill['color_below'] is None or fill['color_below'] == fill['color']:
+            masks = [(np.ones(len(values), dtype=bool), fill['color'])]
+        else:
+            masks = [(above, fill['color']), (~above, fill['color_below'])]
+
+        from matplotlib.collections import PolyCollection
+        collections = []
+        for mask, color in masks:
+            polygons = fill_polygons(depth, values, reference, mask)
+            if polygons:
+                collection = PolyCollection(polygons, facecolors=color, edgecolors='none', alpha=alpha)
+                ax.add_collection(collection, autolim=False)
+                collections.append(collection)
+        return collections
+
+    def window_covers_well(self):
+        """Check if depth window contains all samples of the well."""
+        depth = self.full_df['Depth']
+        return len(depth) > 0 and min(self.depth_range) < depth.min() and depth.max() < max(self.depth_range)
 
-        # Add fill between curve and maximum/minimum value or between curves.
-        if curve_name in ['sPI_RU']:
-            ax.fill_betweenx(self.df['Depth'], self.df[curve_name], color='skyblue', alpha=0.4)
+    @staticmethod
+    def auto_range(values: pd.Series) -> Union[Tuple[float, float], None]:
+        """Get range of curve by 1 and 99 percentiles extended by 5%, None if range can't be detected."""
+        return PetrophysicalTrack.range_from_quantiles(values.quantile(0.01), values.quantile(0.99))
+
+    @staticmethod
+    def range_from_quantiles(min_val, max_val) -> Union[Tuple[float, float], None]:
+        """Get range of curve by its 1 and 99 percentiles extended by 5%, None if range can't be detected."""
+        if not np.isnan(max_val) and not np.isnan(min_val) and max_val > min_val:
+            range_val = (max_val - min_val)*0.05
+            return (PetrophysicalTrack.custom_round(min_val-range_val),
+                    PetrophysicalTrack.custom_round(max_val+range_val))
+        return None
 
     @staticmethod
     def custom_round(value):
@@ -210,13 +442,92 @@ class PetrophysicalTrack:
             return round(value, 3)
 
 
-def create_single_well_df(las_file_path: str, assignment_file_path: Union[str, None] = None):
+def fill_polygons(depth: np.ndarray, x1: np.ndarray, x2: np.ndarray, mask: np.ndarray) -> list:
+    """Function to build polygons between two curves for each run of consecutive samples where mask is True and
+    both curves are not NaN. Vertices of all polygons are gathered in NumPy at once, so cost depends on number of
+    runs rather than on number of samples passed through matplotlib.
+    :param depth: Depth of samples.
+    :param x1: Values of the first curve.
+    :param x2: Values of the second curve (or baseline).
+    :param mask: Boolean mask of samples to fill.
+    :returns: List of arrays of polygon vertices with shape (n, 2) in (x, depth) coordinates.
+    """
+    valid = np.asarray(mask, dtype=bool) & ~np.isnan(x1) & ~np.isnan(x2)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], valid.astype(np.int8), [0]))))
+    lengths = edges[1::2] - edges[::2]
+    if len(lengths) == 0:
+        return []
+    samples = np.flatnonzero(valid)
+    # Each run becomes polygon: its samples going down along x1 followed by the same samples going up along x2.
+    run_offsets = np.repeat(np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    position = np.arange(len(samples)) - run_offsets
+    forward = 2 * run_offsets + position
+    backward = 2 * run_offsets + 2 * np.repeat(lengths, lengths) - 1 - position
+    vertices = np.empty((2 * len(samples), 2))
+    vertices[forward] = np.column_stack((x1[samples], depth[samples]))
+    vertices[backward] = np.column_stack((x2[samples], depth[samples]))
+    return np.split(vertices, 2 * np.cumsum(lengths)[:-1])
+
+
+def decimate_min_max(depth: np.ndarray, values: np.ndarray, n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Function to reduce number of points of curve to about 2 * n_bins. Samples are split into n_bins bins
+    and in each bin are kept points with minimum and maximum value in their original order, so spikes survive.
+    Bins without data keep NaN, so gaps of curve are preserved.
+    :param depth: Depth of samples, sorted.
+    :param values: Values of curve.
+    :param n_bins: Number of bins, usually pixel height of axes.
+    :returns: Tuple of decimated depth and values.
+    """
+    n_samples = len(values)
+    bin_size = int(np.ceil(n_samples / max(n_bins, 1)))
+    if bin_size <= 2:
+        return depth, values
+    n_rows = int(np.ceil(n_samples / bin_size))
+    padded = np.full(n_rows * bin_size, np.nan)
+    padded[:n_samples] = values
+    padded = padded.reshape(n_rows, bin_size)
+    nan_mask = np.isnan(padded)
+    min_position = np.where(nan_mask, np.inf, padded).argmin(axis=1)
+    max_position = np.where(nan_mask, -np.inf, padded).argmax(axis=1)
+    # Keep order of extremes inside each bin to draw the curve in the direction of depth.
+    positions = np.sort(np.stack([min_position, max_position], axis=1), axis=1)
+    indexes = (positions + np.arange(n_rows)[:, None] * bin_size).ravel()
+    return depth[indexes], values[indexes]
+
+
+def create_single_well_df(las_file_path: str,
+                          assignment_file_path: Union[str, None] = None,
+                          cache: Union[WellCache, None] = None):
     """Creation of DataFrame from las file
     :params las_file_path: Path to las file from which we are going to prepare composite df
     :params assignment_file_path: Path to assignment Excel file with TAB "aliases". If file isn't specified
     than the program takes default one. The example of default file provided on the figure above.
+    :params cache: (optional) WellCache where standardised DataFrame is looked up before parsing of las file
+    and stored after it.
+    Index of curve statistics is kept in df.attrs['curve_statistics'].
+    """
+    if cache is not None:
+        key = cache.key(las_file_path, load_mnemonic_aliases_correspond(assignment_file_path))
+        cached_df = cache.get(key)
+        if cached_df is not None:
+            # Statistics are stored with the entry, only entries written without them are computed.
+            return attach_statistics(cached_df)
+        df = create_single_well_df(las_file_path, assignment_file_path)
+        cache.put(key, df)
+        return df
+
+    import lasio
+    with stage('las.parse') as record:
+        las = lasio.read(las_file_path)
+        record.rows = len(las.index)
+    return well_df_from_las(las, assignment_file_path)
+
+
+def well_df_from_las(las: lasio.LASFile, assignment_file_path: Union[str, None] = None) -> pd.DataFrame:
+    """Creation of standardised DataFrame from already read las file, rows keep the order of las file.
+    :params las: LASFile read by lasio.
+    :params assignment_file_path: Path to assignment Excel file with TAB "aliases".
     """
-    las = lasio.read(las_file_path)
     las_df = las.df()
     if 'UWI' in las.well:
         las_df['Well'] = las.well['UWI'].value
@@ -226,35 +537,65 @@ def create_single_well_df(las_file_path: str, assignment_file_path: Union[str, N
         las_df['Well'] = 'unknown'
     las_df[las_df.index.name] = las_df.index
     las_df.reset_index(drop=True, inplace=True)
-    return dataframe_preprocessor(las_df, assignment_file_path=assignment_file_path)
+    with stage('aliases.standardise', rows=len(las_df)):
+        df = dataframe_preprocessor(las_df, assignment_file_path=assignment_file_path)
+    # Statistics of curves are computed once at ingestion, they are used by auto range detection and QC.
+    with stage('statistics.compute', rows=len(df)):
+        return attach_statistics(df)
+
+
+def coalesce_aliases(df: pd.DataFrame, aliases: list) -> pd.Series:
+    """Function to gather data for one mnemonic from several aliases column-wise. For each row is taken the
+    first non-null value following the priority order of aliases list, if all aliases are null the result is null.
+    :param df: DataFrame which contains all columns listed in aliases.
+    :param aliases: List of column names ordered by priority.
+    :returns: Series with coalesced values and the same index as df.
+    """
+    values = df[aliases].to_numpy()
+    present = ~pd.isna(values)
+    # Position of the first not null alias in each row, rows without data fall back to the first alias.
+    first_present = present.argmax(axis=1)
+    result = values[np.arange(len(values)), first_present]
+    if result.dtype == object:
+        result[~present.any(axis=1)] = None
+        return pd.Series(result, index=df.index).infer_objects()
+    return pd.Series(result, index=df.index)
 
 
 def dataframe_preprocessor(input_df: pd.DataFrame,
                            assignment_file_path: Union[None, str] = None) -> pd.DataFrame:
     """Function get df on input and looking into aliases table create set with universal names"""
 
-    def gather_data_for_several_aliases(row, aliases_input):
-        for alias in aliases_input:
-            if not pd.isna(row[alias]):
-                return row[alias]
-
     if assignment_file_path is None:
         mnem_dict = load_mnemonic_aliases_correspond()
     else:
         mnem_dict = load_mnemonic_aliases_correspond(assignment_file_path)
 
-    output_df = input_df.copy()
+    return standardise_by_aliases(input_df, map_existing_mnemonics(input_df.columns, mnem_dict))
+
 
-    # Get only existing list of mnemonics
+def map_existing_mnemonics(columns, mnem_dict: dict) -> dict:
+    """Function to get correspondence of mnemonics and only these of their aliases which exist in columns.
+    :param columns: Names of columns in DataFrame.
+    :param mnem_dict: Dictionary of mnemonics and their aliases from assignment file.
+    """
+    columns_set = set(columns)
     mnem_existing_dict = {}
     for mnemonic, aliases in mnem_dict.items():
         # Get the intersection while preserving the order from aliases list
-        intersection_ordered = [alias for alias in aliases if alias in set(output_df.columns)]
+        intersection_ordered = [alias for alias in aliases if alias in columns_set]
         if intersection_ordered:
             mnem_existing_dict.update({mnemonic: intersection_ordered})
+    return mnem_existing_dict
+
+
+def standardise_by_aliases(input_df: pd.DataFrame, mnem_existing_dict: dict) -> pd.DataFrame:
+    """Function to create DataFrame with universal names using correspondence from map_existing_mnemonics,
+    all other columns are removed."""
+    output_df = input_df.copy()
 
     for mnemonic, aliases in mnem_existing_dict.items():
-        output_df[mnemonic] = output_df.apply(gather_data_for_several_aliases, axis=1, args=(aliases, ))
+        output_df[mnemonic] = coalesce_aliases(output_df, aliases)
 
     # Remove all columns except these which are exist in mnemonics
     columns_to_remove = [column for column in output_df.columns if column not in mnem_existing_dict.keys()]
@@ -263,19 +604,19 @@ def dataframe_preprocessor(input_df: pd.DataFrame,
     return output_df
 
 
-def make_processing_well_logging(df: pd.DataFrame) -> None:
+def make_processing_well_logging(df: pd.DataFrame,
+                                 curves: Union[list, None] = None,
+                                 **parameters) -> ProcessingGraph:
     """Function which perform calculating of porosity, sw, vsh, etc ...
     can be applied to DataFrame before plotting of layout
     :param df: DataFrame for which processing will be applied.
+    :param curves: (optional) Names of derived curves to calculate, by the default only porosity by density
+    and resistivity is calculated. Available curves are defined in processing.DEFAULT_DEFINITIONS.
+    :param parameters: (optional) Constants overriding processing.DEFAULT_PARAMETERS, e.g. rw=0.05.
+    :returns: ProcessingGraph which can be reused to recompute curves with new parameters.
     """
-    matrix_density = 2.71
-    fluid_density = 1
-    a = 1
-    m = 2
-    rw = 0.6
-    if 'Density' in df.columns:
-        df['Porosity_density_calc'] = df.apply(Calculator.porosity_density,
-                                               axis=1, args=(matrix_density, fluid_density, 'Density',))
-    if 'ResistivityDeep' in df.columns:
-        df['Porosity_resistivity_calc'] = df.apply(Calculator.porosity_resistivity,
-                                                   axis=1, args=(a, m, rw, 'ResistivityDeep',))
+    if curves is None:
+        curves = ['Porosity_density_calc', 'Porosity_resistivity_calc']
+    graph = ProcessingGraph(df, parameters)
+    graph.apply(curves)
+    return graph
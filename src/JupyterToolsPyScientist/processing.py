@@ -0,0 +1,195 @@
+from typing import Callable, Dict, Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+from .calculator import Calculator
+from .instrumentation import stage
+from .well_statistics import curve_fingerprint
+
+
+DEFAULT_PARAMETERS = {
+    'matrix_density': 2.71,
+    'fluid_density': 1,
+    'a': 1,
+    'm': 2,
+    'n': 2,
+    'rw': 0.6,
+    'gr_clean': None,
+    'gr_shale': None,
+    'vsh_cutoff': 0.4,
+    'porosity_cutoff': 0.06,
+    'sw_cutoff': 0.6,
+}
+
+
+class CurveDefinition:
+    """Description of derived curve for processing graph.
+    :param name: Name of the curve which will be created in DataFrame.
+    :param function: Function which gets input curves as arrays (in order of inputs) followed by
+    parameters as keyword arguments and returns array with derived curve.
+    :param inputs: Names of input curves, it can be curves from DataFrame or other derived curves.
+    :param parameters: Names of parameters which are used by function.
+    """
+
+    def __init__(self, name: str, function: Callable, inputs: List[str], parameters: List[str]):
+        self.name = name
+        self.function = function
+        self.inputs = list(inputs)
+        self.parameters = list(parameters)
+
+
+def _vsh(gr, gr_clean, gr_shale):
+    """Volume of shale, if clean and shale lines aren't given they are taken by 5 and 95 percentiles of GR."""
+    if gr_clean is None or gr_shale is None:
+        if np.isnan(gr).all():
+            return np.full(gr.shape, np.nan)
+        gr_clean_auto, gr_shale_auto = np.nanquantile(gr, [0.05, 0.95])
+        gr_clean = gr_clean_auto if gr_clean is None else gr_clean
+        gr_shale = gr_shale_auto if gr_shale is None else gr_shale
+    return Calculator.vsh_linear(gr, gr_clean, gr_shale)
+
+
+DEFAULT_DEFINITIONS = [
+    CurveDefinition('Porosity_density_calc', Calculator.porosity_density_array,
+                    ['Density'], ['matrix_density', 'fluid_density']),
+    CurveDefinition('Porosity_resistivity_calc', Calculator.porosity_resistivity_array,
+                    ['ResistivityDeep'], ['a', 'm', 'rw']),
+    CurveDefinition('Vsh', _vsh, ['GR'], ['gr_clean', 'gr_shale']),
+    CurveDefinition('Porosity_effective', Calculator.porosity_effective,
+                    ['Porosity_density_calc', 'Vsh'], []),
+    CurveDefinition('Sw', Calculator.water_saturation_archie,
+                    ['ResistivityDeep', 'Porosity_effective'], ['a', 'm', 'n', 'rw']),
+    CurveDefinition('Net_pay', Calculator.net_pay_flag,
+                    ['Vsh', 'Porosity_effective', 'Sw'], ['vsh_cutoff', 'porosity_cutoff', 'sw_cutoff']),
+]
+
+
+class ProcessingGraph:
+    """Lazy processing of well logging data. Each derived curve is computed only when it is requested and the
+    result is memoized with parameters and checksums of input curves of whole its subtree, so after change of
+    a parameter or of input curve in DataFrame only curves which depend on it are recomputed.
+    :param df: DataFrame with standardised curves.
+    :param parameters: (optional) Parameters which override DEFAULT_PARAMETERS, unknown names raise ValueError.
+    :param definitions: (optional) List of CurveDefinition, if not specified DEFAULT_DEFINITIONS are used.
+    """
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 parameters: Optional[dict] = None,
+                 definitions: Optional[List[CurveDefinition]] = None):
+        self.df = df
+        self.definitions: Dict[str, CurveDefinition] = {}
+        for definition in (DEFAULT_DEFINITIONS if definitions is None else definitions):
+            self.definitions[definition.name] = definition
+        self.parameters = dict(DEFAULT_PARAMETERS)
+        if parameters is not None:
+            self.set_parameters(**parameters)
+        self._memo = {}
+        self.computed_log = []
+
+    def set_parameters(self, **parameters) -> None:
+        """Update parameters, memoized curves are invalidated lazily on next request."""
+        known = set(DEFAULT_PARAMETERS).union(*(definition.parameters for definition in self.definitions.values()))
+        unknown = [name for name in parameters if name not in known]
+        if unknown:
+            raise ValueError(f'Unknown processing parameters {unknown}, available are {sorted(known)}')
+        self.parameters.update(parameters)
+
+    def invalidate(self, curves: Union[Iterable[str], None] = None) -> None:
+        """Drop memoized results, for example to free memory.
+        :param curves: (optional) Names of curves to drop together with derived curves which depend on them,
+        if not specified the whole memo is cleared.
+        """
+        if curves is None:
+            self._memo.clear()
+        else:
+            curves = list(curves)
+            for curve in curves + self.dependents(curves):
+                self._memo.pop(curve, None)
+
+    def dependents(self, curves: Iterable[str]) -> List[str]:
+        """Get names of derived curves which use any of given curves directly or through other derived curves."""
+        names = set(curves)
+        result = []
+        changed = True
+        while changed:
+            changed = False
+            for name, definition in self.definitions.items():
+                if name not in names and any(input_curve in names for input_curve in definition.inputs):
+                    names.add(name)
+                    result.append(name)
+                    changed = True
+        return result
+
+    def dependencies(self, curve: str) -> List[str]:
+        """Get names of input curves from DataFrame needed to compute the curve."""
+        if curve not in self.definitions:
+            return [curve]
+        result = []
+        for input_curve in self.definitions[curve].inputs:
+            for dependency in self.dependencies(input_curve):
+                if dependency not in result:
+                    result.append(dependency)
+        return result
+
+    def parameters_of(self, curve: str) -> List[str]:
+        """Get names of parameters which affect the curve including parameters of its inputs."""
+        if curve not in self.definitions:
+            return []
+        result = list(self.definitions[curve].parameters)
+        for input_curve in self.definitions[curve].inputs:
+            result.extend(parameter for parameter in self.parameters_of(input_curve) if parameter not in result)
+        return result
+
+    def is_available(self, curve: str) -> bool:
+        """Check if the curve exists in DataFrame or all its inputs are available."""
+        if curve in self.definitions:
+            return all(self.is_available(input_curve) for input_curve in self.definitions[curve].inputs)
+        return curve in self.df.columns
+
+    def compute(self, curve: str) -> np.ndarray:
+        """Get values of curve, derived curves are taken from memo if their parameters were not changed."""
+        if curve not in self.definitions:
+            return self.df[curve].to_numpy(dtype=float)
+
+        definition = self.definitions[curve]
+        # Checksums of input curves are in the key, so curves of DataFrame changed in place are detected.
+        key = (tuple((parameter, self.parameters[parameter]) for parameter in self.parameters_of(curve)),
+               tuple((input_curve, curve_fingerprint(self.df[input_curve].to_numpy(dtype=float)))
+                     for input_curve in self.dependencies(curve)))
+        memoized = self._memo.get(curve)
+        if memoized is not None and memoized[0] == key:
+            return memoized[1]
+
+        inputs = [self.compute(input_curve) for input_curve in definition.inputs]
+        with stage(f'processing.{curve}', rows=len(self.df)):
+            values = definition.function(*inputs, **{parameter: self.parameters[parameter]
+                                                     for parameter in definition.parameters})
+        values = np.asarray(values, dtype=float)
+        self._memo[curve] = (key, values)
+        self.computed_log.append(curve)
+        return values
+
+    def apply(self, curves: Union[Iterable[str], None] = None) -> List[str]:
+        """Compute requested curves and write them into DataFrame. Curves which can't be computed because of
+        missing inputs are skipped.
+        :param curves: (optional) Names of curves, if not specified all defined curves are used. Names which are
+        not defined raise ValueError.
+        :returns: Names of curves written into DataFrame.
+        """
+        curves = list(self.definitions.keys() if curves is None else curves)
+        unknown = [curve for curve in curves if curve not in self.definitions]
+        if unknown:
+            raise ValueError(f'Unknown derived curves {unknown}, available are {list(self.definitions)}')
+        written = []
+        for curve in curves:
+            if self.is_available(curve):
+                self.df[curve] = self.compute(curve)
+                written.append(curve)
+        return written
+
+    def apply_for_tracks(self, tracks_description: list) -> List[str]:
+        """Compute only derived curves which are requested by tracks description of layout."""
+        requested = [curve for track in tracks_description for curve in track['curves'].keys()
+                     if curve in self.definitions]
+        return self.apply(requested)
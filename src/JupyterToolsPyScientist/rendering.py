@@ -0,0 +1,137 @@
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Tuple, Union
+import pandas as pd
+
+from .utils import load_tracks_description, unique_names
+from .petrophysical_layout import PetrophysicalLayout, create_single_well_df
+
+
+def _file_name(well_name: str) -> str:
+    """Make file name from well name."""
+    return re.sub(r'[^\w\-.]+', '_', str(well_name)).strip('_') or 'unknown'
+
+
+def _prepare_df(item: Union[str, pd.DataFrame], assignment_file_path: Union[str, None]) -> pd.DataFrame:
+    """Well can be given by DataFrame or by path to las file."""
+    if isinstance(item, pd.DataFrame):
+        return item
+    return create_single_well_df(item, assignment_file_path)
+
+
+def render_layout(df: pd.DataFrame,
+                  target,
+                  tracks_description: list,
+                  depth_range: Union[tuple, None] = None,
+                  figsize: tuple = (20, 14),
+                  level_of_detail: bool = True,
+                  **savefig_kwargs) -> None:
+    """Render layout of single well without display and close its figure.
+    :param df: DataFrame of well.
+    :param target: Path to image file or opened PdfPages.
+    :param tracks_description: Parsed tracks description.
+    :param depth_range: (optional) Depth range of layout.
+    :param figsize: (optional) Size of figure in inches.
+    :param level_of_detail: (optional) Decimate curves to resolution of image.
+    """
+    layout = PetrophysicalLayout(df, depth_range=depth_range, mode='headless', level_of_detail=level_of_detail,
+                                 tracks_description=tracks_description, figsize=figsize)
+    try:
+        layout.fig.subplots_adjust(top=0.78, bottom=0.05, left=0.1, right=0.9)
+        layout.save(target, **savefig_kwargs)
+    finally:
+        layout.close()
+
+
+def _render_worker(name, item, output_path, tracks_description, assignment_file_path, depth_range, figsize,
+                   level_of_detail):
+    """Worker of process pool, errors are returned instead of being raised so the batch isn't aborted."""
+    try:
+        render_layout(_prepare_df(item, assignment_file_path), output_path, tracks_description,
+                      depth_range=depth_range, figsize=figsize, level_of_detail=level_of_detail)
+        return name, output_path, None
+    except Exception as err:
+        return name, None, f'{type(err).__name__}: {err}'
+
+
+def render_layouts(wells: Dict[str, Union[str, pd.DataFrame]],
+                   output_dir: str,
+                   assignment_file_path: Union[str, None] = None,
+                   file_format: str = 'png',
+                   depth_range: Union[tuple, None] = None,
+                   figsize: tuple = (20, 14),
+                   level_of_detail: bool = True,
+                   max_workers: Union[int, None] = None,
+                   show_progress: bool = True) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Render layouts of many wells into separate files using worker processes. The assignment file is parsed
+    once and shared with all workers, each figure is closed right after it is saved.
+    :param wells: Dictionary with well name and DataFrame or path to las file (las files are read in workers).
+    :param output_dir: Folder to save images, it is created if doesn't exist.
+    :param assignment_file_path: (optional) Path to assignment file with "tracks_description" and "aliases".
+    :param file_format: (optional) 'png', 'svg' or 'pdf'.
+    :param depth_range: (optional) Depth range of layouts.
+    :param figsize: (optional) Size of figure in inches.
+    :param level_of_detail: (optional) Decimate curves to resolution of image.
+    :param max_workers: (optional) Number of worker processes, if 1 is given layouts are rendered in current process.
+    :param show_progress: (optional) Print number of rendered wells.
+    :returns: Tuple of dictionaries with paths of rendered files and errors keyed by well name.
+    """
+    if file_format not in ('png', 'svg', 'pdf'):
+        raise ValueError(f"file_format has to be 'png', 'svg' or 'pdf', got {file_format!r}")
+    os.makedirs(output_dir, exist_ok=True)
+    tracks_description = load_tracks_description(assignment_file_path)
+    rendered = {}
+    errors = {}
+
+    # Different well names can give the same file name after replacement of special characters.
+    file_names = unique_names(_file_name(name) for name in wells)
+    tasks = [(name, item, os.path.join(output_dir, f'{file_name}.{file_format}'), tracks_description,
+              assignment_file_path, depth_range, figsize, level_of_detail)
+             for (name, item), file_name in zip(wells.items(), file_names)]
+
+    def register(result):
+        name, output_path, error = result
+        if error is not None:
+            errors[name] = error
+        else:
+            rendered[name] = output_path
+        if show_progress:
+            sys.stdout.write(f'\rRendered {len(rendered) + len(errors)}/{len(tasks)} layouts, failed {len(errors)}')
+            if len(rendered) + len(errors) == len(tasks):
+                sys.stdout.write('\n')
+            sys.stdout.flush()
+
+    if max_workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            register(_render_worker(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_render_worker, *task) for task in tasks]
+            for future in as_completed(futures):
+                register(future.result())
+    return rendered, errors
+
+
+def render_layouts_to_pdf(wells: Dict[str, Union[str, pd.DataFrame]],
+                          pdf_path: str,
+                          assignment_file_path: Union[str, None] = None,
+                          depth_range: Union[tuple, None] = None,
+                          figsize: tuple = (20, 14),
+                          level_of_detail: bool = True) -> Dict[str, str]:
+    """Render layouts of many wells into multi-page pdf, one page for each well. Pages of one file are written
+    sequentially, use render_layouts to render separate files in parallel.
+    :returns: Dictionary with errors keyed by well name.
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+    tracks_description = load_tracks_description(assignment_file_path)
+    errors = {}
+    with PdfPages(pdf_path) as pdf:
+        for name, item in wells.items():
+            try:
+                render_layout(_prepare_df(item, assignment_file_path), pdf, tracks_description,
+                              depth_range=depth_range, figsize=figsize, level_of_detail=level_of_detail)
+            except Exception as err:
+                errors[name] = f'{type(err).__name__}: {err}'
+    return errors
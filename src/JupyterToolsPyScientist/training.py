@@ -0,0 +1,197 @@
+import math
+import time
+from typing import Dict, Iterable, List, Tuple, Union
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from threadpoolctl import threadpool_limits
+
+from .well_store import WellStore
+
+
+def _source_wells(source: Union[WellStore, Dict[str, pd.DataFrame]]) -> List[str]:
+    return source.wells if isinstance(source, WellStore) else list(source.keys())
+
+
+def _read_curves(source: Union[WellStore, Dict[str, pd.DataFrame]], name: str, columns: List[str]) \
+        -> Union[Dict[str, np.ndarray], None]:
+    """Get arrays of curves of one well, curves of stored wells stay memory-mapped. None if any curve is absent."""
+    if isinstance(source, WellStore):
+        well = source.open_well(name)
+        if not set(columns).issubset(well.columns):
+            return None
+        return {column: well.curve(column) for column in columns}
+    df = source[name]
+    if not set(columns).issubset(df.columns):
+        return None
+    return {column: df[column].to_numpy() for column in columns}
+
+
+def _stratified_choice(depth: np.ndarray, quota: int, depth_bins: int, rng: np.random.Generator) -> np.ndarray:
+    """Choose quota of sample positions spread evenly over depth intervals, intervals with fewer samples than
+    their share give all of them and the rest is shared between other intervals."""
+    if len(depth) <= quota:
+        return np.arange(len(depth))
+    edges = np.linspace(depth.min(), depth.max(), depth_bins + 1)
+    strata = np.clip(np.searchsorted(edges, depth, side='right') - 1, 0, depth_bins - 1)
+    counts = np.bincount(strata, minlength=depth_bins)
+
+    allocated = np.zeros_like(counts)
+    while allocated.sum() < quota:
+        room = counts - allocated
+        open_bins = np.flatnonzero(room > 0)
+        share = max((quota - allocated.sum()) // len(open_bins), 1)
+        allocated[open_bins] += np.minimum(room[open_bins], share)
+
+    # Samples grouped by interval in random order inside each interval.
+    order = np.lexsort((rng.random(len(depth)), strata))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    chosen = np.concatenate([order[start:start + size] for start, size in zip(starts, allocated)])
+    if len(chosen) > quota:
+        chosen = rng.choice(chosen, quota, replace=False)
+    return np.sort(chosen)
+
+
+def sample_field(source: Union[WellStore, Dict[str, pd.DataFrame]],
+                 features: List[str],
+                 target: Union[str, None] = None,
+                 n_samples: int = 1000000,
+                 wells: Union[Iterable[str], None] = None,
+                 depth_bins: int = 20,
+                 random_state=None) -> pd.DataFrame:
+    """Draw training samples from many wells without gathering all their data. Each well gets equal share of
+    samples, inside the well samples are spread evenly over depth intervals, so thick monotonous intervals and
+    long wells don't dominate the sample. Only one well is read at a time and only chosen rows are copied.
+    :param source: WellStore or dictionary with well name and DataFrame.
+    :param features: Names of feature curves.
+    :param target: (optional) Name of target curve.
+    :param n_samples: (optional) Approximate total number of samples.
+    :param wells: (optional) Names of wells to sample, by the default all wells of source.
+    :param depth_bins: (optional) Number of depth intervals of each well.
+    :param random_state: (optional) Seed or numpy Generator.
+    :returns: float32 DataFrame with 'Depth', features, target and categorical 'Well' (rows without NaN only).
+    """
+    rng = np.random.default_rng(random_state)
+    columns = list(features) + ([target] if target is not None else [])
+    names = list(_source_wells(source) if wells is None else wells)
+    quota = math.ceil(n_samples / max(len(names), 1))
+
+    parts = []
+    sampled_names = []
+    for name in names:
+        curves = _read_curves(source, name, ['Depth'] + columns)
+        if curves is None:
+            continue
+        valid = np.ones(len(curves['Depth']), dtype=bool)
+        for column in columns:
+            valid &= ~np.isnan(curves[column])
+        rows = np.flatnonzero(valid)
+        if not len(rows):
+            continue
+        rows = rows[_stratified_choice(np.asarray(curves['Depth'][rows], dtype=float), quota, depth_bins, rng)]
+        parts.append({column: np.asarray(curves[column][rows], dtype=np.float32) for column in ['Depth'] + columns})
+        sampled_names.append(name)
+
+    if not parts:
+        return pd.DataFrame(columns=['Depth'] + columns + ['Well'])
+    result = pd.DataFrame({column: np.concatenate([part[column] for part in parts])
+                           for column in ['Depth'] + columns})
+    codes = np.repeat(np.arange(len(sampled_names)), [len(part['Depth']) for part in parts])
+    result['Well'] = pd.Categorical.from_codes(codes, categories=sampled_names)
+    return result
+
+
+def split_wells(wells: Iterable[str], test_size: float = 0.2, random_state=None) -> Tuple[List[str], List[str]]:
+    """Split wells into train and test wells, so samples of one well never get into both selections.
+    :returns: Tuple of lists with train and test wells.
+    """
+    wells = list(wells)
+    order = np.random.default_rng(random_state).permutation(len(wells))
+    n_test = min(max(int(round(len(wells) * test_size)), 1), len(wells) - 1) if len(wells) > 1 else 0
+    test = [wells[i] for i in sorted(order[:n_test])]
+    train = [wells[i] for i in sorted(order[n_test:])]
+    return train, test
+
+
+def train_field_random_forest(source: Union[WellStore, Dict[str, pd.DataFrame]],
+                              features: List[str],
+                              target: str,
+                              rf_params: Union[dict, None] = None,
+                              train_wells: Union[List[str], None] = None,
+                              test_wells: Union[List[str], None] = None,
+                              test_size: float = 0.2,
+                              n_samples: int = 1000000,
+                              n_test_samples: Union[int, None] = None,
+                              estimators_steps: Iterable[int] = (100,),
+                              resample: bool = True,
+                              depth_bins: int = 20,
+                              n_jobs: int = -1,
+                              blas_threads: Union[int, None] = 1,
+                              random_state=None,
+                              model: Union[RandomForestRegressor, None] = None,
+                              verbose: bool = True) -> Tuple[RandomForestRegressor, pd.DataFrame]:
+    """Train random forest on samples drawn from many wells. Trees are added step by step with warm start,
+    if resample is True each step fits its new trees on fresh sample of train wells, so the forest covers much
+    more data than is kept in memory at once. Train and test samples come from different wells.
+    :param source: WellStore or dictionary with well name and DataFrame.
+    :param features: Names of feature curves.
+    :param target: Name of target curve.
+    :param rf_params: (optional) Parameters of RandomForestRegressor, e.g. best parameters of grid search.
+    :param train_wells: (optional) Wells for training, by the default split of all wells by test_size.
+    :param test_wells: (optional) Wells for test.
+    :param test_size: (optional) Part of wells for test if wells are not given.
+    :param n_samples: (optional) Number of train samples drawn for each step.
+    :param n_test_samples: (optional) Number of test samples, by the default n_samples.
+    :param estimators_steps: (optional) Total number of trees after each step, e.g. (100, 200, 300).
+    :param resample: (optional) Draw new train sample for each step.
+    :param depth_bins: (optional) Number of depth intervals for stratified sampling of each well.
+    :param n_jobs: (optional) Number of jobs of forest fitting and prediction.
+    :param blas_threads: (optional) Limit of BLAS/OpenMP threads during fitting, so they don't oversubscribe
+    cores used by n_jobs. None keeps current limits.
+    :param random_state: (optional) Seed of sampling and well split.
+    :param model: (optional) Already trained forest to add trees to.
+    :param verbose: (optional) Print scores and times of each step.
+    :returns: Tuple of model and DataFrame with number of trees, samples, fit and score wall time and scores
+    of each step.
+    """
+    rng = np.random.default_rng(random_state)
+    if train_wells is None and test_wells is None:
+        train_wells, test_wells = split_wells(_source_wells(source), test_size, rng)
+    elif train_wells is None:
+        train_wells = [name for name in _source_wells(source) if name not in set(test_wells)]
+    test_wells = test_wells or []
+
+    if model is None:
+        model = RandomForestRegressor(**(rf_params or {}))
+    model.set_params(warm_start=True, n_jobs=n_jobs)
+
+    test_df = sample_field(source, features, target, n_test_samples or n_samples, test_wells, depth_bins, rng)
+    train_df = None
+    report = []
+    with threadpool_limits(limits=blas_threads):
+        for n_estimators in estimators_steps:
+            n_trained = len(getattr(model, 'estimators_', []))
+            if n_estimators <= n_trained:
+                if verbose:
+                    print(f'Model already has {n_trained} trees, step with {n_estimators} trees is skipped.')
+                continue
+            if train_df is None or resample:
+                train_df = sample_field(source, features, target, n_samples, train_wells, depth_bins, rng)
+            model.set_params(n_estimators=n_estimators)
+
+            start = time.perf_counter()
+            model.fit(train_df[features], train_df[target])
+            fit_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            train_score = model.score(train_df[features], train_df[target])
+            test_score = model.score(test_df[features], test_df[target]) if len(test_df) else np.nan
+            score_time = time.perf_counter() - start
+
+            report.append({'n_estimators': n_estimators, 'n_train_samples': len(train_df),
+                           'n_test_samples': len(test_df), 'fit_time': fit_time, 'score_time': score_time,
+                           'train_score': train_score, 'test_score': test_score})
+            if verbose:
+                print(f'{n_estimators} trees: the train score is {train_score:.4f}, the test score is '
+                      f'{test_score:.4f}, fit {fit_time:.1f} s, score {score_time:.1f} s')
+    return model, pd.DataFrame(report)
@@ -1,68 +1,197 @@
+import copy
+import json
 import os
+import threading
+import numpy as np
 import pandas as pd
 import ctypes
 
+from .instrumentation import stage
+
 current_dir = os.path.dirname(os.path.abspath(__file__))
 assignment_base_path = os.path.join(current_dir, 'assignment_base.xlsx')
 
+# Version of compiled (json) form of the assignment file.
+COMPILED_CONFIG_VERSION = 1
+
+# Types of shading which can be declared in "fill_type" column.
+FILL_TYPES = ('curve', 'baseline', 'cutoff')
+
+# Process-wide cache of parsed assignment files: (path, mtime, sheet) -> parsed config.
+_assignment_cache = {}
+_assignment_cache_lock = threading.Lock()
+
+
+def _resolve_assignment_path(where=None):
+    """Get path to assignment file, the assignment_base file is used if given one doesn't exist."""
+    if (where is not None) and os.path.isfile(where):
+        return where
+    return assignment_base_path
+
+
+def _load_cached(file_path, sheet_name, parser):
+    """Get parsed sheet of assignment file from process-wide cache, the cache entry is refreshed
+    when modification time of the file is changed. Copy is returned, so callers can't spoil the cache."""
+    file_path = os.path.abspath(file_path)
+    key = (file_path, os.stat(file_path).st_mtime_ns, sheet_name)
+    with _assignment_cache_lock:
+        if key in _assignment_cache:
+            return copy.deepcopy(_assignment_cache[key])
+    with stage(f'config.{sheet_name}'):
+        if file_path.lower().endswith('.json'):
+            parsed = load_assignment_config(file_path)[sheet_name]
+        else:
+            parsed = parser(pd.read_excel(file_path, sheet_name=sheet_name))
+    with _assignment_cache_lock:
+        # Drop entries of previous versions of the same file.
+        for cached_key in [cached_key for cached_key in _assignment_cache
+                           if cached_key[0] == file_path and cached_key[2] == sheet_name]:
+            del _assignment_cache[cached_key]
+        _assignment_cache[key] = parsed
+    return copy.deepcopy(parsed)
+
+
+def clear_assignment_cache():
+    """Function to drop all parsed assignment files from process-wide cache."""
+    with _assignment_cache_lock:
+        _assignment_cache.clear()
+
+
+def _to_python(value):
+    """Convert numpy scalars from Excel to built-in types which can be stored in json."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _parse_fill(row):
+    """Get description of shading for curve from optional "fill_*" columns, None if fill isn't declared."""
+    if pd.isna(row.get('fill_type', np.nan)):
+        return None
+
+    def optional(column):
+        value = row.get(column, np.nan)
+        return None if pd.isna(value) else _to_python(value)
+
+    if row['fill_type'] not in FILL_TYPES:
+        raise ValueError(f'Unknown fill_type {row["fill_type"]!r} of curve {row["curve"]!r}, '
+                         f'it has to be one of {list(FILL_TYPES)}')
+    if row['fill_type'] == 'cutoff' and optional('fill_cutoff') is None:
+        raise ValueError(f'fill_cutoff has to be given for fill_type "cutoff" of curve {row["curve"]!r}')
+    return {'type': row['fill_type'],
+            'reference': optional('fill_reference'),
+            'color': optional('fill_color'),
+            'color_below': optional('fill_color_below'),
+            'cutoff': optional('fill_cutoff'),
+            'alpha': optional('fill_alpha')}
+
+
+def _parse_tracks_description(df):
+    df_tracks = df.groupby('track_number')
+    tracks_names = df_tracks.groups.keys()
+    tracks_description_base = []
+    for track_name in tracks_names:
+        group = df_tracks.get_group(track_name)
+        curves_dict = {}
+        for _ in range(len(group['curve'].values)):
+            curves_dict.update({
+                group['curve'].values[_]: {
+                    'curve_type': group['curve_type'].values[_],
+                    'color': group['color'].values[_],
+                    'label': group['label'].values[_],
+                    'unit': group['unit'].values[_],
+                    'min': group['min'].values[_],
+                    'max': group['max'].values[_],
+                    'scale': group['scale'].values[_],
+                    'reverse': group['reverse'].values[_],
+                    'range_detection': group['range_detection'].values[_],
+                     }
+               }
+            )
+            # Shading is declared by optional columns, old files without them keep default fills.
+            if 'fill_type' in group.columns:
+                curves_dict[group['curve'].values[_]]['fill'] = _parse_fill(group.iloc[_])
+        tracks_description_base.append({'type': group['track_type'].values[0],
+                                        'curves': curves_dict})
+    return tracks_description_base
+
+
+def _parse_mnemonic_aliases(df):
+    mnemonic_dict = {}
+    for _, row in df.iterrows():
+        mnemonic_dict.update({row['name']: row['aliases'].replace(' ', '').split(',')})
+    return mnemonic_dict
+
 
 def load_tracks_description(where=None):
     """Function to parse excel with track descriptions and provide dictionary in appropriate format which
-    is need fpr farther processing.
-    :param where: Path to the Excel file with data on "tracks_description" page. If file is not provided, then
-    is used the assignment_base file.
+    is need fpr farther processing. Parsed file is cached for the process until its modification time is changed.
+    :param where: Path to the Excel file with data on "tracks_description" page or to compiled json file. If file
+    is not provided, then is used the assignment_base file.
     """
-    if (where is not None) and os.path.isfile(where):
-        file_path = where
-    else:
-        file_path = assignment_base_path
-
+    file_path = _resolve_assignment_path(where)
     if os.path.isfile(file_path):
-        df = pd.read_excel(file_path, sheet_name='tracks_description')
-        df_tracks = df.groupby('track_number')
-        tracks_names = df_tracks.groups.keys()
-        tracks_description_base = []
-        for track_name in tracks_names:
-            group = df_tracks.get_group(track_name)
-            curves_dict = {}
-            for _ in range(len(group['curve'].values)):
-                curves_dict.update({
-                    group['curve'].values[_]: {
-                        'curve_type': group['curve_type'].values[_],
-                        'color': group['color'].values[_],
-                        'label': group['label'].values[_],
-                        'unit': group['unit'].values[_],
-                        'min': group['min'].values[_],
-                        'max': group['max'].values[_],
-                        'scale': group['scale'].values[_],
-                        'reverse': group['reverse'].values[_],
-                        'range_detection': group['range_detection'].values[_],
-                         }
-                   }
-                )
-            tracks_description_base.append({'type': group['track_type'].values[0],
-                                            'curves': curves_dict})
-    else:
-        return []
-    return tracks_description_base
+        return _load_cached(file_path, 'tracks_description', _parse_tracks_description)
+    return []
 
 
 def load_mnemonic_aliases_correspond(where=None):
     """Function to parse excel table with aliases and mnemonic correspondence and provide dictionary in format which
-    is need fpr farther processing.
-    :param where: Path to the Excel file with data on "aliases" page. If file is not provided, then
-    is used the assignment_base file.
+    is need fpr farther processing. Parsed file is cached for the process until its modification time is changed.
+    :param where: Path to the Excel file with data on "aliases" page or to compiled json file. If file is not
+    provided, then is used the assignment_base file.
     """
-    if (where is not None) and os.path.isfile(where):
-        file_path = where
-    else:
-        file_path = assignment_base_path
-
+    file_path = _resolve_assignment_path(where)
     if os.path.isfile(file_path):
-        mnemonic_dict = {}
-        df = pd.read_excel(file_path, sheet_name='aliases')
-        for _, row in df.iterrows():
-            mnemonic_dict.update({row['name']: row['aliases'].replace(' ', '').split(',')})
-    else:
-        return {}
-    return mnemonic_dict
+        return _load_cached(file_path, 'aliases', _parse_mnemonic_aliases)
+    return {}
+
+
+def export_assignment_config(json_path, where=None):
+    """Function to compile assignment Excel file into json file, which can be loaded without openpyxl.
+    The json file can be given everywhere instead of path to assignment Excel file.
+    :param json_path: Path to json file to create.
+    :param where: Path to the assignment Excel file. If file is not provided, then is used the assignment_base file.
+    """
+    def to_python(value):
+        if isinstance(value, dict):
+            return {key: to_python(item) for key, item in value.items()}
+        return _to_python(value)
+
+    tracks_description = [{'type': _to_python(track['type']),
+                           'curves': {curve: to_python(description) for curve, description in track['curves'].items()}}
+                          for track in load_tracks_description(where)]
+    config = {'version': COMPILED_CONFIG_VERSION,
+              'tracks_description': tracks_description,
+              'aliases': load_mnemonic_aliases_correspond(where)}
+    with open(json_path, 'w', encoding='utf-8') as file:
+        json.dump(config, file, indent=2)
+
+
+def load_assignment_config(json_path):
+    """Function to load compiled assignment json file created by export_assignment_config.
+    :returns: Dictionary with keys 'tracks_description' and 'aliases'.
+    """
+    with open(json_path, 'r', encoding='utf-8') as file:
+        config = json.load(file)
+    if config.get('version') != COMPILED_CONFIG_VERSION:
+        raise ValueError(f'Unsupported version of compiled assignment file {json_path}: {config.get("version")}')
+    return config
+
+
+def unique_names(names):
+    """Function to make names unique by adding suffix "_2", "_3", ... to repeated ones. Case is ignored, so files
+    named by the result don't overwrite each other on case-insensitive file systems either.
+    :returns: List of unique names in the same order.
+    """
+    used = set()
+    result = []
+    for name in names:
+        candidate = name
+        number = 1
+        while candidate.lower() in used:
+            number += 1
+            candidate = f'{name}_{number}'
+        used.add(candidate.lower())
+        result.append(candidate)
+    return result
@@ -0,0 +1,208 @@
+import threading
+import zlib
+from typing import Dict, Iterable, Tuple, Union
+import numpy as np
+import pandas as pd
+
+# Key of df.attrs where index of curve statistics is kept.
+STATISTICS_ATTR = 'curve_statistics'
+
+# Quantiles stored for each curve, 0.01 and 0.99 are used by automatic range detection of tracks.
+STATISTICS_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+STATISTICS_VERSION = 1
+
+
+def _quantile_key(quantile: float) -> str:
+    return f'q{round(quantile * 100):02d}'
+
+
+def curve_fingerprint(values: np.ndarray) -> str:
+    """Get checksum of curve values, it is cheap compared to sorting and changes when any sample is changed."""
+    values = np.ascontiguousarray(values, dtype=float)
+    return f'{len(values)}:{zlib.crc32(values.data):08x}'
+
+
+def compute_curve_statistics(depth: np.ndarray, values: np.ndarray) -> dict:
+    """Compute statistics of one curve: number of samples, null fraction, min/max, quantiles and median sample
+    step of not null samples. All quantiles are taken from the single partition of the curve.
+    :param depth: Depth of samples.
+    :param values: Values of curve.
+    :returns: Dictionary with statistics which can be stored in json.
+    """
+    values = np.asarray(values, dtype=float)
+    depth = np.asarray(depth, dtype=float)
+    valid = ~np.isnan(values)
+    present = values[valid]
+    record = {'count': int(valid.sum()),
+              'null_fraction': float(1 - valid.mean()) if len(values) else 1.0,
+              'fingerprint': curve_fingerprint(values)}
+    if len(present):
+        quantiles = np.quantile(present, STATISTICS_QUANTILES)
+        record['min'] = float(present.min())
+        record['max'] = float(present.max())
+        record.update({_quantile_key(quantile): float(value) for quantile, value in zip(STATISTICS_QUANTILES, quantiles)})
+    else:
+        record['min'] = record['max'] = np.nan
+        record.update({_quantile_key(quantile): np.nan for quantile in STATISTICS_QUANTILES})
+    steps = np.diff(depth[valid]) if len(depth) == len(values) else np.array([])
+    record['step'] = float(np.median(np.abs(steps))) if len(steps) else np.nan
+    return record
+
+
+class CurveStatisticsIndex:
+    """Statistics of curves of one well, kept in df.attrs and stored with the well in WellCache and WellStore.
+    Each record keeps fingerprint of curve values, record is recomputed when the curve is changed, so filtered
+    or modified DataFrames never get statistics of other data. Records are never changed in place, so pandas
+    (which deep copies attrs on every operation) gets shallow copy of the index.
+    :param records: (optional) Dictionary with curve name and its statistics.
+    """
+
+    def __init__(self, records: Union[Dict[str, dict], None] = None):
+        self.records: Dict[str, dict] = dict(records or {})
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        return CurveStatisticsIndex(self.records)
+
+    def __getstate__(self):
+        return {'records': self.records}
+
+    def __setstate__(self, state):
+        self.__init__(state['records'])
+
+    def __contains__(self, curve):
+        return curve in self.records
+
+    def get(self, df: pd.DataFrame, curve: str) -> Union[dict, None]:
+        """Get statistics of curve of df, they are computed if the curve isn't indexed or was changed.
+        :returns: Dictionary with statistics or None if there is no such curve.
+        """
+        if curve not in df.columns or not pd.api.types.is_numeric_dtype(df[curve]):
+            return None
+        values = df[curve].to_numpy(dtype=float)
+        record = self.records.get(curve)
+        if record is not None and record['fingerprint'] == curve_fingerprint(values):
+            return record
+        depth = df['Depth'].to_numpy(dtype=float) if 'Depth' in df.columns else np.array([])
+        record = compute_curve_statistics(depth, values)
+        with self._lock:
+            self.records[curve] = record
+        return record
+
+    def invalidate(self, curves: Union[Iterable[str], None] = None) -> None:
+        """Drop statistics of given curves (all curves by the default)."""
+        with self._lock:
+            if curves is None:
+                self.records.clear()
+            for curve in curves or []:
+                self.records.pop(curve, None)
+
+    def to_dict(self) -> dict:
+        return {'version': STATISTICS_VERSION, 'curves': self.records}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CurveStatisticsIndex':
+        """Restore index from to_dict, records of other version are dropped and computed again when needed."""
+        if data.get('version') != STATISTICS_VERSION:
+            return cls()
+        return cls(data['curves'])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame.from_dict(self.records, orient='index')
+
+
+def _statistics_index(df: pd.DataFrame, statistics=None) -> CurveStatisticsIndex:
+    """Get index of df (or given one), index in dictionary form (e.g. read from file) is restored."""
+    if statistics is None:
+        statistics = df.attrs.get(STATISTICS_ATTR)
+    if isinstance(statistics, dict):
+        statistics = CurveStatisticsIndex.from_dict(statistics)
+    if not isinstance(statistics, CurveStatisticsIndex):
+        statistics = CurveStatisticsIndex()
+    df.attrs[STATISTICS_ATTR] = statistics
+    return statistics
+
+
+def attach_statistics(df: pd.DataFrame, statistics: Union[CurveStatisticsIndex, dict, None] = None) -> pd.DataFrame:
+    """Put index of curve statistics into df.attrs and compute statistics of numeric columns which are
+    not indexed yet, e.g. at ingestion of well.
+    :param df: DataFrame of well.
+    :param statistics: (optional) Index or its dictionary form, by the default the one from df.attrs.
+    :returns: The same DataFrame.
+    """
+    statistics = _statistics_index(df, statistics)
+    for column in df.columns:
+        statistics.get(df, column)
+    return df
+
+
+def serialisable_attrs(df: pd.DataFrame) -> dict:
+    """Get copy of df.attrs where index of statistics is replaced by dictionary, so it can be saved with df."""
+    attrs = dict(df.attrs)
+    if isinstance(attrs.get(STATISTICS_ATTR), CurveStatisticsIndex):
+        attrs[STATISTICS_ATTR] = attrs[STATISTICS_ATTR].to_dict()
+    return attrs
+
+
+def curve_statistics(df: pd.DataFrame, curve: str) -> Union[dict, None]:
+    """Get statistics of curve from index in df.attrs. If DataFrame has no index yet it is created, so statistics
+    of each curve are computed only once.
+    :returns: Dictionary with statistics or None if there is no such numeric curve.
+    """
+    return _statistics_index(df).get(df, curve)
+
+
+def statistics_frame(df: pd.DataFrame, curves: Union[Iterable[str], None] = None) -> pd.DataFrame:
+    """Get QC table of well with statistics of curves in rows.
+    :param df: DataFrame of well.
+    :param curves: (optional) Curves to include, by the default all numeric columns except 'Depth'.
+    """
+    if curves is None:
+        curves = [column for column in df.columns
+                  if column != 'Depth' and pd.api.types.is_numeric_dtype(df[column])]
+    records = {curve: curve_statistics(df, curve) for curve in curves}
+    return pd.DataFrame.from_dict({curve: record for curve, record in records.items() if record is not None},
+                                  orient='index')
+
+
+def field_statistics(wells: Dict[str, pd.DataFrame], curves: Union[Iterable[str], None] = None) -> pd.DataFrame:
+    """Get QC table of several wells with (well, curve) rows, it is gathered from indexes of wells."""
+    frames = {name: statistics_frame(df, curves) for name, df in wells.items()}
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, names=['Well', 'Curve'])
+
+
+def field_histogram(wells: Dict[str, pd.DataFrame],
+                    curve: str,
+                    bins: int = 50,
+                    value_range: Union[Tuple[float, float], None] = None,
+                    log: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Get histogram of curve over several wells without concatenation of their data. Common bin edges are taken
+    from min/max of statistics indexes, so every well is scanned only once by np.histogram.
+    :param wells: Dictionary with well name and DataFrame.
+    :param curve: Name of curve.
+    :param bins: (optional) Number of bins.
+    :param value_range: (optional) Range (min, max) of histogram, by the default min and max of all wells.
+    :param log: (optional) Use logarithmic bins, e.g. for resistivity.
+    :returns: Tuple of counts and bin edges.
+    """
+    if value_range is None:
+        records = [record for record in (curve_statistics(df, curve) for df in wells.values())
+                   if record is not None and record['count']]
+        if not records:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0, 1, bins + 1)
+        value_range = (min(record['min'] for record in records), max(record['max'] for record in records))
+    if log:
+        low = max(value_range[0], np.finfo(float).tiny)
+        edges = np.geomspace(low, max(value_range[1], low * 10), bins + 1)
+    else:
+        edges = np.linspace(value_range[0], value_range[1] if value_range[1] > value_range[0]
+                            else value_range[0] + 1, bins + 1)
+    counts = np.zeros(bins, dtype=np.int64)
+    for df in wells.values():
+        if curve in df.columns:
+            values = df[curve].to_numpy(dtype=float)
+            counts += np.histogram(values[~np.isnan(values)], bins=edges)[0]
+    return counts, edges
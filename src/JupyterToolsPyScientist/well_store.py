@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import uuid
+from typing import Dict, Iterable, List, Union
+import numpy as np
+import pandas as pd
+
+from .well_statistics import STATISTICS_ATTR, CurveStatisticsIndex, attach_statistics
+
+STORE_VERSION = 1
+
+
+class StoredWell:
+    """Well opened from WellStore. Depth and curves are kept in one memory-mapped float32 array of shape
+    (number of curves, number of samples), so each curve is contiguous and nothing is read from disk until
+    it is used.
+    :param path: Folder of the well inside store.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        self.name = meta['name']
+        self.columns: List[str] = meta['columns']
+        self.metadata: dict = meta['metadata']
+        # Wells stored before statistics were introduced get them computed on demand.
+        self.statistics: dict = meta.get('statistics', {})
+        self.data = np.load(os.path.join(path, 'data.npy'), mmap_mode='r')
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def curve(self, name: str) -> np.ndarray:
+        """Get read-only view of one curve (or 'Depth')."""
+        return self.data[self.columns.index(name)]
+
+    def to_frame(self, columns: Union[Iterable[str], None] = None) -> pd.DataFrame:
+        """Get DataFrame with curves. If columns are not specified DataFrame is a zero-copy view of memory-mapped
+        array, otherwise only requested curves are read. Well name is kept in df.attrs['Well'] instead of
+        repeated string column, statistics of curves stored with the well in df.attrs['curve_statistics'].
+        """
+        if columns is None:
+            df = pd.DataFrame(self.data.T, columns=self.columns, copy=False)
+        else:
+            columns = list(columns)
+            df = pd.DataFrame(self.data[[self.columns.index(column) for column in columns]].T, columns=columns)
+        df.attrs['Well'] = self.name
+        df.attrs[STATISTICS_ATTR] = CurveStatisticsIndex.from_dict(self.statistics)
+        return df
+
+
+class WellStore:
+    """Compact on-disk store of many wells. Each well is saved as float32 array with depth and curves which is
+    opened memory-mapped, header metadata is kept separately in json.
+    :param root: Folder of the store, it is created if doesn't exist.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, 'index.json')
+        if os.path.isfile(self._index_path):
+            with open(self._index_path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+            if index.get('version') != STORE_VERSION:
+                raise ValueError(f'Unsupported version of well store {root}: {index.get("version")}')
+            self.index: Dict[str, str] = index['wells']
+        else:
+            self.index = {}
+            self._save_index()
+
+    def _save_index(self):
+        temporary_path = self._index_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': STORE_VERSION, 'wells': self.index}, file, indent=1)
+        os.replace(temporary_path, self._index_path)
+
+    @property
+    def wells(self) -> List[str]:
+        return list(self.index.keys())
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def add_well(self, df: pd.DataFrame, name: Union[str, None] = None, metadata: Union[dict, None] = None) -> str:
+        """Add well to the store, existing well with the same name is replaced. Numeric columns are converted
+        to float32, the 'Well' column is stored once as well name.
+        :param df: DataFrame with standardised curves and 'Depth', e.g. from create_single_well_df.
+        :param name: (optional) Name of well, by the default taken from 'Well' column.
+        :param metadata: (optional) Header metadata which can be stored in json.
+        :returns: Name of added well.
+        """
+        if 'Depth' not in df.columns:
+            raise ValueError('DataFrame has to contain <<Depth>> to be added to well store.')
+        if name is None:
+            name = str(df['Well'].iloc[0]) if 'Well' in df.columns and len(df) else df.attrs.get('Well', 'unknown')
+        columns = ['Depth'] + [column for column in df.columns
+                               if column != 'Depth' and pd.api.types.is_numeric_dtype(df[column])]
+        data = np.empty((len(columns), len(df)), dtype=np.float32)
+        for row, column in enumerate(columns):
+            data[row] = df[column].to_numpy(dtype=np.float32)
+        # Statistics are computed from stored float32 values, so they match curves of opened well.
+        statistics = attach_statistics(pd.DataFrame(data.T, columns=columns, copy=False)).attrs[STATISTICS_ATTR]
+
+        folder = self.index.get(name, f'well_{uuid.uuid4().hex[:12]}')
+        path = os.path.join(self.root, folder)
+        os.makedirs(path, exist_ok=True)
+        # Files are written next to the old ones and replaced, so a replaced well which is opened memory-mapped
+        # keeps its data and an interrupted write doesn't leave a truncated array.
+        data_path = os.path.join(path, 'data.npy')
+        temporary_path = f'{data_path}.{uuid.uuid4().hex}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.save(file, data)
+        os.replace(temporary_path, data_path)
+        meta_path = os.path.join(path, 'meta.json')
+        temporary_path = f'{meta_path}.{uuid.uuid4().hex}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'name': name, 'columns': columns, 'metadata': metadata or {},
+                       'statistics': statistics.to_dict()}, file, indent=1)
+        os.replace(temporary_path, meta_path)
+        self.index[name] = folder
+        self._save_index()
+        return name
+
+    def add_wells(self, wells: Dict[str, pd.DataFrame]) -> None:
+        """Add several wells, e.g. dictionary from load_multiple_wells."""
+        for name, df in wells.items():
+            self.add_well(df, name)
+
+    def open_well(self, name: str) -> StoredWell:
+        """Open well memory-mapped."""
+        return StoredWell(os.path.join(self.root, self.index[name]))
+
+    def remove_well(self, name: str) -> None:
+        shutil.rmtree(os.path.join(self.root, self.index.pop(name)), ignore_errors=True)
+        self._save_index()
+
+    def feature_frame(self,
+                      features: List[str],
+                      target: Union[str, None] = None,
+                      wells: Union[Iterable[str], None] = None,
+                      dropna: bool = True) -> pd.DataFrame:
+        """Gather float32 DataFrame with features (and target) from several wells for model helpers of
+        jupyter_tools. Only requested curves are read from disk, wells without one of the curves are skipped.
+        :param features: Names of feature curves.
+        :param target: (optional) Name of target curve.
+        :param wells: (optional) Names of wells, by the default all wells of store.
+        :param dropna: (optional) Remove rows with NaN in any of the columns.
+        :returns: DataFrame with column 'Well' in addition to features and target.
+        """
+        columns = list(features) + ([target] if target is not None else [])
+        frames = []
+        names = []
+        for name in (self.wells if wells is None else wells):
+            well = self.open_well(name)
+            if not set(columns).issubset(well.columns):
+                continue
+            df = well.to_frame(columns)
+            frames.append(df.dropna() if dropna else df)
+            names.append(name)
+        if not frames:
+            return pd.DataFrame(columns=columns + ['Well'])
+        result = pd.concat(frames, ignore_index=True)
+        # Well name is stored as categorical, so it doesn't repeat the string for each sample.
+        codes = np.repeat(np.arange(len(names)), [len(frame) for frame in frames])
+        result['Well'] = pd.Categorical.from_codes(codes, categories=names)
+        return result
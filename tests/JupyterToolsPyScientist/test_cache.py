@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+import pandas as pd
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.cache import WellCache
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class WellCacheTestCase(unittest.TestCase):
+    """Set with testcases for on-disk cache of standardised wells"""
+
+    def setUp(self):
+        self.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        self.las_kansas_path = os.path.join(test_dataset_folder, '1054311050.las')
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_cached_df_same_as_parsed(self):
+        cache = WellCache(self.folder, file_format='pickle')
+        expected = create_single_well_df(self.las_kansas_path, self.assignment_test_path)
+        first = create_single_well_df(self.las_kansas_path, self.assignment_test_path, cache=cache)
+        self.assertEqual(len(cache.entries()), 1)
+        second = create_single_well_df(self.las_kansas_path, self.assignment_test_path, cache=cache)
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+
+    def test_key_depends_on_aliases(self):
+        cache = WellCache(self.folder, file_format='pickle')
+        create_single_well_df(self.las_kansas_path, self.assignment_test_path, cache=cache)
+        create_single_well_df(self.las_kansas_path, cache=cache)
+        self.assertEqual(len(cache.entries()), 2)
+
+    def test_lru_eviction(self):
+        cache = WellCache(self.folder, max_size_bytes=None, file_format='pickle')
+        df = pd.DataFrame({'Depth': range(1000)})
+        for key in ('a', 'b', 'c'):
+            cache.put(key, df)
+            time.sleep(0.01)
+        cache.get('a')
+        cache.max_size_bytes = 2 * os.path.getsize(cache.path('a'))
+        cache.evict()
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_unreadable_entry_is_miss(self):
+        cache = WellCache(self.folder, file_format='pickle')
+        expected = create_single_well_df(self.las_kansas_path, self.assignment_test_path, cache=cache)
+        path = cache.entries()[0][0]
+        with open(path, 'wb') as file:
+            file.write(b'truncated')
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = create_single_well_df(self.las_kansas_path, self.assignment_test_path, cache=cache)
+        pd.testing.assert_frame_equal(df, expected)
+        # Entry is written again.
+        pd.testing.assert_frame_equal(cache.get(os.path.basename(path)[:-len('.pkl')]), expected)
+
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.calculator import Calculator
+
+
+class CalculatorTestCase(unittest.TestCase):
+    """Set with testcases for petrophysical calculations"""
+
+    def setUp(self):
+        self.df = pd.DataFrame({'Density': [2.71, 2.2, np.nan, 1.0],
+                                'ResistivityDeep': [1.0, np.nan, 20.0, 0.5]})
+
+    def test_porosity_density_array_same_as_row(self):
+        expected = self.df.apply(Calculator.porosity_density, axis=1, args=(2.71, 1, 'Density',))
+        result = Calculator.porosity_density_array(self.df['Density'], 2.71, 1)
+        pd.testing.assert_series_equal(result, expected)
+
+    def test_porosity_resistivity_array_same_as_row(self):
+        expected = self.df.apply(Calculator.porosity_resistivity, axis=1, args=(1, 2, 0.6, 'ResistivityDeep',))
+        result = Calculator.porosity_resistivity_array(self.df['ResistivityDeep'].to_numpy(), 1, 2, 0.6)
+        np.testing.assert_allclose(result, expected.to_numpy())
+
+    def test_out_buffer(self):
+        out = np.empty(len(self.df))
+        result = Calculator.porosity_density_array(self.df['Density'], 2.71, 1, out=out)
+        self.assertIs(result, out)
+        self.assertTrue(np.isnan(out[2]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
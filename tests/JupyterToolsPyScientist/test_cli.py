@@ -0,0 +1,114 @@
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+import pandas as pd
+from JupyterToolsPyScientist.cli import main
+from JupyterToolsPyScientist.well_store import WellStore
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+def loaded_modules(module: str, names: tuple = ("matplotlib", "lasio", "sklearn", "seaborn")) -> set:
+    """Names of heavy dependencies loaded by import of module in fresh interpreter."""
+    code = f'import sys; import {module}; print(" ".join(name for name in {names!r} if name in sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            env={**os.environ, 'PYTHONPATH': path_to_source_folder})
+    return set(result.stdout.split())
+
+
+class CommandLineTestCase(unittest.TestCase):
+    """Set with testcases for lazy imports and command line entry point"""
+
+    def setUp(self):
+        self.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        self.folder = tempfile.mkdtemp()
+        self.las_folder = os.path.join(self.folder, 'las')
+        os.makedirs(self.las_folder)
+        shutil.copy(os.path.join(test_dataset_folder, '1054311050.las'), self.las_folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def run_main(self, *argv):
+        with redirect_stdout(io.StringIO()):
+            return main(list(argv))
+
+    def test_heavy_dependencies_are_not_imported(self):
+        self.assertEqual(loaded_modules('JupyterToolsPyScientist.petrophysical_layout'), set())
+        self.assertEqual(loaded_modules('JupyterToolsPyScientist.jupyter_tools'), set())
+        self.assertEqual(loaded_modules('JupyterToolsPyScientist.correlation'), set())
+        self.assertEqual(loaded_modules('JupyterToolsPyScientist.cli'), set())
+        self.assertEqual(loaded_modules('JupyterToolsPyScientist.calculator', ('pandas',)), set())
+
+    def test_process(self):
+        output_dir = os.path.join(self.folder, 'processed')
+        trace_path = os.path.join(self.folder, 'trace.json')
+        code = self.run_main('--profile', trace_path, 'process', self.las_folder, output_dir,
+                             '--assignment', self.assignment_test_path, '--curves', 'Porosity_density_calc', 'Vsh',
+                             '--param', 'matrix_density=2.65', '--format', 'csv')
+        self.assertEqual(code, 0)
+        df = pd.read_csv(os.path.join(output_dir, '1054311050.csv'))
+        self.assertEqual(len(df), 9401)
+        self.assertIn('Porosity_density_calc', df.columns)
+        self.assertIn('Vsh', df.columns)
+        self.assertTrue(os.path.isfile(trace_path))
+
+    def test_same_file_names_are_not_overwritten(self):
+        other_folder = os.path.join(self.las_folder, 'other')
+        os.makedirs(other_folder)
+        shutil.copy(os.path.join(test_dataset_folder, '1054311050.las'), other_folder)
+        output_dir = os.path.join(self.folder, 'processed')
+        code = self.run_main('process', os.path.join(self.las_folder, '**', '*.las'), output_dir, '--format', 'csv')
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(os.listdir(output_dir)), ['1054311050.csv', '1054311050_2.csv'])
+
+    def test_ingest(self):
+        store_path = os.path.join(self.folder, 'store')
+        code = self.run_main('ingest', self.las_folder, store_path, '--assignment', self.assignment_test_path,
+                             '--workers', '1')
+        self.assertEqual(code, 0)
+        self.assertEqual(WellStore(store_path).wells, ['Whitham # 1-1'])
+
+    def test_render(self):
+        image_dir = os.path.join(self.folder, 'images')
+        code = self.run_main('render', self.las_folder, image_dir, '--assignment', self.assignment_test_path,
+                             '--workers', '1', '--depth-range', '1000', '2000')
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.isfile(os.path.join(image_dir, '1054311050.png')))
+
+    def test_render_needs_either_folder_or_pdf(self):
+        for options in [[], [self.folder, '--pdf', os.path.join(self.folder, 'layouts.pdf')]]:
+            with self.assertRaises(SystemExit) as context, redirect_stderr(io.StringIO()):
+                self.run_main('render', self.las_folder, *options)
+            self.assertEqual(context.exception.code, 2)
+        pdf_path = os.path.join(self.folder, 'layouts.pdf')
+        code = self.run_main('render', self.las_folder, '--pdf', pdf_path, '--assignment', self.assignment_test_path)
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.isfile(pdf_path))
+
+    def test_invalid_parameter_is_usage_error(self):
+        for options in [['--param', 'rw'], ['--param', 'rw=low'], ['--param', 'Rw=0.05'], ['--curves', 'Nope']]:
+            with self.assertRaises(SystemExit) as context, redirect_stderr(io.StringIO()) as stderr:
+                self.run_main('process', self.las_folder, self.folder, *options)
+            self.assertEqual(context.exception.code, 2)
+            self.assertIn('usage:', stderr.getvalue())
+
+    def test_failed_well_gives_exit_code(self):
+        with open(os.path.join(self.las_folder, 'broken.las'), 'w') as file:
+            file.write('not a las file')
+        code = self.run_main('process', self.las_folder, os.path.join(self.folder, 'processed'), '--format', 'csv',
+                             '--quiet')
+        self.assertEqual(code, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
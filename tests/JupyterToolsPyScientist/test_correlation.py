@@ -0,0 +1,78 @@
+import os
+import sys
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df
+from JupyterToolsPyScientist.correlation import CorrelationPanel
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class CorrelationPanelTestCase(unittest.TestCase):
+    """Set with testcases for multi-well correlation panel"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        df = create_single_well_df(os.path.join(test_dataset_folder, '1054311050.las'), cls.assignment_test_path)
+        cls.wells = {f'well_{i}': df for i in range(5)}
+        cls.markers = {f'well_{i}': 3000.0 + 10 * i for i in range(5)}
+
+    def setUp(self):
+        self.panel = CorrelationPanel(self.wells, self.assignment_test_path, markers=self.markers,
+                                      depth_range=(-100, 100), visible_wells=2, tracks=[0, 2],
+                                      mode='headless', figsize=(10, 6))
+
+    def tearDown(self):
+        self.panel.close()
+
+    def test_only_visible_wells_are_drawn(self):
+        self.assertEqual(list(self.panel.columns), ['well_0', 'well_1'])
+        axes_count = len(self.panel.fig.axes)
+        self.panel.scroll(1)
+        self.assertEqual(list(self.panel.columns), ['well_0', 'well_1', 'well_2'])
+        self.assertFalse(self.panel.columns['well_0'][0].track_main_ax.get_visible())
+        # Well moved from the second slot to the first one without redrawing.
+        position = self.panel.columns['well_1'][0].track_main_ax.get_position()
+        self.assertAlmostEqual(position.x0, self.panel.well_rect(0, 0)[0])
+        self.assertGreater(len(self.panel.fig.axes), axes_count)
+
+    def test_flattening_on_marker(self):
+        line = self.panel.columns['well_1'][0].logs_dict[0][0]
+        depth = line.get_ydata()
+        self.assertTrue((depth > -100).all() and (depth < 100).all())
+        self.assertEqual(self.panel.wells['well_1']['Depth'].iloc[0], self.wells['well_1']['Depth'].iloc[0] - 3010)
+
+    def test_shared_scales(self):
+        self.assertIn('Density', self.panel.scales)
+        limits = [tracks[1].twins_dict[0].get_xlim() for tracks in self.panel.columns.values()]
+        self.assertEqual(limits[0], limits[1])
+
+    def test_add_well_outside_window(self):
+        self.panel.add_well('new', self.wells['well_0'])
+        self.assertNotIn('new', self.panel.columns)
+        self.panel.scroll(10)
+        self.assertIn('new', self.panel.columns)
+        self.assertNotIn('well_2', self.panel.columns)
+
+    def test_zoom_is_kept_by_scroll(self):
+        axis = self.panel.columns['well_0'][0].track_main_ax
+        # Zoom without click, as toolbar or code does.
+        axis.set_ylim(50, -50)
+        self.panel.scroll(1)
+        self.assertEqual(tuple(sorted(axis.get_ylim())), (-50, 50))
+        self.assertEqual(self.panel.rendered_limits, (-50, 50))
+        for name in ['well_0', 'well_2']:
+            depth = self.panel.columns[name][0].logs_dict[0][0].get_ydata()
+            self.assertTrue((depth > -50).all() and (depth < 50).all())
+
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.jupyter_tools import regression_metrics, density_grid, graphical_comparison_of_model
+
+
+class DiagnosticsTestCase(unittest.TestCase):
+    """Set with testcases for diagnostics of models on large selections"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.uniform(0, 0.35, size=(200000, 1))
+        self.y = self.X[:, 0] + rng.normal(0, 0.02, size=len(self.X))
+        self.model = LinearRegression().fit(self.X, self.y)
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_metrics(self):
+        predictions = self.model.predict(self.X)
+        metrics = regression_metrics(self.y, predictions)
+        self.assertAlmostEqual(metrics['r2'], r2_score(self.y, predictions))
+        self.assertAlmostEqual(metrics['rmse'], np.sqrt(mean_squared_error(self.y, predictions)))
+        self.assertAlmostEqual(metrics['residual_q50'], np.median(predictions - self.y))
+        self.assertEqual(regression_metrics([1.0, np.nan], [1.0, 2.0])['n'], 1)
+
+    def test_density_grid(self):
+        predictions = self.model.predict(self.X)
+        counts = density_grid(self.y, predictions, (-0.05, 0.4), bins=50)
+        expected = np.histogram2d(self.y, predictions, bins=50, range=[(-0.05, 0.4), (-0.05, 0.4)])[0]
+        self.assertEqual(np.abs(counts - expected).sum(), 0)
+
+    def test_diagnostics_mode(self):
+        metrics = graphical_comparison_of_model(mode='diagnostics', model=self.model, param_name='Porosity',
+                                                param_units='v/v', limits=(-0.05, 0.4),
+                                                X_train=self.X[:150000], y_train=self.y[:150000],
+                                                X_test=self.X[150000:], y_test=self.y[150000:],
+                                                scatter_samples=500, random_state=0)
+        self.assertListEqual(list(metrics.index), ['train', 'test'])
+        self.assertEqual(metrics.loc['test', 'n'], 50000)
+        self.assertGreater(metrics.loc['test', 'r2'], 0.9)
+        ax = plt.gcf().axes[0]
+        self.assertEqual(len(ax.images), 1)
+        self.assertEqual(len(ax.collections[0].get_offsets()), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
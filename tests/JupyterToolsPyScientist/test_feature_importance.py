@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.feature_importance import feature_importance_report, groups_by_prefix
+from JupyterToolsPyScientist.jupyter_tools import prepare_df_feature_importance
+
+
+class FeatureImportanceTestCase(unittest.TestCase):
+    """Set with testcases for permutation and grouped feature importance"""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        n = 6000
+        resistivity = rng.normal(size=n)
+        cls.X = pd.DataFrame({'ResistivityDeep': resistivity,
+                              'ResistivityShallow': resistivity + rng.normal(0, 0.05, size=n),
+                              'GR': rng.normal(size=n),
+                              'Noise': rng.normal(size=n)})
+        cls.y = 2 * resistivity + cls.X['GR'] + rng.normal(0, 0.1, size=n)
+        cls.model = RandomForestRegressor(n_estimators=10, max_depth=8, random_state=0, n_jobs=2)
+        cls.model.fit(cls.X[:4000], cls.y[:4000])
+
+    def test_report(self):
+        groups = groups_by_prefix(self.X.columns, ['Resistivity', 'Porosity'])
+        self.assertDictEqual(groups, {'Resistivity': ['ResistivityDeep', 'ResistivityShallow']})
+        report = feature_importance_report(self.model, self.X[4000:], self.y[4000:], groups=groups, n_repeats=3,
+                                           max_samples=1000, max_workers=2, random_state=0, show_progress=False)
+        self.assertListEqual(report['kind'].tolist(), ['impurity'] * 4 + ['permutation'] * 4 + ['grouped'])
+        permutation = report[report['kind'] == 'permutation'].set_index('feature name')['importance']
+        self.assertGreater(permutation['GR'], permutation['Noise'])
+        self.assertLess(abs(permutation['Noise']), 0.05)
+        grouped = report[report['kind'] == 'grouped'].set_index('feature name')['importance']
+        # Shuffling of both correlated curves breaks more than shuffling of each of them.
+        self.assertGreater(grouped['Resistivity'], permutation['ResistivityDeep'])
+        self.assertGreater(grouped['Resistivity'], permutation['ResistivityShallow'])
+        self.assertTrue((report.loc[report['kind'] != 'impurity', 'n_samples'] == 1000).all())
+
+        impurity = report[report['kind'] == 'impurity'][['feature name', 'importance']].reset_index(drop=True)
+        expected = prepare_df_feature_importance(self.model)
+        self.assertListEqual(impurity['feature name'].tolist(), expected['feature name'].tolist())
+        np.testing.assert_allclose(impurity['importance'].astype(float), expected['importance'].astype(float))
+
+        sequential = feature_importance_report(self.model, self.X[4000:], self.y[4000:], groups=groups,
+                                               n_repeats=3, max_samples=1000, max_workers=1, random_state=0,
+                                               show_progress=False)
+        np.testing.assert_allclose(sequential['importance'], report['importance'])
+        self.assertEqual(self.model.n_jobs, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+import pandas as pd
+import lasio
+from sklearn.ensemble import RandomForestRegressor
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.inference import predict_in_batches, predict_wells
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class InferenceTestCase(unittest.TestCase):
+    """Set with testcases for applying of trained model to wells"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        cls.las_path = os.path.join(test_dataset_folder, '1054311050.las')
+        cls.df = create_single_well_df(cls.las_path, cls.assignment_test_path)
+        train_df = cls.df[['GR', 'Density', 'Sonic']].dropna()
+        cls.model = RandomForestRegressor(n_estimators=5, max_depth=5, random_state=0)
+        cls.model.fit(train_df[['GR', 'Density']], train_df['Sonic'])
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.folder, 'output')
+        shutil.copy(self.las_path, os.path.join(self.folder, 'well_a.las'))
+        with open(os.path.join(self.folder, 'broken.las'), 'w') as file:
+            file.write('not a las file')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_batches_and_masking(self):
+        predictions = predict_in_batches(self.model, self.df, batch_size=1000)
+        self.assertEqual(len(predictions), len(self.df))
+        missing = self.df[['GR', 'Density']].isna().any(axis=1).to_numpy()
+        self.assertTrue(missing.any())
+        self.assertTrue(np.isnan(predictions[missing]).all())
+        expected = self.model.predict(self.df.loc[~missing, ['GR', 'Density']])
+        np.testing.assert_allclose(predictions[~missing], expected)
+        np.testing.assert_allclose(predict_in_batches(self.model, self.df, batch_size=len(self.df)), predictions)
+
+    def test_predicted_curve_is_added_to_las(self):
+        written, errors, metrics = predict_wells(self.model, self.folder, self.output_dir, curve_name='DT_PRED',
+                                                 unit='us/ft', assignment_file_path=self.assignment_test_path,
+                                                 batch_size=2000, show_progress=False)
+        self.assertEqual(len(written), 1)
+        self.assertIn(os.path.join(self.folder, 'broken.las'), errors)
+        las = lasio.read(written[os.path.join(self.folder, 'well_a.las')])
+        original = lasio.read(self.las_path)
+        self.assertListEqual(las.keys()[:-1], original.keys())
+        self.assertEqual(las.curves['DT_PRED'].unit, 'us/ft')
+        np.testing.assert_allclose(las['DT_PRED'], predict_in_batches(self.model, self.df), rtol=1e-4)
+        self.assertEqual(metrics['rows'].iloc[0], len(self.df))
+        self.assertGreater(metrics['rows_per_second'].iloc[0], 0)
+
+    def test_same_file_names_are_not_overwritten(self):
+        other_folder = os.path.join(self.folder, 'other')
+        os.makedirs(other_folder)
+        paths = [os.path.join(self.folder, 'well_a.las'), os.path.join(other_folder, 'well_a.las')]
+        shutil.copy(paths[0], paths[1])
+        written, errors, _ = predict_wells(self.model, paths, self.output_dir,
+                                           assignment_file_path=self.assignment_test_path, file_format='csv',
+                                           show_progress=False)
+        self.assertEqual(errors, {})
+        self.assertEqual(sorted(os.path.basename(path) for path in written.values()),
+                         ['well_a.csv', 'well_a_2.csv'])
+
+    def test_columnar_output(self):
+        written, errors, metrics = predict_wells(self.model, [os.path.join(self.folder, 'well_a.las')],
+                                                 self.output_dir, assignment_file_path=self.assignment_test_path,
+                                                 file_format='csv', show_progress=False)
+        output_df = pd.read_csv(written[os.path.join(self.folder, 'well_a.las')])
+        self.assertListEqual(list(output_df.columns), ['Depth', 'Prediction', 'Well'])
+        self.assertEqual(metrics['predicted_rows'].iloc[0], output_df['Prediction'].notna().sum())
+
+
+    def test_absent_features_are_reported_in_metrics(self):
+        train_df = self.df[['GR', 'Sonic']].dropna().assign(Unknown=1.0)
+        model = RandomForestRegressor(n_estimators=2, max_depth=2, random_state=0)
+        model.fit(train_df[['GR', 'Unknown']], train_df['Sonic'])
+        with redirect_stdout(io.StringIO()) as output:
+            _, errors, metrics = predict_wells(model, [os.path.join(self.folder, 'well_a.las')], self.output_dir,
+                                               assignment_file_path=self.assignment_test_path, file_format='csv',
+                                               show_progress=False)
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(errors, {})
+        self.assertListEqual(metrics['missing_features'].iloc[0], ['Unknown'])
+        self.assertEqual(metrics['predicted_rows'].iloc[0], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist import instrumentation
+from JupyterToolsPyScientist.instrumentation import profile, stage, instrumented
+from JupyterToolsPyScientist.utils import clear_assignment_cache
+from JupyterToolsPyScientist.petrophysical_layout import (create_single_well_df, make_processing_well_logging,
+                                                          PetrophysicalLayout)
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    """Set with testcases for opt-in recording of pipeline stages"""
+
+    def setUp(self):
+        self.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        self.las_path = os.path.join(test_dataset_folder, '1054311050.las')
+        clear_assignment_cache()
+
+    def test_pipeline_stages_are_recorded(self):
+        with profile() as profiler:
+            df = create_single_well_df(self.las_path, self.assignment_test_path)
+            make_processing_well_logging(df)
+            layout = PetrophysicalLayout(df, self.assignment_test_path, mode='headless')
+            with tempfile.TemporaryDirectory() as folder:
+                layout.save(os.path.join(folder, 'instrumented_layout.png'))
+            layout.close()
+        stages = set(profiler.to_frame()['stage'])
+        for name in ['config.aliases', 'config.tracks_description', 'las.parse', 'aliases.standardise',
+                     'statistics.compute', 'processing.Porosity_density_calc', 'layout.build',
+                     'layout.auto_range', 'layout.draw']:
+            self.assertIn(name, stages)
+        frame = profiler.to_frame()
+        parse = frame[frame['stage'] == 'las.parse'].iloc[0]
+        self.assertEqual(parse['rows'], len(df))
+        self.assertGreater(parse['duration'], 0)
+        self.assertIsNotNone(parse['memory_delta_mb'])
+        summary = profiler.summary()
+        self.assertEqual(summary.loc['las.parse', 'calls'], 1)
+        self.assertGreater(summary.loc['las.parse', 'rows_per_second'], 0)
+
+        trace_path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        profiler.to_chrome_trace(trace_path)
+        with open(trace_path, 'r', encoding='utf-8') as file:
+            events = json.load(file)['traceEvents']
+        self.assertEqual(len(events), len(frame))
+        self.assertTrue(all(event['ph'] == 'X' and event['dur'] >= 0 for event in events))
+        os.remove(trace_path)
+
+    def test_redraw_of_canvas_is_recorded(self):
+        df = create_single_well_df(self.las_path, self.assignment_test_path)
+        layout = PetrophysicalLayout(df, self.assignment_test_path, mode='headless')
+        with profile() as profiler:
+            layout.fig.canvas.draw()
+            # Curves are re-rendered for new depth limits and canvas is redrawn by draw_idle.
+            layout.ax[0].set_ylim(1000, 900)
+        self.assertEqual(list(profiler.to_frame()['stage']).count('layout.draw'), 2)
+        layout.close()
+
+    def test_figure_of_layout_can_be_pickled(self):
+        df = create_single_well_df(self.las_path, self.assignment_test_path)
+        with profile():
+            layout = PetrophysicalLayout(df, self.assignment_test_path, mode='headless')
+        self.assertNotIn('draw', vars(layout.fig))
+        pickle.dumps(layout.fig)
+        layout.close()
+
+    def test_nesting_and_rows(self):
+        @instrumented('outer')
+        def outer():
+            with stage('inner') as record:
+                record.rows = 10
+
+        with profile(memory='tracemalloc') as profiler:
+            outer()
+        frame = profiler.to_frame().set_index('stage')
+        self.assertEqual(frame.loc['outer', 'depth'], 0)
+        self.assertEqual(frame.loc['inner', 'depth'], 1)
+        self.assertEqual(frame.loc['inner', 'rows'], 10)
+        self.assertIsNone(instrumentation.get_profiler())
+
+    def test_disabled_recording(self):
+        with stage('nothing') as record:
+            record.rows = 5
+        self.assertIs(stage('nothing'), stage('other'))
+        self.assertFalse(hasattr(record, 'rows'))
+        self.assertIsNone(instrumentation.get_profiler())
+        with profile() as profiler:
+            pass
+        self.assertEqual(len(profiler.to_frame()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist import model_search
+from JupyterToolsPyScientist.model_search import well_group_search, load_search_results
+from JupyterToolsPyScientist.jupyter_tools import show_grid_search_score
+from JupyterToolsPyScientist.training import sample_field
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class WellGroupSearchTestCase(unittest.TestCase):
+    """Set with testcases for cached search of model parameters with folds grouped by well"""
+
+    @classmethod
+    def setUpClass(cls):
+        df = create_single_well_df(os.path.join(test_dataset_folder, '1054311050.las'),
+                                   os.path.join(test_dataset_folder, 'assignment_test.xlsx'))
+        wells = {}
+        for well_id in range(4):
+            well_df = df.copy()
+            well_df['Depth'] = well_df['Depth'] + well_id * 100
+            wells[f'Well {well_id}'] = well_df
+        cls.features = ['GR', 'Density', 'ResistivityDeep']
+        cls.df = sample_field(wells, cls.features, 'Sonic', n_samples=2000, random_state=0)
+        cls.param_grid = {'max_depth': [2, 4, 8], 'n_estimators': [5], 'random_state': [0]}
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        plt.close('all')
+        shutil.rmtree(self.cache_dir)
+
+    def test_successive_halving_with_cache(self):
+        best_params, results = well_group_search(self.df, self.features, 'Sonic', self.param_grid, n_splits=4,
+                                                 cache_dir=self.cache_dir, max_workers=2, show_progress=False)
+        self.assertListEqual(results.groupby('iter').size().tolist(), [3, 1])
+        self.assertTrue((results['n_folds'] == 4).all())
+        first, last = results[results['iter'] == 0], results[results['iter'] == 1]
+        self.assertLess(first['n_resources'].iloc[0], last['n_resources'].iloc[0])
+        self.assertEqual(best_params, first.sort_values('mean_test_score')['params'].iloc[-1])
+        self.assertEqual(len(os.listdir(self.cache_dir)), 16)
+
+        # Repeated search takes all folds from cache.
+        with mock.patch.object(model_search, '_evaluate_fold', side_effect=AssertionError('fold was refitted')):
+            cached_params, cached_results = well_group_search(self.df, self.features, 'Sonic', self.param_grid,
+                                                              n_splits=4, cache_dir=self.cache_dir,
+                                                              max_workers=1, show_progress=False)
+        self.assertEqual(best_params, cached_params)
+        self.assertListEqual(cached_results['mean_test_score'].tolist(), results['mean_test_score'].tolist())
+        # Rows read from cache are ordered by names of files.
+        self.assertListEqual(sorted(load_search_results(self.cache_dir)['mean_test_score']),
+                             sorted(results['mean_test_score']))
+
+    def test_interrupted_search_is_resumed(self):
+        well_group_search(self.df, self.features, 'Sonic', self.param_grid, n_splits=4,
+                          cache_dir=self.cache_dir, max_workers=1, show_progress=False)
+        removed = sorted(os.listdir(self.cache_dir))[:3]
+        for name in removed:
+            os.remove(os.path.join(self.cache_dir, name))
+        calls = []
+        evaluate = model_search._evaluate_fold
+
+        def counted(*args):
+            calls.append(args)
+            return evaluate(*args)
+
+        with mock.patch.object(model_search, '_evaluate_fold', side_effect=counted):
+            well_group_search(self.df, self.features, 'Sonic', self.param_grid, n_splits=4,
+                              cache_dir=self.cache_dir, max_workers=1, show_progress=False)
+        self.assertEqual(len(calls), 3)
+
+    def test_train_score_is_opt_in(self):
+        _, results = well_group_search(self.df, self.features, 'Sonic', self.param_grid, n_splits=4,
+                                       max_workers=1, show_progress=False)
+        self.assertTrue(results['mean_train_score'].isna().all())
+        _, results = well_group_search(self.df, self.features, 'Sonic', self.param_grid, n_splits=4,
+                                       max_workers=1, return_train_score=True, show_progress=False)
+        self.assertTrue(results['mean_train_score'].notna().all())
+
+    def test_empty_grid(self):
+        for param_grid in [[], {'max_depth': []}]:
+            with self.assertRaises(ValueError):
+                well_group_search(self.df, self.features, 'Sonic', param_grid, n_splits=4, show_progress=False)
+
+    def test_plot_from_cache(self):
+        well_group_search(self.df, self.features, 'Sonic', self.param_grid, n_splits=4,
+                          cache_dir=self.cache_dir, max_workers=1, show_progress=False)
+        show_grid_search_score(self.cache_dir)
+        ax = plt.gcf().axes[0]
+        self.assertEqual(len(ax.containers[0]), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.multi_well import load_multiple_wells, collect_las_files, iter_multiple_wells, _well_key
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class MultiWellTestCase(unittest.TestCase):
+    """Set with testcases for loading of several las files"""
+
+    def setUp(self):
+        self.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        self.folder = tempfile.mkdtemp()
+        for name in ('well_a.las', 'well_b.LAS'):
+            shutil.copy(os.path.join(test_dataset_folder, '1054311050.las'), os.path.join(self.folder, name))
+        with open(os.path.join(self.folder, 'broken.las'), 'w') as file:
+            file.write('not a las file')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_collect_las_files(self):
+        self.assertEqual(len(collect_las_files(self.folder)), 3)
+        self.assertEqual(len(collect_las_files(os.path.join(self.folder, '*.las'))), 2)
+
+    def test_load_multiple_wells_dict(self):
+        wells, errors = load_multiple_wells(self.folder, self.assignment_test_path,
+                                            max_workers=2, show_progress=False)
+        self.assertEqual(len(wells), 2)
+        self.assertIn('Whitham # 1-1', wells)
+        self.assertEqual(list(errors.keys()), [os.path.join(self.folder, 'broken.las')])
+
+    def test_load_multiple_wells_concat(self):
+        df, errors = load_multiple_wells(self.folder, self.assignment_test_path, output='concat',
+                                         max_workers=1, show_progress=False)
+        self.assertEqual(len(df), 2 * 9401)
+        self.assertEqual(len(errors), 1)
+
+    def test_iter_multiple_wells(self):
+        results = list(iter_multiple_wells(self.folder, self.assignment_test_path, max_workers=2))
+        self.assertEqual(sorted(path for path, _, _ in results), collect_las_files(self.folder))
+        self.assertEqual(sum(df is not None for _, df, _ in results), 2)
+        self.assertEqual([path for path, _, error in results if error is not None],
+                         [os.path.join(self.folder, 'broken.las')])
+
+    def test_well_keys_are_unique(self):
+        self.assertEqual(_well_key('/a/w.las', pd.DataFrame({'Well': ['  ']}), set()), 'w')
+        keys = set()
+        for path in ['/a/w.las', '/b/w.las', '/c/w.las']:
+            keys.add(_well_key(path, pd.DataFrame({'Well': ['Name']}), keys))
+        keys.add(_well_key('/d/x.las', pd.DataFrame({'Well': ['Name (w.las)']}), keys))
+        self.assertEqual(len(keys), 4)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+import os
+import sys
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.collections import PolyCollection
+import numpy as np
+import pandas as pd
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.petrophysical_layout import (PetrophysicalLayout,
+                                                          create_single_well_df,
+                                                          decimate_min_max,
+                                                          fill_polygons)
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class LayoutTestCase(unittest.TestCase):
+    """Set with testcases for plotting layout of single well"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        cls.test_df_kansas = create_single_well_df(os.path.join(test_dataset_folder, '1054311050.las'),
+                                                   cls.assignment_test_path)
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_only_depth_window_is_plotted(self):
+        layout = PetrophysicalLayout(self.test_df_kansas, self.assignment_test_path, depth_range=(1000, 1100))
+        line = layout.tracks_dict[0].logs_dict[0][0]
+        depth = line.get_ydata()
+        self.assertTrue((depth > 1000).all() and (depth < 1100).all())
+
+    def test_level_of_detail(self):
+        layout = PetrophysicalLayout(self.test_df_kansas, self.assignment_test_path, level_of_detail=True)
+        track = layout.tracks_dict[0]
+        line = track.logs_dict[0][0]
+        height = track.twins_dict[0].get_window_extent().height
+        self.assertLessEqual(len(line.get_ydata()), 2 * height + 2)
+        # Zooming in re-renders curves with resolution of the new window.
+        track.update_window((1000, 1010))
+        self.assertEqual(len(line.get_ydata()), ((self.test_df_kansas['Depth'] > 1000) &
+                                                 (self.test_df_kansas['Depth'] < 1010)).sum())
+
+    def test_tracks_share_depth_axis(self):
+        layout = PetrophysicalLayout(self.test_df_kansas, self.assignment_test_path, depth_range=(1000, 2000))
+        layout.ax[2].set_ylim(1600, 1500)
+        for axis in layout.fig.get_axes():
+            self.assertEqual(axis.get_ylim(), (1600, 1500))
+
+    def test_depth_cursor_readout(self):
+        layout = PetrophysicalLayout(self.test_df_kansas, self.assignment_test_path, depth_cursor=True)
+        layout.fig.canvas.draw()
+        self.assertIsNotNone(layout.depth_cursor.background)
+        axis = layout.ax[0]
+        x, y = axis.transData.transform((0.5, 1000.2))
+        event = MouseEvent('motion_notify_event', layout.fig.canvas, x, y)
+        layout.depth_cursor.on_move(event)
+        self.assertTrue(layout.depth_cursor.readout.get_text().startswith('Depth=1000 '))
+        values = layout.depth_cursor.read_values(1000.2)
+        row = self.test_df_kansas[self.test_df_kansas['Depth'] == 1000.0].iloc[0]
+        self.assertEqual(values['GR'], row['GR'])
+
+    def test_depth_cursor_single_sample(self):
+        df = self.test_df_kansas.iloc[[100]].reset_index(drop=True)
+        layout = PetrophysicalLayout(df, self.assignment_test_path, depth_cursor=True)
+        values = layout.depth_cursor.read_values(df['Depth'].iloc[0] + 5)
+        self.assertEqual(values['Depth'], df['Depth'].iloc[0])
+        self.assertEqual(values['GR'], df['GR'].iloc[0])
+
+    def test_zoom_re_renders_curves(self):
+        layout = PetrophysicalLayout(self.test_df_kansas, self.assignment_test_path, level_of_detail=True)
+        # Toolbar zoom and pan change limits without click on axes.
+        layout.ax[2].set_ylim(1010, 1000)
+        self.assertEqual(layout.rendered_limits, (1000, 1010))
+        depth = layout.tracks_dict[0].logs_dict[0][0].get_ydata()
+        self.assertEqual(len(depth), ((self.test_df_kansas['Depth'] > 1000) &
+                                      (self.test_df_kansas['Depth'] < 1010)).sum())
+
+    def test_caliper_fill_from_assignment_base(self):
+        depth = np.arange(1000, 1100, 0.1)
+        caliper = 8 + np.sign(np.sin(depth))
+        df = pd.DataFrame({'Depth': depth, 'Caliper': caliper, 'Bitsize': np.full(len(depth), 8.0), 'Well': 'x'})
+        layout = PetrophysicalLayout(df)
+        twin = layout.tracks_dict[1].twins_dict[0]
+        fills = [collection for collection in twin.collections if isinstance(collection, PolyCollection)]
+        self.assertEqual(len(fills), 2)
+        runs_above = np.count_nonzero(np.diff(np.concatenate(([0], (caliper >= 8).astype(int), [0]))) == 1)
+        self.assertEqual(len(fills[0].get_paths()), runs_above)
+
+    def test_cutoff_fill_without_color_below(self):
+        depth = np.arange(1000, 1100, 0.1)
+        gr = 75 + 50 * np.sin(depth)
+        df = pd.DataFrame({'Depth': depth, 'GR': gr, 'Well': 'x'})
+        tracks_description = [{'type': 'main', 'curves': {'GR': {
+            'curve_type': 'line', 'color': 'green', 'label': 'GR', 'unit': 'API', 'min': 0, 'max': 150,
+            'scale': 'linear', 'reverse': False, 'range_detection': 'manual',
+            'fill': {'type': 'cutoff', 'reference': 0, 'color': 'yellow', 'color_below': None, 'cutoff': 100,
+                     'alpha': None}}}}, {'type': 'track', 'curves': {}}]
+        layout = PetrophysicalLayout(df, tracks_description=tracks_description, mode='headless')
+        fills = layout.tracks_dict[0].fills_dict[0]
+        self.assertEqual(len(fills), 1)
+        runs_above = np.count_nonzero(np.diff(np.concatenate(([0], (gr >= 100).astype(int), [0]))) == 1)
+        self.assertEqual(len(fills[0].get_paths()), runs_above)
+        layout.close()
+
+    def test_fill_polygons(self):
+        depth = np.arange(8.0)
+        x1 = np.array([1, 2, np.nan, 4, 5, 6, 7, 8.0])
+        mask = np.array([1, 1, 1, 1, 0, 1, 1, 1], dtype=bool)
+        polygons = fill_polygons(depth, x1, np.zeros(8), mask)
+        self.assertEqual(len(polygons), 3)
+        np.testing.assert_array_equal(polygons[0], [[1, 0], [2, 1], [0, 1], [0, 0]])
+        np.testing.assert_array_equal(polygons[2][:, 1], [5, 6, 7, 7, 6, 5])
+
+    def test_decimate_min_max_keeps_spikes(self):
+        depth = np.arange(10000, dtype=float)
+        values = np.zeros(10000)
+        values[1234] = 50
+        values[7000] = -50
+        values[9000:9500] = np.nan
+        decimated_depth, decimated_values = decimate_min_max(depth, values, 100)
+        self.assertLessEqual(len(decimated_values), 200)
+        self.assertEqual(np.nanmax(decimated_values), 50)
+        self.assertEqual(np.nanmin(decimated_values), -50)
+        self.assertTrue(np.isnan(decimated_values).any())
+        self.assertTrue((np.diff(decimated_depth) >= 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
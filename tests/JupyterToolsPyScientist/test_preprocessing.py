@@ -0,0 +1,91 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.petrophysical_layout import (coalesce_aliases,
+                                                          dataframe_preprocessor,
+                                                          create_single_well_df)
+from JupyterToolsPyScientist.las_stream import iter_las_chunks, convert_las_to_parquet
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+def gather_data_for_several_aliases(row, aliases_input):
+    """Row-wise reference implementation of alias coalescing."""
+    for alias in aliases_input:
+        if not pd.isna(row[alias]):
+            return row[alias]
+
+
+class PreprocessingTestCase(unittest.TestCase):
+    """Set with testcases for standardization of mnemonics"""
+
+    def setUp(self):
+        self.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        self.las_kansas_path = os.path.join(test_dataset_folder, '1054311050.las')
+
+    def test_coalesce_aliases_priority(self):
+        df = pd.DataFrame({'A': [1.0, np.nan, np.nan, 4.0],
+                           'B': [10.0, 20.0, np.nan, np.nan],
+                           'Well': ['x', 'x', 'x', 'x']})
+        result = coalesce_aliases(df, ['A', 'B'])
+        np.testing.assert_array_equal(result.values, [1.0, 20.0, np.nan, 4.0])
+
+    def test_coalesce_aliases_same_as_row_wise(self):
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(rng.normal(size=(500, 3)), columns=['A', 'B', 'C'])
+        df = df.mask(rng.random(df.shape) < 0.5)
+        df['Well'] = 'x'
+        for aliases in (['A'], ['A', 'B'], ['C', 'B', 'A'], ['Well']):
+            expected = df.apply(gather_data_for_several_aliases, axis=1, args=(aliases, ))
+            pd.testing.assert_series_equal(coalesce_aliases(df, aliases), expected)
+
+    def test_create_single_well_df_kansas(self):
+        df = create_single_well_df(self.las_kansas_path, self.assignment_test_path)
+        self.assertEqual(list(df.columns), ['GR', 'Well', 'Density', 'Sonic',
+                                            'ResistivityDeep', 'ResistivityShallow', 'Depth'])
+        self.assertEqual(df['Well'].unique()[0], 'Whitham # 1-1')
+
+    def test_dataframe_preprocessor_removes_unknown_columns(self):
+        df = pd.DataFrame({'DEPT': [1.0, 2.0], 'RHOB': [2.5, np.nan], 'UNKNOWN': [0.0, 0.0]})
+        result = dataframe_preprocessor(df, self.assignment_test_path)
+        self.assertEqual(list(result.columns), ['Density', 'Depth'])
+
+
+class StreamingReaderTestCase(unittest.TestCase):
+    """Set with testcases for reading las files by chunks"""
+
+    def setUp(self):
+        self.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        self.las_kansas_path = os.path.join(test_dataset_folder, '1054311050.las')
+
+    def test_chunks_same_as_single_well_df(self):
+        expected = create_single_well_df(self.las_kansas_path, self.assignment_test_path)
+        chunks = list(iter_las_chunks(self.las_kansas_path, self.assignment_test_path, chunk_size=1000))
+        self.assertEqual(len(chunks), 10)
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_convert_las_to_parquet(self):
+        folder = tempfile.mkdtemp()
+        try:
+            output_path = os.path.join(folder, 'kansas.parquet')
+            rows = convert_las_to_parquet(self.las_kansas_path, output_path, self.assignment_test_path, 2000)
+            expected = create_single_well_df(self.las_kansas_path, self.assignment_test_path)
+            self.assertEqual(rows, len(expected))
+            pd.testing.assert_frame_equal(pd.read_parquet(output_path), expected)
+        finally:
+            shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.processing import ProcessingGraph
+from JupyterToolsPyScientist.petrophysical_layout import make_processing_well_logging
+
+
+class ProcessingGraphTestCase(unittest.TestCase):
+    """Set with testcases for lazy processing of well logging data"""
+
+    def setUp(self):
+        self.df = pd.DataFrame({'GR': [20.0, 60.0, 120.0, np.nan],
+                                'Density': [2.3, 2.4, 2.6, 2.2],
+                                'ResistivityDeep': [20.0, 5.0, 2.0, 10.0]})
+
+    def test_make_processing_well_logging_default_curves(self):
+        make_processing_well_logging(self.df)
+        self.assertIn('Porosity_density_calc', self.df.columns)
+        self.assertIn('Porosity_resistivity_calc', self.df.columns)
+        self.assertNotIn('Sw', self.df.columns)
+
+    def test_only_requested_curves_are_computed(self):
+        graph = ProcessingGraph(self.df, {'gr_clean': 20, 'gr_shale': 120})
+        graph.apply(['Vsh'])
+        self.assertEqual(graph.computed_log, ['Vsh'])
+        np.testing.assert_allclose(self.df['Vsh'].to_numpy(), [0.0, 0.4, 1.0, np.nan])
+
+    def test_new_rw_recomputes_only_sw_subtree(self):
+        graph = ProcessingGraph(self.df, {'gr_clean': 20, 'gr_shale': 120})
+        graph.apply(['Net_pay'])
+        self.assertEqual(sorted(graph.computed_log),
+                         sorted(['Porosity_density_calc', 'Vsh', 'Porosity_effective', 'Sw', 'Net_pay']))
+        sw_before = graph.compute('Sw').copy()
+        graph.computed_log.clear()
+        graph.set_parameters(rw=0.05)
+        graph.apply(['Sw', 'Net_pay'])
+        self.assertEqual(graph.computed_log, ['Sw', 'Net_pay'])
+        self.assertTrue((self.df['Sw'].to_numpy()[:3] <= sw_before[:3]).all())
+
+    def test_changed_input_recomputes_dependent_curves(self):
+        graph = ProcessingGraph(self.df, {'gr_clean': 20, 'gr_shale': 120, 'rw': 0.02})
+        graph.apply(['Net_pay'])
+        net_pay_before = self.df['Net_pay'].to_numpy().copy()
+        self.df['GR'] = [120.0, 120.0, 120.0, np.nan]
+        graph.computed_log.clear()
+        graph.apply(['Net_pay'])
+        self.assertEqual(sorted(graph.computed_log), sorted(['Vsh', 'Porosity_effective', 'Sw', 'Net_pay']))
+        self.assertEqual(net_pay_before[0], 1)
+        self.assertEqual(self.df['Net_pay'].iloc[0], 0)
+
+    def test_invalidate_drops_dependent_curves(self):
+        graph = ProcessingGraph(self.df, {'gr_clean': 20, 'gr_shale': 120})
+        graph.apply(['Net_pay'])
+        graph.computed_log.clear()
+        graph.invalidate(['Vsh'])
+        graph.apply(['Net_pay'])
+        self.assertEqual(sorted(graph.computed_log), sorted(['Vsh', 'Porosity_effective', 'Sw', 'Net_pay']))
+
+    def test_missing_input_is_skipped(self):
+        graph = ProcessingGraph(self.df.drop(columns=['GR']))
+        self.assertEqual(graph.apply(['Vsh', 'Porosity_density_calc']), ['Porosity_density_calc'])
+
+    def test_unknown_names_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, 'Rw'):
+            ProcessingGraph(self.df, {'Rw': 0.05})
+        graph = ProcessingGraph(self.df)
+        with self.assertRaisesRegex(ValueError, 'Nope'):
+            graph.apply(['Nope'])
+        with self.assertRaisesRegex(ValueError, 'Rw'):
+            graph.set_parameters(Rw=0.05)
+
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
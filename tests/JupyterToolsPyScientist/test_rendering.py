@@ -0,0 +1,59 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df
+from JupyterToolsPyScientist.rendering import render_layouts, render_layouts_to_pdf
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class RenderingTestCase(unittest.TestCase):
+    """Set with testcases for headless rendering of layouts"""
+
+    def setUp(self):
+        self.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        self.las_kansas_path = os.path.join(test_dataset_folder, '1054311050.las')
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_render_layouts_in_workers(self):
+        df = create_single_well_df(self.las_kansas_path, self.assignment_test_path)
+        wells = {'Whitham # 1-1': df, 'from las': self.las_kansas_path, 'broken': 'missing.las'}
+        rendered, errors = render_layouts(wells, self.folder, self.assignment_test_path, file_format='png',
+                                          figsize=(8, 6), max_workers=2, show_progress=False)
+        self.assertEqual(sorted(rendered), ['Whitham # 1-1', 'from las'])
+        self.assertEqual(list(errors), ['broken'])
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, 'Whitham_1-1.png')))
+        # Headless figures are not registered in pyplot.
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_same_file_names_are_not_overwritten(self):
+        wells = {'Well/1': self.las_kansas_path, 'Well 1': self.las_kansas_path, 'well_1': self.las_kansas_path}
+        rendered, errors = render_layouts(wells, self.folder, self.assignment_test_path, file_format='svg',
+                                          figsize=(4, 3), max_workers=1, show_progress=False)
+        self.assertEqual(errors, {})
+        self.assertEqual(sorted(os.path.basename(path) for path in rendered.values()),
+                         ['Well_1.svg', 'Well_1_2.svg', 'well_1_3.svg'])
+
+    def test_render_layouts_to_pdf(self):
+        pdf_path = os.path.join(self.folder, 'layouts.pdf')
+        errors = render_layouts_to_pdf({'a': self.las_kansas_path, 'b': self.las_kansas_path}, pdf_path,
+                                       self.assignment_test_path, figsize=(8, 6))
+        self.assertEqual(errors, {})
+        self.assertGreater(os.path.getsize(pdf_path), 0)
+        self.assertEqual(plt.get_fignums(), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,82 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.training import sample_field, split_wells, train_field_random_forest
+from JupyterToolsPyScientist.well_store import WellStore
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class FieldTrainingTestCase(unittest.TestCase):
+    """Set with testcases for training of models on samples from many wells"""
+
+    @classmethod
+    def setUpClass(cls):
+        df = create_single_well_df(os.path.join(test_dataset_folder, '1054311050.las'),
+                                   os.path.join(test_dataset_folder, 'assignment_test.xlsx'))
+        cls.folder = tempfile.mkdtemp()
+        cls.store = WellStore(cls.folder)
+        # Copies of the well with shifted depth stand for other wells of the field.
+        for well_id in range(4):
+            well_df = df.copy()
+            well_df['Depth'] = well_df['Depth'] + well_id * 100
+            cls.store.add_well(well_df, f'Well {well_id}')
+        cls.features = ['GR', 'Density', 'ResistivityDeep']
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_sample_is_stratified_by_well_and_depth(self):
+        sample = sample_field(self.store, self.features, 'Sonic', n_samples=2000, depth_bins=10, random_state=0)
+        self.assertEqual(len(sample), 2000)
+        self.assertFalse(sample[self.features + ['Sonic']].isna().any().any())
+        self.assertEqual(sample['Depth'].dtype, np.float32)
+        self.assertListEqual(sample['Well'].value_counts().tolist(), [500] * 4)
+
+        well = sample[sample['Well'] == 'Well 0']
+        counts = np.histogram(well['Depth'], bins=10)[0]
+        self.assertLessEqual(counts.max() - counts.min(), 1)
+
+        same = sample_field(self.store, self.features, 'Sonic', n_samples=2000, depth_bins=10, random_state=0)
+        self.assertTrue(sample.equals(same))
+
+    def test_sample_of_small_well_takes_all_rows(self):
+        sample = sample_field(self.store, self.features, 'Sonic', n_samples=10 ** 6, wells=['Well 1'])
+        valid = self.store.open_well('Well 1').to_frame(self.features + ['Sonic']).dropna()
+        self.assertEqual(len(sample), len(valid))
+
+    def test_split_wells(self):
+        train, test = split_wells(self.store.wells, test_size=0.25, random_state=1)
+        self.assertEqual(len(test), 1)
+        self.assertSetEqual(set(train) | set(test), set(self.store.wells))
+        self.assertFalse(set(train) & set(test))
+
+    def test_warm_start_steps(self):
+        model, report = train_field_random_forest(self.store, self.features, 'Sonic',
+                                                  rf_params={'max_depth': 6, 'random_state': 0},
+                                                  n_samples=1000, estimators_steps=(5, 10), n_jobs=2,
+                                                  random_state=0, verbose=False)
+        self.assertEqual(len(model.estimators_), 10)
+        self.assertListEqual(report['n_estimators'].tolist(), [5, 10])
+        self.assertTrue((report[['fit_time', 'score_time']] > 0).all().all())
+        self.assertTrue(np.isfinite(report['test_score']).all())
+        self.assertListEqual(list(model.feature_names_in_), self.features)
+
+        model, report = train_field_random_forest(self.store, self.features, 'Sonic', model=model,
+                                                  n_samples=1000, estimators_steps=(10, 15), n_jobs=2,
+                                                  random_state=0, verbose=False)
+        self.assertEqual(len(model.estimators_), 15)
+        self.assertListEqual(report['n_estimators'].tolist(), [15])
+
+
+if __name__ == '__main__':
+    unittest.main()
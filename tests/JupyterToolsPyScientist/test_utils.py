@@ -0,0 +1,77 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist import utils
+from JupyterToolsPyScientist.utils import (load_tracks_description,
+                                           load_mnemonic_aliases_correspond,
+                                           export_assignment_config,
+                                           clear_assignment_cache)
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class AssignmentConfigTestCase(unittest.TestCase):
+    """Set with testcases for loading of assignment files"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.assignment_test_path = os.path.join(self.folder, 'assignment_test.xlsx')
+        shutil.copy(os.path.join(test_dataset_folder, 'assignment_test.xlsx'), self.assignment_test_path)
+        clear_assignment_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_repeated_loading_uses_cache(self):
+        with mock.patch.object(utils.pd, 'read_excel', wraps=utils.pd.read_excel) as read_excel:
+            first = load_mnemonic_aliases_correspond(self.assignment_test_path)
+            first['Depth'].append('spoiled')
+            second = load_mnemonic_aliases_correspond(self.assignment_test_path)
+            self.assertEqual(read_excel.call_count, 1)
+            self.assertNotIn('spoiled', second['Depth'])
+            # Changing of modification time forces parsing of file again.
+            stat = os.stat(self.assignment_test_path)
+            os.utime(self.assignment_test_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            load_mnemonic_aliases_correspond(self.assignment_test_path)
+            self.assertEqual(read_excel.call_count, 2)
+
+    def test_compiled_json_same_as_excel(self):
+        json_path = os.path.join(self.folder, 'assignment_test.json')
+        export_assignment_config(json_path, self.assignment_test_path)
+        with mock.patch.object(utils.pd, 'read_excel') as read_excel:
+            aliases = load_mnemonic_aliases_correspond(json_path)
+            tracks = load_tracks_description(json_path)
+            read_excel.assert_not_called()
+        self.assertEqual(aliases, load_mnemonic_aliases_correspond(self.assignment_test_path))
+        excel_tracks = load_tracks_description(self.assignment_test_path)
+        self.assertEqual(len(tracks), len(excel_tracks))
+        for track, excel_track in zip(tracks, excel_tracks):
+            self.assertEqual(track['type'], excel_track['type'])
+            self.assertEqual(list(track['curves']), list(excel_track['curves']))
+            for curve, description in track['curves'].items():
+                self.assertEqual(description['max'], excel_track['curves'][curve]['max'])
+                self.assertEqual(description['reverse'], excel_track['curves'][curve]['reverse'])
+
+    def test_invalid_fill_is_rejected(self):
+        row = {'track_number': 1, 'track_type': 'main', 'curve': 'GR', 'curve_type': 'line', 'color': 'green',
+               'label': 'GR', 'unit': 'API', 'min': 0, 'max': 150, 'scale': 'linear', 'reverse': False,
+               'range_detection': 'manual', 'fill_type': 'cutof', 'fill_reference': 0, 'fill_color': 'yellow',
+               'fill_color_below': np.nan, 'fill_cutoff': 75, 'fill_alpha': np.nan}
+        with self.assertRaisesRegex(ValueError, 'Unknown fill_type'):
+            utils._parse_tracks_description(pd.DataFrame([row]))
+        row.update(fill_type='cutoff', fill_cutoff=np.nan)
+        with self.assertRaisesRegex(ValueError, 'fill_cutoff'):
+            utils._parse_tracks_description(pd.DataFrame([row]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from importlib.util import find_spec
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+import numpy as np
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.well_statistics import STATISTICS_ATTR, CurveStatisticsIndex, curve_statistics, \
+    statistics_frame, field_statistics, field_histogram
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df, PetrophysicalLayout, \
+    PetrophysicalTrack
+from JupyterToolsPyScientist.well_store import WellStore
+from JupyterToolsPyScientist.cache import WellCache
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class WellStatisticsTestCase(unittest.TestCase):
+    """Set with testcases for index of curve statistics"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        cls.las_path = os.path.join(test_dataset_folder, '1054311050.las')
+        cls.df = create_single_well_df(cls.las_path, cls.assignment_test_path)
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_statistics_are_computed_at_ingestion(self):
+        statistics = self.df.attrs[STATISTICS_ATTR]
+        self.assertIsInstance(statistics, CurveStatisticsIndex)
+        self.assertIn('GR', statistics)
+        record = statistics.records['GR']
+        self.assertAlmostEqual(record['q99'], self.df['GR'].quantile(0.99))
+        self.assertAlmostEqual(record['q01'], self.df['GR'].quantile(0.01))
+        self.assertAlmostEqual(record['min'], self.df['GR'].min())
+        self.assertAlmostEqual(record['null_fraction'], self.df['GR'].isna().mean())
+        self.assertAlmostEqual(record['step'], 0.5)
+
+    def test_changed_curve_is_recomputed(self):
+        df = self.df.copy()
+        self.assertEqual(curve_statistics(df, 'GR')['max'], self.df['GR'].max())
+        df['GR'] = df['GR'] * 2
+        self.assertAlmostEqual(curve_statistics(df, 'GR')['max'], self.df['GR'].max() * 2)
+        # Index of the source well is not affected by the copy.
+        self.assertAlmostEqual(curve_statistics(self.df, 'GR')['max'], self.df['GR'].max())
+        window = self.df[self.df['Depth'] > 3000]
+        self.assertAlmostEqual(curve_statistics(window, 'GR')['q01'], window['GR'].quantile(0.01))
+
+    def test_auto_range_from_statistics(self):
+        layout = PetrophysicalLayout(self.df, self.assignment_test_path, mode='headless')
+        track = layout.tracks_dict[2]
+        twin_id = next(twin_id for twin_id, curve in track.curves_dict.items() if curve == 'Sonic')
+        self.assertTupleEqual(tuple(track.twins_dict[twin_id].get_xlim()),
+                              PetrophysicalTrack.auto_range(self.df['Sonic']))
+        layout.close()
+
+    def test_qc_table_and_histogram(self):
+        window = self.df[self.df['Depth'] > 3000]
+        table = field_statistics({'full': self.df, 'window': window}, curves=['GR', 'Density'])
+        self.assertEqual(len(table), 4)
+        self.assertIn(('window', 'GR'), table.index)
+        self.assertListEqual(list(statistics_frame(self.df).index),
+                             ['GR', 'Density', 'Sonic', 'ResistivityDeep', 'ResistivityShallow'])
+
+        counts, edges = field_histogram({'full': self.df, 'window': window}, 'GR', bins=20)
+        self.assertEqual(counts.sum(), self.df['GR'].notna().sum() + window['GR'].notna().sum())
+        self.assertAlmostEqual(edges[0], self.df['GR'].min())
+        self.assertAlmostEqual(edges[-1], self.df['GR'].max())
+
+    def test_statistics_in_well_store(self):
+        folder = tempfile.mkdtemp()
+        try:
+            WellStore(folder).add_well(self.df)
+            df = WellStore(folder).open_well('Whitham # 1-1').to_frame()
+            statistics = df.attrs[STATISTICS_ATTR]
+            self.assertIn('GR', statistics)
+            # Stored record is valid for the opened float32 curve, so it isn't recomputed.
+            self.assertIs(curve_statistics(df, 'GR'), statistics.records['GR'])
+        finally:
+            shutil.rmtree(folder)
+
+    @unittest.skipUnless(find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_statistics_in_cache(self):
+        folder = tempfile.mkdtemp()
+        try:
+            cache = WellCache(folder)
+            create_single_well_df(self.las_path, self.assignment_test_path, cache=cache)
+            df = create_single_well_df(self.las_path, self.assignment_test_path, cache=cache)
+            statistics = df.attrs[STATISTICS_ATTR]
+            self.assertIsInstance(statistics, CurveStatisticsIndex)
+            self.assertEqual(statistics.records['GR'], self.df.attrs[STATISTICS_ATTR].records['GR'])
+        finally:
+            shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+import numpy as np
+
+path_to_source_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(1, path_to_source_folder)
+
+from JupyterToolsPyScientist.well_store import WellStore
+from JupyterToolsPyScientist.petrophysical_layout import create_single_well_df, PetrophysicalLayout
+
+test_dataset_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'test_dataset'))
+
+
+class WellStoreTestCase(unittest.TestCase):
+    """Set with testcases for memory-mapped well store"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.assignment_test_path = os.path.join(test_dataset_folder, 'assignment_test.xlsx')
+        cls.df = create_single_well_df(os.path.join(test_dataset_folder, '1054311050.las'), cls.assignment_test_path)
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.store = WellStore(self.folder)
+        self.store.add_well(self.df)
+
+    def tearDown(self):
+        plt.close('all')
+        shutil.rmtree(self.folder)
+
+    def test_zero_copy_float32_frame(self):
+        well = WellStore(self.folder).open_well('Whitham # 1-1')
+        df = well.to_frame()
+        self.assertTrue(np.shares_memory(df.values, well.data))
+        self.assertTrue((df.dtypes == np.float32).all())
+        self.assertNotIn('Well', df.columns)
+        np.testing.assert_allclose(df['Density'], self.df['Density'], rtol=1e-6)
+
+    def test_layout_from_store(self):
+        layout = PetrophysicalLayout(self.store.open_well('Whitham # 1-1').to_frame(), self.assignment_test_path)
+        self.assertEqual(layout.fig._suptitle.get_text(), 'Layout of Whitham # 1-1')
+
+    def test_feature_frame(self):
+        self.store.add_well(self.df, name='copy')
+        df = self.store.feature_frame(['GR', 'Density'], target='Sonic')
+        single = self.df[['GR', 'Density', 'Sonic']].dropna()
+        self.assertEqual(len(df), 2 * len(single))
+        self.assertEqual(list(df['Well'].cat.categories), ['Whitham # 1-1', 'copy'])
+
+
+    def test_replaced_well_keeps_opened_data(self):
+        well = self.store.open_well('Whitham # 1-1')
+        self.store.add_well(self.df.iloc[:100])
+        np.testing.assert_allclose(well.curve('Density'), self.df['Density'], rtol=1e-6)
+        self.assertEqual(len(self.store.open_well('Whitham # 1-1')), 100)
+        self.assertFalse([name for name in os.listdir(well.path) if name.endswith('.tmp')])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)